@@ -0,0 +1,234 @@
+"""
+Бенчмарк асинхронного движка поиска на локальном стенде
+
+Прогоняет корпус названий дважды с одинаковым числом браузеров:
+- потоками-воркерами, как ParserThread (каждый воркер ищет свои строки
+  по очереди через search_organization)
+- AsyncSearchEngine (сотни строк одновременно, HTTP-источники
+  с ограничением одновременных запросов к каждому сайту)
+
+ЕГРЮЛ и Контур Фокус в обоих прогонах ищутся одинаково: по HTTP
+(по умолчанию) или в браузере (--no-egrul-http, --no-kontur-http).
+
+Выводит строк в секунду, ускорение, пиковое число одновременных запросов
+по сайтам и строки, где результаты прогонов разошлись.
+
+Нужны Chrome и chromedriver (как для обычного запуска).
+
+Запуск из корня репозитория:
+    python benchmarks/async_benchmark.py --browsers 2 --latency-ms 150 --repeat 5
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import argparse
+import threading
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARKS_DIR, "..", "src"))
+sys.path.insert(0, BENCHMARKS_DIR)
+
+from gui.async_engine import DOMAIN_LIMITS, AsyncSearchEngine  # noqa: E402
+from gui.parser_core import OrganizationParser  # noqa: E402
+from gui.rate_limiter import get_rate_limiter  # noqa: E402
+from replay_server import CORPUS_PATH, Corpus, ReplayServer  # noqa: E402
+from run_benchmark import parse_rate_limits, rate_limits_lines  # noqa: E402
+
+
+def create_parsers(args, server):
+    parsers = []
+    for _ in range(args.browsers):
+        parser = OrganizationParser(
+            log_callback=(print if args.verbose else lambda message: None),
+            humanization_mode=args.mode,
+            base_urls=server.base_urls,
+            egrul_http=args.egrul_http,
+            kontur_http=args.kontur_http,
+        )
+        parser.init_browser()
+        parsers.append(parser)
+    return parsers
+
+
+def run_threads(args, server, queries):
+    """Прогон воркерами: браузер на поток, строки из общей очереди"""
+    parsers = create_parsers(args, server)
+    tasks = queue.Queue()
+    for index, query in enumerate(queries):
+        tasks.put((index, query))
+    results = [None] * len(queries)
+
+    def worker(parser):
+        while True:
+            try:
+                index, query = tasks.get_nowait()
+            except queue.Empty:
+                return
+            results[index] = parser.search_organization(query)
+
+    started = time.perf_counter()
+    try:
+        threads = [threading.Thread(target=worker, args=(parser,)) for parser in parsers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+    finally:
+        for parser in parsers:
+            parser.close_browser()
+
+    return {"elapsed": elapsed, "results": results}
+
+
+def run_async(args, server, queries):
+    """Прогон асинхронным движком на тех же браузерах"""
+    parsers = create_parsers(args, server)
+    limits = {domain: getattr(args, f"{domain}_limit") for domain in DOMAIN_LIMITS}
+    engine = AsyncSearchEngine(
+        parsers,
+        domain_limits=limits,
+        max_in_flight=args.in_flight,
+        prefetch=args.prefetch,
+        log_callback=(print if args.verbose else lambda message: None),
+    )
+    try:
+        results = engine.search_all(queries)
+    finally:
+        for parser in parsers:
+            parser.close_browser()
+
+    return {
+        "elapsed": engine.elapsed,
+        "results": results,
+        "peak_in_flight": engine.peak_in_flight,
+        "limits": dict(engine.domain_limits, rusprofile=len(parsers)),
+        "kontur_paths": engine.kontur_paths.snapshot(),
+    }
+
+
+def run(args):
+    corpus = Corpus(args.corpus)
+    queries = corpus.queries * args.repeat
+    if args.limit:
+        queries = queries[:args.limit]
+
+    report = {
+        "rows": len(queries),
+        "browsers": args.browsers,
+        "latency_ms": args.latency_ms,
+        "prefetch": args.prefetch,
+    }
+    rates = parse_rate_limits(args.rate_limit)
+    for name, runner in (("threads", run_threads), ("async", run_async)):
+        get_rate_limiter().configure(rates)
+        with ReplayServer(latency_ms=args.latency_ms, corpus=corpus) as server:
+            report[name] = runner(args, server, queries)
+            report[name]["server_requests"] = dict(server.requests)
+        report[name]["rate_limits"] = get_rate_limiter().snapshot()
+        report[name]["rows_per_second"] = len(queries) / report[name]["elapsed"]
+
+    report["mismatches"] = [
+        (query, (threaded or {}).get("source"), (engine or {}).get("source"))
+        for query, threaded, engine in zip(
+            queries, report["threads"]["results"], report["async"]["results"]
+        )
+        if (threaded or {}).get("source") != (engine or {}).get("source")
+        or (threaded or {}).get("inn") != (engine or {}).get("inn")
+    ]
+    return report
+
+
+def print_report(report):
+    threads, engine = report["threads"], report["async"]
+    print("\n" + "=" * 78)
+    print(
+        f"Строк: {report['rows']}, браузеров: {report['browsers']}, "
+        f"задержка стенда: {report['latency_ms']} мс"
+        + (", HTTP-источники заранее" if report["prefetch"] else "")
+    )
+    print(f"Воркеры:            {threads['elapsed']:7.1f} с, {threads['rows_per_second']:.2f} строк/с")
+    print(f"Асинхронный движок: {engine['elapsed']:7.1f} с, {engine['rows_per_second']:.2f} строк/с")
+    if engine["elapsed"]:
+        print(f"Ускорение: x{threads['elapsed'] / engine['elapsed']:.1f}")
+
+    peaks = ", ".join(
+        f"{domain} {engine['peak_in_flight'].get(domain, 0)}/{limit}"
+        for domain, limit in engine["limits"].items()
+    )
+    print(f"Одновременных запросов (пик/лимит): {peaks}")
+    paths = engine["kontur_paths"]
+    print(
+        f"Контур Фокус: {paths.get('http', 0)} поисков по HTTP, "
+        f"{paths.get('browser', 0)} через браузер"
+    )
+    print(f"Запросов к стенду: воркеры {threads['server_requests']}, движок {engine['server_requests']}")
+    for name, run_report in (("Воркеры", threads), ("Движок", engine)):
+        for line in rate_limits_lines(run_report["rate_limits"]):
+            print(f"{name}. {line}")
+
+    if report["mismatches"]:
+        print(f"Результаты разошлись в {len(report['mismatches'])} строках:")
+        for query, threaded, async_source in report["mismatches"]:
+            print(f"  • {query}: {threaded} / {async_source}")
+    else:
+        print("Результаты совпадают")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк асинхронного движка на локальном стенде")
+    parser.add_argument("--mode", default="fast", choices=("fast", "normal", "safe"))
+    parser.add_argument("--browsers", type=int, default=2, help="Браузеров в обоих прогонах")
+    parser.add_argument("--in-flight", type=int, default=200, help="Строк в работе одновременно")
+    for domain, limit in DOMAIN_LIMITS.items():
+        parser.add_argument(
+            f"--{domain}-limit",
+            type=int,
+            default=limit,
+            help=f"Одновременных запросов к {domain}",
+        )
+    parser.add_argument(
+        "--egrul-http",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="ЕГРЮЛ по HTTP без браузера",
+    )
+    parser.add_argument(
+        "--kontur-http",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Контур Фокус сначала по HTTP",
+    )
+    parser.add_argument(
+        "--prefetch",
+        action="store_true",
+        help="Запрашивать HTTP-источники заранее, пока строка ждет RusProfile",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        nargs="*",
+        default=[],
+        metavar="САЙТ=В_МИНУТУ/ПОДРЯД",
+        help="Общий лимит запросов, например rusprofile=60/5 egrul=120/10",
+    )
+    parser.add_argument("--latency-ms", type=int, default=0, help="Задержка ответа стенда")
+    parser.add_argument("--repeat", type=int, default=1, help="Сколько раз прогнать корпус")
+    parser.add_argument("--limit", type=int, default=0, help="Ограничить число строк")
+    parser.add_argument("--corpus", default=CORPUS_PATH)
+    parser.add_argument("--json", default=None, help="Сохранить отчет в JSON")
+    parser.add_argument("--verbose", action="store_true", help="Выводить лог парсера")
+    args = parser.parse_args()
+
+    report = run(args)
+    print_report(report)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
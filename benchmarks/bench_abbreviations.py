@@ -0,0 +1,120 @@
+"""
+Микробенчмарк расшифровки аббревиатур RusProfileSearcher
+
+Сравнивает прежнюю реализацию (отдельное регулярное выражение на каждую
+аббревиатуру при каждом вызове) с однопроходной из модуля rules.
+
+Запуск из корня репозитория:
+    python benchmarks/bench_abbreviations.py
+"""
+
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from gui.rules import get_rules  # noqa: E402
+
+
+OPF_LIST = ["АНОО", "АНО", "МБОУ", "ГБОУ", "МАОУ", "МКОУ", "ГКОУ",
+            "ЧОУ", "НЧОУ", "ФГБОУ", "ФГАОУ", "ГАОУ", "ГБПОУ", "ГАПОУ"]
+
+SAMPLE_NAMES = [
+    'МБОУ СОШ №5 г. Балашиха',
+    'АНОО "Лицей Интеллект" Балашиха',
+    'ГБОУ Школа № 1234',
+    'МАОУ "Гимназия №2" ДОУ',
+    'МБДОУ Детский сад №15',
+    'ГБПОУ "Колледж связи №54"',
+    'Лицей "МБОУ" им. Пушкина',
+    'МКОУ ООШ с. Ивановка',
+    'ФГБОУ ВО МГУ',
+    'МБУДО ДШИ №3',
+    'ЧОУ "Школа Радуга"',
+    'Средняя школа 17',
+    'ДЮСШ "Олимп" СДЮСШОР',
+    'МБОУ "СОШ № 12" имени героя',
+    'Школа',
+]
+
+
+def legacy_expand(abbreviations, text):
+    """Прежняя реализация _expand_abbreviations_in_text"""
+    if not text:
+        return text
+
+    result = text
+    quote_pattern = r'["\'«»][^"\']+["\'»]'
+    quoted_parts = []
+    for match in re.finditer(quote_pattern, result):
+        quoted_parts.append((match.start(), match.end(), match.group()))
+
+    text_without_quotes = result
+    placeholders = {}
+    for i, (start, end, quoted_text) in enumerate(quoted_parts):
+        placeholder = f"__QUOTE_PLACEHOLDER_{i}__"
+        placeholders[placeholder] = quoted_text
+        text_without_quotes = text_without_quotes[:start] + placeholder + text_without_quotes[end:]
+
+    opf_abbreviations = sorted(
+        [(abbr, full_form) for abbr, full_form in abbreviations.items() if abbr in OPF_LIST],
+        key=lambda x: len(x[0]),
+        reverse=True,
+    )
+    for abbr, full_form in opf_abbreviations:
+        pattern = r'^' + re.escape(abbr) + r'\s+'
+        if re.search(pattern, text_without_quotes, re.IGNORECASE):
+            text_without_quotes = re.sub(pattern, full_form + " ", text_without_quotes, flags=re.IGNORECASE)
+            break
+
+    other_abbreviations = sorted(
+        [(abbr, full_form) for abbr, full_form in abbreviations.items()
+         if abbr not in OPF_LIST and len(abbr) >= 3],
+        key=lambda x: len(x[0]),
+        reverse=True,
+    )
+    for abbr, full_form in other_abbreviations:
+        pattern = r'\b' + re.escape(abbr) + r'\b'
+        if re.search(pattern, text_without_quotes, re.IGNORECASE):
+            text_without_quotes = re.sub(pattern, full_form, text_without_quotes, flags=re.IGNORECASE)
+
+    result = text_without_quotes
+    for placeholder, quoted_text in placeholders.items():
+        result = result.replace(placeholder, quoted_text)
+
+    return result
+
+
+def main():
+    rules = get_rules()
+    abbreviations = dict(rules.abbreviations)
+
+    # Проверяем, что результаты совпадают. Строки с несколькими парами кавычек
+    # в выборку не входят: прежняя реализация сдвигала позиции плейсхолдеров
+    mismatches = 0
+    for name in SAMPLE_NAMES:
+        old = legacy_expand(abbreviations, name)
+        new = rules.expand_abbreviations(name)
+        if old != new:
+            mismatches += 1
+            print(f"≠ {name!r}\n  было:  {old!r}\n  стало: {new!r}")
+
+    number = 200
+    legacy_time = timeit.timeit(
+        lambda: [legacy_expand(abbreviations, name) for name in SAMPLE_NAMES], number=number
+    )
+    new_time = timeit.timeit(
+        lambda: [rules.expand_abbreviations(name) for name in SAMPLE_NAMES], number=number
+    )
+
+    calls = number * len(SAMPLE_NAMES)
+    print(f"Вызовов: {calls}, расхождений: {mismatches}")
+    print(f"Прежняя реализация:   {legacy_time / calls * 1e6:8.1f} мкс/вызов")
+    print(f"Однопроходная:        {new_time / calls * 1e6:8.1f} мкс/вызов")
+    print(f"Ускорение:            {legacy_time / new_time:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,567 @@
+"""
+Локальный стенд RusProfile, Контур Фокус и ЕГРЮЛ для бенчмарков
+
+Каждый источник обслуживается отдельным HTTP-сервером на своем порту,
+поэтому пути совпадают с настоящими сайтами, а сеарчеры переключаются
+на стенд через OrganizationParser(base_urls=...).
+
+Страницы собираются из шаблонов с той же разметкой, которую читают
+сеарчеры (id, классы, подписи ИНН/ОГРН), и корпуса организаций
+fixtures/organizations.json. Шаблон можно заменить записанной страницей:
+файл <recorded>/<источник>/<шаблон>.html с подстановками string.Template.
+
+ЕГРЮЛ также отвечает как JSON-интерфейс сайта для EgrulHttpSearcher:
+POST / с полем query возвращает токен, /search-result/<токен> - строки
+выдачи (первый опрос токена отвечает {"status": "wait"}).
+
+Запуск из корня репозитория:
+    python benchmarks/replay_server.py --latency-ms 150
+"""
+
+import os
+import re
+import json
+import time
+import uuid
+import random as rd
+import argparse
+import threading
+from html import escape
+from string import Template
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs, parse_qsl
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+CORPUS_PATH = os.path.join(FIXTURES_DIR, "organizations.json")
+
+SOURCES = ("rusprofile", "kontur", "egrul")
+
+# Cookie, которую ставит скрипт проверки Контур Фокуса
+CHALLENGE_COOKIE = "kf_verified"
+
+# Картинка в каждой странице стенда: нагрузка, которую снимает фильтр ресурсов
+STATIC_SIZE = 200 * 1024
+STATIC_PAYLOAD = bytes(STATIC_SIZE)
+
+PAGE = Template(
+    """<!DOCTYPE html>
+<html lang="ru">
+<head><meta charset="utf-8"><title>$title</title></head>
+<body>
+<img class="banner" src="/static/banner.jpg" alt="">
+$body
+</body>
+</html>
+"""
+)
+
+# Шаблоны страниц: {источник: {шаблон: тело страницы}}
+TEMPLATES = {
+    "rusprofile": {
+        "search_form": """
+<form action="/search-advanced" method="get">
+  <input id="advanced-search-query" name="query" type="text">
+</form>
+""",
+        "results": """
+<div class="search-result">
+  <p>Найдено организаций: $count</p>
+  $items
+</div>
+""",
+        "result_item": """
+<div class="list-element">
+  <a class="list-element__title" href="/id/$id">$name</a>
+  <div class="list-element__address">$address</div>
+</div>
+""",
+        "not_found": """
+<div class="search-result">
+  <p>Не найдено организаций. Попробуйте смягчить фильтры.</p>
+</div>
+""",
+        "company": """
+<div class="company-header">
+  <h1 id="clip_name-long" class="company-name">$name</h1>
+  <address id="clip_address">$address</address>
+  <div class="company-requisites">
+    <span>ИНН: $inn</span>
+    <span>ОГРН: $ogrn</span>
+  </div>
+</div>
+""",
+    },
+    "kontur": {
+        "results": """
+<div class="search-hint">Введите название, ИНН или ОГРН организации</div>
+$items
+""",
+        "result_item": """
+<div class="org">
+  <div class="org-name">$name</div>
+  <div>ИНН $inn</div>
+  <div>ОГРН $ogrn</div>
+  <div class="org-address">$address</div>
+</div>
+""",
+        "not_found": """
+<div class="search-hint">Введите название, ИНН или ОГРН организации</div>
+<div>По вашему запросу ничего не найдено</div>
+""",
+        "challenge": """
+<div class="challenge-form">Проверка браузера... Включите JavaScript, чтобы продолжить</div>
+<script>document.cookie = "$cookie=1; path=/"; location.reload();</script>
+""",
+    },
+    "egrul": {
+        "search_form": """
+<form action="/search" method="get">
+  <input id="query" name="query" type="text">
+</form>
+""",
+        "results": """
+$items
+""",
+        "result_item": """
+<div class="res-row">
+  <div class="res-text"><a href="/detail/$id" target="_blank">$name</a> ИНН: $inn, ОГРН: $ogrn</div>
+</div>
+""",
+        "not_found": """
+<div class="no-data">Не найдено ни одной записи</div>
+""",
+        "detail": """
+<div class="detail">
+  <p>Полное наименование: $name</p>
+  <p>ИНН: $inn</p>
+  <p>ОГРН: $ogrn</p>
+  <p>Адрес: $address</p>
+</div>
+""",
+        "detail_inn_only": """
+<div class="detail">
+  <p>ИНН: $inn</p>
+  <p>ОГРН: $ogrn</p>
+</div>
+""",
+    },
+}
+
+WORD_REGEX = re.compile(r"[а-яa-z0-9]+")
+
+
+def query_words(text):
+    """Значимые слова запроса: 3+ буквы или числа"""
+    text = str(text or "").lower().replace("ё", "е")
+    return {word for word in WORD_REGEX.findall(text) if len(word) >= 3 or word.isdigit()}
+
+
+class Corpus:
+    """Корпус организаций и поисковых запросов для стенда"""
+
+    def __init__(self, path=CORPUS_PATH):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        self.organizations = data.get("organizations", [])
+        self.queries = data.get("queries", [])
+        self._by_id = {str(org["id"]): org for org in self.organizations}
+        self._words = {
+            str(org["id"]): query_words(" ".join([org["name"], *org.get("aliases", [])]))
+            for org in self.organizations
+        }
+
+    def get(self, org_id):
+        return self._by_id.get(str(org_id))
+
+    def find(self, query, source):
+        """
+        Поиск организаций источника по запросу
+
+        Совпадение по ИНН/ОГРН точное. По названию организация подходит, если
+        с ней совпадают хотя бы половина значимых слов запроса и все числа.
+        """
+        query = str(query or "").strip()
+        if query.isdigit():
+            return [
+                org for org in self.organizations
+                if source in org["sources"] and query in (org["inn"], org["ogrn"])
+            ]
+
+        words = query_words(query)
+        if not words:
+            return []
+        numbers = {word for word in words if word.isdigit()}
+
+        scored = []
+        for org in self.organizations:
+            if source not in org["sources"]:
+                continue
+            org_words = self._words[str(org["id"])]
+            if numbers - org_words:
+                continue
+            overlap = len(words & org_words)
+            if overlap * 2 >= len(words):
+                scored.append((overlap, org))
+
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [org for _, org in scored]
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    """Обработчик запросов одного источника"""
+
+    source = None
+    corpus = None
+    templates = None
+    latency = 0.0
+    stats = None
+    stats_lock = None
+    search_tokens = None  # ЕГРЮЛ: {токен: [запрос, число опросов]}
+    challenge_every = 0  # Контур Фокус: каждый N-й поиск без cookie проверки - проверка
+    overrides = None  # {(метод, путь): (код, Content-Type, тело)} - готовые ответы
+
+    def log_message(self, format, *args):
+        pass  # Не засоряем вывод бенчмарка
+
+    def render(self, template_name, **values):
+        values = {key: escape(str(value)) for key, value in values.items()}
+        return Template(self.templates[template_name]).safe_substitute(values)
+
+    def render_items(self, organizations):
+        return "".join(self.render("result_item", **org) for org in organizations)
+
+    def send_page(self, body, status=200, title=""):
+        if self.latency:
+            time.sleep(self.latency * rd.uniform(0.8, 1.2))
+
+        payload = PAGE.substitute(title=escape(title), body=body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+        with self.stats_lock:
+            self.stats[self.source] = self.stats.get(self.source, 0) + 1
+
+    def send_json(self, data, status=200):
+        if self.latency:
+            time.sleep(self.latency * rd.uniform(0.8, 1.2))
+
+        payload = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+        with self.stats_lock:
+            key = f"{self.source}_json"
+            self.stats[key] = self.stats.get(key, 0) + 1
+
+    def send_override(self, method, path):
+        """
+        Готовый ответ вместо корпуса (для проверки ошибок сайта)
+
+        Returns:
+            bool: True, если для запроса задан готовый ответ и он отправлен
+        """
+        override = (self.overrides or {}).get((method, path))
+        if override is None:
+            return False
+        status, content_type, body = override
+
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+        with self.stats_lock:
+            key = f"{self.source}_override"
+            self.stats[key] = self.stats.get(key, 0) + 1
+        return True
+
+    def send_static(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "image/jpeg")
+        self.send_header("Content-Length", str(STATIC_SIZE))
+        self.end_headers()
+        self.wfile.write(STATIC_PAYLOAD)
+
+        with self.stats_lock:
+            self.stats["static"] = self.stats.get("static", 0) + 1
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path.startswith("/static/"):
+            return self.send_static()
+
+        path = url.path.rstrip("/") or "/"
+        if self.send_override("GET", path):
+            return
+
+        params = parse_qs(url.query)
+        query = params.get("query", [""])[0]
+
+        handler = getattr(self, f"route_{self.source}")
+        handler(path, query)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        form = dict(parse_qsl(self.rfile.read(length).decode("utf-8")))
+        path = urlparse(self.path).path.rstrip("/") or "/"
+        if self.send_override("POST", path):
+            return
+
+        if self.source == "egrul" and path == "/":
+            token = uuid.uuid4().hex
+            with self.stats_lock:
+                self.search_tokens[token] = [form.get("query", ""), 0]
+            return self.send_json({"t": token, "captchaRequired": False})
+
+        self.send_json({"ERRORS": {"query": ["Неизвестный запрос"]}}, status=400)
+
+    def route_rusprofile(self, path, query):
+        if path == "/search-advanced" and not query:
+            return self.send_page(self.templates["search_form"], title="Расширенный поиск")
+
+        if path in ("/search", "/search-advanced"):
+            found = self.corpus.find(query, "rusprofile")
+            if not found:
+                return self.send_page(self.render("not_found"), title="Поиск")
+            if query.strip().isdigit() and len(found) == 1:
+                return self.send_page(self.render("company", **found[0]), title=found[0]["name"])
+            body = Template(self.templates["results"]).safe_substitute(
+                count=len(found), items=self.render_items(found)
+            )
+            return self.send_page(body, title="Поиск")
+
+        match = re.fullmatch(r"/id/(\d+)", path)
+        org = self.corpus.get(match.group(1)) if match else None
+        if org:
+            return self.send_page(self.render("company", **org), title=org["name"])
+
+        self.send_page(self.render("not_found"), status=404)
+
+    def route_kontur(self, path, query):
+        if path == "/search" and self.is_challenged():
+            body = Template(self.templates["challenge"]).safe_substitute(cookie=CHALLENGE_COOKIE)
+            return self.send_page(body, title="Проверка браузера")
+
+        if path == "/search":
+            found = self.corpus.find(query, "kontur")
+            if not found:
+                return self.send_page(self.render("not_found"), title="Контур.Фокус")
+            body = Template(self.templates["results"]).safe_substitute(
+                items=self.render_items(found)
+            )
+            return self.send_page(body, title="Контур.Фокус")
+
+        self.send_page(self.render("not_found"), status=404)
+
+    def route_egrul(self, path, query):
+        if path == "/":
+            return self.send_page(self.templates["search_form"], title="ЕГРЮЛ")
+
+        match = re.fullmatch(r"/search-result/(\w+)", path)
+        if match:
+            with self.stats_lock:
+                entry = self.search_tokens.get(match.group(1))
+                if entry is not None:
+                    entry[1] += 1
+            if entry is None:
+                return self.send_json({"ERRORS": {"t": ["Запрос не найден"]}}, status=404)
+            if entry[1] == 1:
+                return self.send_json({"status": "wait"})
+            found = self.corpus.find(entry[0], "egrul")
+            return self.send_json({"rows": [self.egrul_row(org) for org in found]})
+
+        if path == "/search":
+            found = self.corpus.find(query, "egrul")
+            if not found:
+                return self.send_page(self.render("not_found"), title="ЕГРЮЛ")
+            body = Template(self.templates["results"]).safe_substitute(
+                items=self.render_items(found)
+            )
+            return self.send_page(body, title="ЕГРЮЛ")
+
+        match = re.fullmatch(r"/detail/(\d+)", path)
+        org = self.corpus.get(match.group(1)) if match else None
+        if org:
+            template_name = "detail_inn_only" if org.get("egrul_inn_only") else "detail"
+            return self.send_page(self.render(template_name, **org), title="Выписка")
+
+        self.send_page(self.render("not_found"), status=404)
+
+
+    def is_challenged(self):
+        """
+        Показать проверку «не робот» вместо выдачи
+
+        Проверка - скрипт, который ставит cookie и перезагружает страницу:
+        браузер проходит ее сам, клиент без JavaScript остается на ней.
+        Проверку получает каждый challenge_every-й поиск без этой cookie.
+        """
+        if not self.challenge_every or CHALLENGE_COOKIE in self.headers.get("Cookie", ""):
+            return False
+        with self.stats_lock:
+            count = self.stats.get("kontur_unverified", 0) + 1
+            self.stats["kontur_unverified"] = count
+        if count % self.challenge_every:
+            return False
+        with self.stats_lock:
+            self.stats["kontur_challenge"] = self.stats.get("kontur_challenge", 0) + 1
+        return True
+
+    @staticmethod
+    def egrul_row(org):
+        """Строка JSON-выдачи ЕГРЮЛ (поля как у egrul.nalog.ru)"""
+        row = {"n": org["name"], "i": org["inn"], "o": org["ogrn"], "t": str(org["id"]), "k": "ul"}
+        if not org.get("egrul_inn_only"):
+            row["a"] = org["address"]
+        return row
+
+
+def load_templates(source, recorded_dir=None):
+    """Шаблоны источника с учетом записанных страниц"""
+    templates = dict(TEMPLATES[source])
+    if recorded_dir:
+        for template_name in templates:
+            path = os.path.join(recorded_dir, source, template_name + ".html")
+            if os.path.exists(path):
+                with open(path, "r", encoding="utf-8") as f:
+                    templates[template_name] = f.read()
+    return templates
+
+
+class ReplayServer:
+    """Стенд из трех HTTP-серверов (по одному на источник)"""
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        ports=None,
+        latency_ms=0,
+        corpus=None,
+        recorded_dir=None,
+        kontur_challenge_every=0,
+        overrides=None,
+    ):
+        """
+        Args:
+            overrides: Готовые ответы вместо корпуса:
+                       {(источник, метод, путь): (код, Content-Type, тело)}
+        """
+        self.host = host
+        self.ports = dict(ports or {})
+        self.latency = latency_ms / 1000.0
+        self.corpus = corpus or Corpus()
+        self.recorded_dir = recorded_dir
+        self.kontur_challenge_every = kontur_challenge_every
+        self.overrides = dict(overrides or {})
+        self.requests = {}
+
+        self._stats_lock = threading.Lock()
+        self._search_tokens = {}
+        self._servers = {}
+        self._threads = []
+
+    @property
+    def base_urls(self):
+        """Адреса источников для OrganizationParser(base_urls=...)"""
+        return {
+            source: f"http://{self.host}:{server.server_address[1]}"
+            for source, server in self._servers.items()
+        }
+
+    def start(self):
+        for source in SOURCES:
+            handler = type(
+                f"{source.capitalize()}ReplayHandler",
+                (ReplayHandler,),
+                {
+                    "source": source,
+                    "corpus": self.corpus,
+                    "templates": load_templates(source, self.recorded_dir),
+                    "latency": self.latency,
+                    "stats": self.requests,
+                    "stats_lock": self._stats_lock,
+                    "search_tokens": self._search_tokens,
+                    "challenge_every": self.kontur_challenge_every,
+                    "overrides": {
+                        (method, path): response
+                        for (name, method, path), response in self.overrides.items()
+                        if name == source
+                    },
+                },
+            )
+            server = ThreadingHTTPServer((self.host, self.ports.get(source, 0)), handler)
+            server.daemon_threads = True
+            self._servers[source] = server
+
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+        return self
+
+    def stop(self):
+        for server in self._servers.values():
+            server.shutdown()
+            server.server_close()
+        self._servers.clear()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Локальный стенд источников для бенчмарков")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--rusprofile-port", type=int, default=8101)
+    parser.add_argument("--kontur-port", type=int, default=8102)
+    parser.add_argument("--egrul-port", type=int, default=8103)
+    parser.add_argument("--latency-ms", type=int, default=0, help="Задержка ответа сервера")
+    parser.add_argument("--corpus", default=CORPUS_PATH, help="Корпус организаций (JSON)")
+    parser.add_argument("--recorded", default=None, help="Папка с записанными страницами")
+    parser.add_argument(
+        "--kontur-challenge-every",
+        type=int,
+        default=0,
+        help="Контур Фокус: проверка «не робот» на каждый N-й поиск без JavaScript",
+    )
+    args = parser.parse_args()
+
+    server = ReplayServer(
+        host=args.host,
+        ports={
+            "rusprofile": args.rusprofile_port,
+            "kontur": args.kontur_port,
+            "egrul": args.egrul_port,
+        },
+        latency_ms=args.latency_ms,
+        corpus=Corpus(args.corpus),
+        recorded_dir=args.recorded,
+        kontur_challenge_every=args.kontur_challenge_every,
+    ).start()
+
+    for source, url in server.base_urls.items():
+        print(f"{source:<12} {url}")
+    print("Ctrl+C для остановки")
+
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,383 @@
+"""
+Бенчмарк каскадного поиска организаций на локальном стенде
+
+Поднимает replay_server, направляет на него сеарчеры через
+OrganizationParser(base_urls=...) и прогоняет фиксированный корпус
+названий через search_organization. Выводит:
+- строк в секунду за весь прогон
+- p50/p95 длительности вызова по каждому источнику
+- долю времени в ожиданиях хуманизации и в работе браузера/извлечении
+- байты и время загрузки страниц (с фильтром ресурсов и без: --compare-resources)
+- время, сэкономленное параллельным поиском по источникам (--fan-out)
+- запросы к сайтам и ожидание очереди общего лимита (--rate-limit)
+
+Нужны Chrome и chromedriver (как для обычного запуска).
+
+Запуск из корня репозитория:
+    python benchmarks/run_benchmark.py --mode fast --latency-ms 150
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import argparse
+import functools
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARKS_DIR, "..", "src"))
+sys.path.insert(0, BENCHMARKS_DIR)
+
+from gui.parser_core import OrganizationParser  # noqa: E402
+from gui.rate_limiter import get_rate_limiter, parse_rate  # noqa: E402
+from replay_server import CORPUS_PATH, Corpus, ReplayServer  # noqa: E402
+
+
+# Методы Humanization, время в которых считается ожиданием
+HUMANIZER_METHODS = (
+    "human_like_type",
+    "human_like_scroll",
+    "human_like_hover",
+    "human_like_click",
+    "human_like_wait",
+    "human_like_wait_for_element",
+    "random_mouse_movement",
+)
+
+# Сеарчеры OrganizationParser и названия источников в отчете
+SEARCHERS = (
+    ("rusprofile_searcher", "RusProfile"),
+    ("kontur_fokus_searcher", "Контур Фокус"),
+    ("egrul_searcher", "ЕГРЮЛ"),
+)
+
+
+class WaitMeter:
+    """Суммарное время внутри методов хуманизации (вложенные вызовы не дублируются)"""
+
+    def __init__(self):
+        self.total = 0.0
+        self._depth = 0
+
+    def wrap(self, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            self._depth += 1
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._depth -= 1
+                if self._depth == 0:
+                    self.total += time.perf_counter() - start
+
+        return wrapper
+
+
+class SourceMeter:
+    """Длительность, ожидания и результат каждого вызова searcher.search"""
+
+    def __init__(self, wait_meter):
+        self.wait_meter = wait_meter
+        self.calls = {}  # {источник: [(длительность, ожидания, найдено)]}
+
+    def wrap(self, source, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            wait_before = self.wait_meter.total
+            start = time.perf_counter()
+            result = {}
+            try:
+                result = func(*args, **kwargs)
+                return result
+            finally:
+                duration = time.perf_counter() - start
+                waits = self.wait_meter.total - wait_before
+                self.calls.setdefault(source, []).append(
+                    (duration, waits, bool((result or {}).get("found")))
+                )
+
+        return wrapper
+
+
+def parse_rate_limits(values):
+    """Лимиты из аргументов вида rusprofile=60/5"""
+    rates = {}
+    for value in values:
+        domain, _, rate = value.partition("=")
+        rates[domain] = parse_rate(rate)
+    return {domain: rate for domain, rate in rates.items() if rate}
+
+
+def percentile(values, percent):
+    """Перцентиль методом ближайшего ранга"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(percent / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def instrument(parser):
+    """Подключение счетчиков к хуманизатору и сеарчерам парсера"""
+    wait_meter = WaitMeter()
+    for name in HUMANIZER_METHODS:
+        setattr(parser.humanizer, name, wait_meter.wrap(getattr(parser.humanizer, name)))
+
+    source_meter = SourceMeter(wait_meter)
+    for attribute, source in SEARCHERS:
+        searcher = getattr(parser, attribute)
+        searcher.search = source_meter.wrap(source, searcher.search)
+
+    # Источники параллельного поиска (ожидания их хуманизации не учитываются)
+    for lane in parser.fan_out_lanes:
+        lane.searcher.search = source_meter.wrap(lane.title, lane.searcher.search)
+
+    return wait_meter, source_meter
+
+
+def run(args, block_resources=None):
+    if block_resources is None:
+        block_resources = args.block_resources
+    corpus = Corpus(args.corpus)
+    queries = corpus.queries * args.repeat
+    if args.limit:
+        queries = queries[:args.limit]
+    rate_limiter = get_rate_limiter()
+    rate_limiter.configure(parse_rate_limits(args.rate_limit))
+
+    with ReplayServer(
+        latency_ms=args.latency_ms,
+        corpus=corpus,
+        recorded_dir=args.recorded,
+        kontur_challenge_every=args.kontur_challenge_every,
+    ) as server:
+        parser = OrganizationParser(
+            log_callback=(print if args.verbose else lambda message: None),
+            humanization_mode=args.mode,
+            base_urls=server.base_urls,
+            direct_input={name: True for name in args.direct_input},
+            variant_budget=args.variant_budget,
+            block_resources=block_resources,
+            measure_pages=True,
+            fan_out=args.fan_out,
+            egrul_http=args.egrul_http,
+            kontur_http=args.kontur_http,
+        )
+        parser.init_browser()
+        wait_meter, source_meter = instrument(parser)
+
+        row_times = []
+        found_rows = 0
+        started = time.perf_counter()
+        try:
+            for idx, query in enumerate(queries, 1):
+                row_start = time.perf_counter()
+                result = parser.search_organization(query)
+                row_times.append(time.perf_counter() - row_start)
+                if result.get("source") != "Не найдено":
+                    found_rows += 1
+                print(
+                    f"[{idx}/{len(queries)}] {row_times[-1]:6.2f} с  "
+                    f"{result.get('source', ''):<22} {query}"
+                )
+        finally:
+            elapsed = time.perf_counter() - started
+            webdriver_commands = parser.webdriver_command_count()
+            page_stats = parser.browser.page_stats()
+            fan_out_saved = parser.fan_out_saved_seconds
+            kontur_paths = parser.kontur_paths.snapshot() if parser.kontur_paths else {}
+            parser.close_browser()
+
+        requests_per_source = dict(server.requests)
+
+    sources = {}
+    for source, calls in source_meter.calls.items():
+        durations = [duration for duration, _, _ in calls]
+        sources[source] = {
+            "calls": len(calls),
+            "found": sum(1 for _, _, found in calls if found),
+            "p50": percentile(durations, 50),
+            "p95": percentile(durations, 95),
+            "total": sum(durations),
+            "waits": sum(waits for _, waits, _ in calls),
+        }
+
+    return {
+        "mode": args.mode,
+        "block_resources": block_resources,
+        "latency_ms": args.latency_ms,
+        "rows": len(queries),
+        "found_rows": found_rows,
+        "elapsed": elapsed,
+        "rows_per_second": len(queries) / elapsed if elapsed else 0.0,
+        "row_p50": percentile(row_times, 50),
+        "row_p95": percentile(row_times, 95),
+        "waits": wait_meter.total,
+        "webdriver_commands": webdriver_commands,
+        "fan_out": args.fan_out,
+        "fan_out_saved": fan_out_saved,
+        "kontur_paths": kontur_paths,
+        "rate_limits": rate_limiter.snapshot(),
+        "pages": page_stats,
+        "sources": sources,
+        "server_requests": requests_per_source,
+    }
+
+
+def rate_limits_lines(snapshot):
+    """Строки отчета по запросам к сайтам (RateLimiter.snapshot)"""
+    lines = []
+    for domain, stats in sorted(snapshot.items()):
+        if not stats["total"]:
+            continue
+        limit = f"{stats['requests_per_minute']:g}/мин" if stats["requests_per_minute"] else "без лимита"
+        lines.append(
+            f"Запросы к {domain}: {stats['total']} ({limit}), "
+            f"ожидание очереди {stats['waited_seconds']:.1f} с"
+        )
+    return lines
+
+
+def print_report(report):
+    print("\n" + "=" * 78)
+    print(
+        f"Режим: {report['mode']}, задержка стенда: {report['latency_ms']} мс, "
+        f"строк: {report['rows']} (найдено {report['found_rows']})"
+    )
+    print(
+        f"Всего: {report['elapsed']:.1f} с, {report['rows_per_second']:.3f} строк/с, "
+        f"строка p50 {report['row_p50']:.2f} с / p95 {report['row_p95']:.2f} с"
+    )
+
+    waits = report["waits"]
+    rest = max(0.0, report["elapsed"] - waits)
+    share = waits / report["elapsed"] * 100 if report["elapsed"] else 0.0
+    print(f"Ожидания хуманизации: {waits:.1f} с ({share:.0f}%), браузер и извлечение: {rest:.1f} с")
+    commands = report["webdriver_commands"]
+    print(f"Команд WebDriver: {commands} ({commands / report['rows']:.1f} на строку)")
+    if report["fan_out"]:
+        print(
+            f"Параллельный поиск: сэкономлено {report['fan_out_saved']:.1f} с "
+            f"({report['fan_out_saved'] / report['rows']:.2f} с на строку)"
+        )
+    if report["kontur_paths"]:
+        paths = report["kontur_paths"]
+        print(
+            f"Контур Фокус: {paths.get('http', 0)} поисков по HTTP, "
+            f"{paths.get('browser', 0)} через браузер"
+        )
+    for line in rate_limits_lines(report["rate_limits"]):
+        print(line)
+    pages = report["pages"]
+    print(
+        f"Фильтр ресурсов: {'вкл' if report['block_resources'] else 'выкл'}, "
+        f"страниц: {pages['pages']}, {pages['bytes_per_page'] / 1024:.1f} КБ и "
+        f"{pages['resources_per_page']:.1f} ресурсов на страницу, "
+        f"загрузка {pages['load_seconds_per_page']:.2f} с"
+    )
+
+    print("-" * 78)
+    print(
+        f"{'Источник':<14}{'вызовов':>8}{'найдено':>9}{'p50, с':>9}{'p95, с':>9}"
+        f"{'ожидания, с':>13}{'остальное, с':>15}"
+    )
+    for source, stats in report["sources"].items():
+        print(
+            f"{source:<14}{stats['calls']:>8}{stats['found']:>9}"
+            f"{stats['p50']:>9.2f}{stats['p95']:>9.2f}"
+            f"{stats['waits']:>13.1f}{stats['total'] - stats['waits']:>15.1f}"
+        )
+
+    print("-" * 78)
+    print(f"Запросов к стенду: {report['server_requests']}")
+    print("=" * 78)
+
+
+def print_resources_comparison(without_filter, with_filter):
+    before, after = without_filter["pages"], with_filter["pages"]
+    print("\nФильтр ресурсов: без / с фильтром")
+    print(
+        f"  КБ на страницу:       {before['bytes_per_page'] / 1024:8.1f} / "
+        f"{after['bytes_per_page'] / 1024:8.1f}"
+    )
+    print(
+        f"  загрузка страницы, с: {before['load_seconds_per_page']:8.2f} / "
+        f"{after['load_seconds_per_page']:8.2f}"
+    )
+    print(
+        f"  строк/с:              {without_filter['rows_per_second']:8.3f} / "
+        f"{with_filter['rows_per_second']:8.3f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк поиска организаций на локальном стенде")
+    parser.add_argument("--mode", default="fast", choices=("fast", "normal", "safe"))
+    parser.add_argument("--latency-ms", type=int, default=0, help="Задержка ответа стенда")
+    parser.add_argument("--repeat", type=int, default=1, help="Сколько раз прогнать корпус")
+    parser.add_argument("--limit", type=int, default=0, help="Ограничить число строк")
+    parser.add_argument(
+        "--direct-input",
+        nargs="*",
+        default=[],
+        choices=("rusprofile", "egrul"),
+        help="Сеарчеры, вводящие запрос одной командой вместо имитации набора",
+    )
+    parser.add_argument(
+        "--variant-budget", type=int, default=None, help="Вариантов названия на организацию (0 - все)"
+    )
+    parser.add_argument(
+        "--block-resources", action="store_true", help="Блокировать картинки, шрифты и трекеры"
+    )
+    parser.add_argument(
+        "--compare-resources", action="store_true", help="Два прогона: без фильтра ресурсов и с ним"
+    )
+    parser.add_argument(
+        "--fan-out", action="store_true", help="Искать во всех источниках сразу (браузер на источник)"
+    )
+    parser.add_argument(
+        "--egrul-http", action="store_true", help="Искать в ЕГРЮЛ по HTTP без браузера"
+    )
+    parser.add_argument(
+        "--kontur-http",
+        action="store_true",
+        help="Контур Фокус сначала по HTTP, браузер - только при проверке или скриптах",
+    )
+    parser.add_argument(
+        "--kontur-challenge-every",
+        type=int,
+        default=0,
+        help="Стенд: проверка «не робот» на каждый N-й поиск Контур Фокуса без JavaScript",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        nargs="*",
+        default=[],
+        metavar="САЙТ=В_МИНУТУ/ПОДРЯД",
+        help="Общий лимит запросов, например rusprofile=60/5 egrul=120/10",
+    )
+    parser.add_argument("--corpus", default=CORPUS_PATH)
+    parser.add_argument("--recorded", default=None, help="Папка с записанными страницами")
+    parser.add_argument("--json", default=None, help="Сохранить отчет в JSON")
+    parser.add_argument("--verbose", action="store_true", help="Выводить лог парсера")
+    args = parser.parse_args()
+
+    if args.compare_resources:
+        reports = [run(args, block_resources=False), run(args, block_resources=True)]
+        for report in reports:
+            print_report(report)
+        print_resources_comparison(*reports)
+        report = reports
+    else:
+        report = run(args)
+        print_report(report)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Пакет чтения и записи Excel-файлов"""
@@ -0,0 +1,46 @@
+"""
+Чтение входных Excel-файлов
+"""
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from .utils import SOURCE_COLUMN, is_xlsx
+
+
+def read_column(file_path, column=SOURCE_COLUMN):
+    """
+    Чтение одного столбца первого листа без загрузки остальных
+
+    .xlsx читается построчно (openpyxl read_only), в памяти остаются только
+    значения нужного столбца. Строки нумеруются так же, как в pd.read_excel:
+    первая строка - заголовок, пустые строки в конце листа отбрасываются.
+
+    Returns:
+        DataFrame: Единственный столбец column
+
+    Raises:
+        ValueError: В файле нет столбца column
+    """
+    if not is_xlsx(file_path):
+        # Старый .xls построчно не читается - ограничиваемся одним столбцом
+        return pd.read_excel(file_path, usecols=[column])
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True, keep_links=False)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = list(next(rows, ()))
+        if column not in header:
+            raise ValueError(f"В файле нет столбца «{column}»")
+        position = header.index(column)
+
+        values = []
+        last_filled = 0  # Число строк до последней непустой
+        for row in rows:
+            values.append(row[position] if position < len(row) else None)
+            if any(value is not None for value in row):
+                last_filled = len(values)
+    finally:
+        workbook.close()
+
+    return pd.DataFrame({column: values[:last_filled]})
@@ -0,0 +1,76 @@
+"""
+Общие константы и вспомогательные функции для работы с Excel-файлами
+"""
+
+import sys
+
+
+# Столбец входного файла с названиями организаций
+SOURCE_COLUMN = "Образовательное учреждение из 1С"
+
+# Столбцы, которые заполняет парсер (в порядке добавления в файл)
+RESULT_COLUMNS = (
+    "Полное название",
+    "Родительный падеж",
+    "Адрес",
+    "Индекс",
+    "ИНН",
+    "ОГРН",
+    "Источник",
+)
+
+
+def is_xlsx(file_path):
+    """Файл в формате Office Open XML (читается и пишется построчно через openpyxl)"""
+    return file_path.lower().endswith((".xlsx", ".xlsm"))
+
+
+def peak_rss_mb():
+    """
+    Пиковая резидентная память процесса приложения в МБ (без Chrome)
+
+    Returns:
+        float | None: None, если ОС не отдает пиковую память
+    """
+    try:
+        import resource
+    except ImportError:
+        return _windows_peak_rss_mb()
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux отдает КБ, macOS - байты
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def _windows_peak_rss_mb():
+    """Пиковый рабочий набор процесса в Windows (GetProcessMemoryInfo)"""
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if not ctypes.windll.psapi.GetProcessMemoryInfo(
+            process, ctypes.byref(counters), counters.cb
+        ):
+            return None
+        return counters.PeakWorkingSetSize / (1024 * 1024)
+    except (AttributeError, OSError, ImportError):
+        return None
@@ -0,0 +1,64 @@
+"""
+Запись результатов парсинга в Excel-файл
+"""
+
+import pandas as pd
+from openpyxl import Workbook, load_workbook
+
+from .utils import RESULT_COLUMNS, is_xlsx
+
+
+def write_results(input_path, output_path, results, columns=RESULT_COLUMNS):
+    """
+    Потоковая запись результата: входной файл с добавленными столбцами
+
+    Строки входного .xlsx читаются по одной (read_only) и сразу дописываются
+    в выходную книгу (write_only), которая сбрасывает строки во временный
+    файл на диске. Весь лист в памяти не собирается. Столбцы с теми же
+    названиями, что уже есть во входном файле, перезаписываются.
+
+    Args:
+        input_path: Входной Excel-файл
+        output_path: Файл результата (.xlsx)
+        results: DataFrame со столбцами columns; i-я строка относится
+                 к i-й строке данных входного файла
+        columns: Названия столбцов результата
+    """
+    if not is_xlsx(input_path):
+        # Старый .xls построчно не читается - собираем лист целиком
+        df = pd.read_excel(input_path)
+        for column in columns:
+            df[column] = results[column].reindex(range(len(df))).fillna("").tolist()
+        df.to_excel(output_path, index=False)
+        return
+
+    result_rows = results[list(columns)].itertuples(index=False, name=None)
+
+    source = load_workbook(input_path, read_only=True, data_only=True, keep_links=False)
+    target = Workbook(write_only=True)
+    try:
+        rows = source.worksheets[0].iter_rows(values_only=True)
+        header = list(next(rows, ()))
+        width = len(header)
+
+        # Позиция каждого столбца результата в выходной строке
+        positions = []
+        for column in columns:
+            if column in header:
+                positions.append(header.index(column))
+            else:
+                positions.append(len(header))
+                header.append(column)
+
+        sheet = target.create_sheet(source.worksheets[0].title)
+        sheet.append(header)
+
+        for row in rows:
+            values = list(row[:width]) + [None] * (len(header) - min(len(row), width))
+            for position, value in zip(positions, next(result_rows, ())):
+                values[position] = value
+            sheet.append(values)
+
+        target.save(output_path)
+    finally:
+        source.close()
@@ -0,0 +1,456 @@
+"""
+Асинхронный движок поиска: много строк одновременно с ограничением по сайтам
+"""
+
+import asyncio
+import copy
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+from selenium.common.exceptions import WebDriverException
+
+from .http_searchers import (
+    EgrulHttpSearcher,
+    FetchPathStats,
+    KonturFokusHttpSearcher,
+    create_session,
+)
+from .parser_core import KonturFokusSearcher, OrganizationParser
+
+
+# Сколько запросов к одному сайту может идти одновременно
+DOMAIN_LIMITS = {
+    "kontur": 4,
+    "egrul": 8,
+    "gigachat": 2,
+}
+
+
+class AsyncSearchEngine:
+    """
+    Поиск по многим строкам сразу в одном цикле asyncio
+
+    Каждая строка - корутина с тем же каскадом, что и
+    OrganizationParser.search_organization: RusProfile → Контур Фокус → ЕГРЮЛ
+    → (по ИНН из ЕГРЮЛ: RusProfile → Контур Фокус) → GigaChat. Контур Фокус и
+    ЕГРЮЛ ищутся по HTTP, если так настроены парсеры (kontur_http, egrul_http),
+    иначе - в браузере, как в обычном каскаде.
+
+    С prefetch=True HTTP-источники запрашиваются заранее, пока строка ждет
+    браузер для RusProfile; ответ все равно берется в порядке каскада, а
+    ненужные запросы отменяются. Это быстрее, но каждая строка нагружает
+    Контур Фокус и ЕГРЮЛ, даже если ее нашел RusProfile.
+
+    Блокирующие вызовы выполняются в пулах потоков: HTTP-запросы (requests) -
+    в общем пуле, число одновременных запросов к каждому сайту ограничивает
+    свой asyncio.Semaphore (DOMAIN_LIMITS); шаги в браузере - в пуле размером
+    с число браузеров, каждый шаг занимает один из parsers целиком. Место
+    у сайта освобождается, только когда поток пула закончил запрос, даже
+    если строка его уже отменила. Строк в работе одновременно - не больше
+    max_in_flight.
+    """
+
+    def __init__(
+        self,
+        parsers,
+        domain_limits=None,
+        max_in_flight=200,
+        gigachat_api=None,
+        gigachat_attempts=None,
+        result_cache=None,
+        log_callback=None,
+        session=None,
+        should_stop=None,
+        is_paused=None,
+        prefetch=False,
+    ):
+        """
+        Args:
+            parsers: OrganizationParser с запущенными браузерами
+            domain_limits: Ограничения одновременных запросов по сайтам
+                           (поверх DOMAIN_LIMITS)
+            max_in_flight: Сколько строк ищется одновременно
+            gigachat_api: GigaChatAPI для последнего шага каскада (или None)
+            gigachat_attempts: Попыток GigaChat на все строки (None - без ограничения)
+            result_cache: ResultCache (или None)
+            log_callback: Функция для логирования
+            session: requests.Session для HTTP-источников
+            should_stop: Функция без аргументов: True - новые строки не начинать
+            is_paused: Функция без аргументов: True - новые строки ждут
+            prefetch: Запрашивать HTTP-источники заранее, не дожидаясь RusProfile
+        """
+        self.parsers = list(parsers)
+        self.domain_limits = dict(DOMAIN_LIMITS, **(domain_limits or {}))
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.gigachat_api = gigachat_api
+        self.gigachat_attempts = gigachat_attempts
+        self.gigachat_used = 0
+        self.result_cache = result_cache
+        self.log_callback = log_callback
+        self.should_stop = should_stop or (lambda: False)
+        self.is_paused = is_paused or (lambda: False)
+        self.prefetch = prefetch
+
+        first = self.parsers[0]
+        self.tracer = first.tracer
+        self.session = session or create_session(pool_size=max(self.domain_limits.values()))
+        # Поисков в Контур Фокус по HTTP и через браузер (общие с парсером - попадают в его итоги)
+        self.kontur_paths = first.kontur_paths or FetchPathStats()
+
+        # Подробный лог сеарчеров при сотнях строк в работе перемешивается - не выводим.
+        # Сеарчеры - образцы: у каждой строки своя копия со своим cancel_event
+        quiet = lambda message: None  # noqa: E731
+        self.egrul_searcher = None
+        if first.egrul_http:
+            self.egrul_searcher = EgrulHttpSearcher(
+                session=self.session,
+                log_callback=quiet,
+                base_url=first.base_urls.get("egrul"),
+                tracer=self.tracer,
+            )
+        self.kontur_searcher = None
+        if first.kontur_http:
+            self.kontur_searcher = KonturFokusHttpSearcher(
+                None,
+                None,
+                log_callback=quiet,
+                base_url=first.base_urls.get("kontur"),
+                tracer=self.tracer,
+                session=self.session,
+                path_stats=self.kontur_paths,
+            )
+
+        self._idle_parsers = queue.Queue()
+        for parser in self.parsers:
+            self._idle_parsers.put(parser)
+
+        self._semaphores = {}
+        self._in_flight = {}
+        self._background = set()  # Отмененные заранее сделанные запросы, которые еще идут
+        self.peak_in_flight = {}  # Наибольшее число одновременных запросов по сайтам
+        self.rows = 0
+        self.elapsed = 0.0
+
+    def log(self, message):
+        """Вывод сообщения в лог"""
+        if self.log_callback:
+            self.log_callback(message)
+        else:
+            print(message)
+
+    def search_all(self, org_names, on_result=None):
+        """
+        Синхронная обертка над search_many (свой цикл asyncio)
+
+        Returns:
+            list: Результаты в порядке org_names (None - строка не искалась)
+        """
+        return asyncio.run(self.search_many(org_names, on_result))
+
+    async def search_many(self, org_names, on_result=None):
+        """
+        Поиск всех названий
+
+        Args:
+            org_names: Названия организаций
+            on_result: Функция (номер строки, результат), вызывается в потоке
+                       цикла asyncio по мере готовности строк
+
+        Returns:
+            list: Результаты в порядке org_names (None - строка не искалась
+            из-за остановки)
+        """
+        self._semaphores = {
+            domain: asyncio.Semaphore(limit) for domain, limit in self.domain_limits.items()
+        }
+        self._semaphores["rusprofile"] = asyncio.Semaphore(len(self.parsers))
+        rows = asyncio.Semaphore(self.max_in_flight)
+
+        http_workers = sum(self.domain_limits.values())
+        self._http_executor = ThreadPoolExecutor(http_workers, thread_name_prefix="async_http")
+        self._browser_executor = ThreadPoolExecutor(
+            len(self.parsers), thread_name_prefix="async_browser"
+        )
+
+        async def run_row(index, org_name):
+            async with rows:
+                while self.is_paused() and not self.should_stop():
+                    await asyncio.sleep(0.1)
+                if self.should_stop():
+                    return None
+
+                row_started = time.perf_counter()
+                # Интервалы трассировки пишутся только в потоках пулов: стек интервалов
+                # Tracer привязан к потоку, а строки в цикле asyncio чередуются
+                try:
+                    result = await self.search_organization(org_name)
+                except Exception as e:
+                    if self.should_stop():
+                        return None
+                    self.log(f"❌ [{index + 1}] {org_name}: ошибка поиска ({e})")
+                    result = OrganizationParser._empty_result()
+
+                self.rows += 1
+                self.log(
+                    f"📋 [{index + 1}/{len(org_names)}] {org_name} → {result['source']} "
+                    f"({time.perf_counter() - row_started:.1f} с)"
+                )
+                if on_result:
+                    on_result(index, result)
+                return result
+
+        started = time.perf_counter()
+        try:
+            return await asyncio.gather(
+                *(run_row(index, org_name) for index, org_name in enumerate(org_names))
+            )
+        finally:
+            # Отмененные запросы дорабатывают в потоках пула - ждем их, чтобы не оставить
+            # занятые места у сайтов и потоки после возврата
+            if self._background:
+                await asyncio.gather(*self._background, return_exceptions=True)
+            self.elapsed += time.perf_counter() - started
+            self._http_executor.shutdown(wait=False, cancel_futures=True)
+            self._browser_executor.shutdown(wait=False, cancel_futures=True)
+
+    async def search_organization(self, org_name):
+        """Каскад источников для одной строки (с кэшем результатов)"""
+        if self.result_cache:
+            cached = self.result_cache.get(org_name)
+            if cached is not None:
+                return cached
+
+        result = await self._search_cascade(org_name)
+
+        if self.result_cache:
+            try:
+                self.result_cache.put(org_name, result)
+            except Exception as e:
+                self.log(f"  ⚠️ Не удалось сохранить результат в кэш: {e}")
+        return result
+
+    async def _search_cascade(self, org_name):
+        """Каскад источников; с prefetch HTTP-источники запрашиваются заранее"""
+        result = OrganizationParser._empty_result()
+
+        # Отмена HTTP-запросов строки: сеарчеры проверяют ее перед каждым запросом
+        cancel_event = threading.Event()
+        kontur = self._row_searcher(self.kontur_searcher, cancel_event)
+        egrul = self._row_searcher(self.egrul_searcher, cancel_event)
+
+        kontur_task = egrul_task = None
+        if self.prefetch:
+            if kontur is not None:
+                kontur_task = asyncio.ensure_future(
+                    self._http("kontur", kontur.search_without_browser, org_name, None)
+                )
+            if egrul is not None:
+                egrul_task = asyncio.ensure_future(self._http("egrul", egrul.search, org_name))
+        try:
+            # 1. RusProfile
+            found = await self._in_browser(
+                "RusProfile", lambda parser: parser.rusprofile_searcher.search(org_name=org_name)
+            )
+            if found["found"]:
+                return self._finish(result, found, "RusProfile")
+
+            # 2. Контур Фокус (в браузере, если HTTP выключен или не справился)
+            found = await self._kontur(kontur, org_name=org_name, prefetched=kontur_task)
+            if found["found"]:
+                return self._finish(result, found, "Контур Фокус")
+
+            # 3. ЕГРЮЛ
+            egrul_result = await self._egrul(egrul, org_name, prefetched=egrul_task)
+            if egrul_result["found"]:
+                return self._finish(result, egrul_result, "ЕГРЮЛ")
+        finally:
+            cancel_event.set()
+            for task in (kontur_task, egrul_task):
+                if task is None:
+                    continue
+                if task.done():
+                    if not task.cancelled():
+                        task.exception()  # Ошибка ненужного ответа не попадает в лог asyncio
+                    continue
+                task.cancel()
+                self._background.add(task)
+                task.add_done_callback(self._background.discard)
+
+        inn = egrul_result.get("inn")
+        if inn:
+            if self.result_cache:
+                cached = self.result_cache.get_by_inn(inn)
+                cached_source = (cached or {}).get("source", "").split(" → ")[-1]
+                if cached_source in ("RusProfile", "Контур Фокус"):
+                    return self._finish(result, cached, f"ЕГРЮЛ → {cached_source}")
+
+            found = await self._in_browser(
+                "RusProfile", lambda parser: parser.rusprofile_searcher.search(inn=inn), by="inn"
+            )
+            if found["found"]:
+                return self._finish(result, found, "ЕГРЮЛ → RusProfile")
+
+            kontur = self._row_searcher(self.kontur_searcher, None)
+            found = await self._kontur(kontur, inn=inn)
+            if found["found"]:
+                return self._finish(result, found, "ЕГРЮЛ → Контур Фокус")
+
+        # 4. GigaChat (попытки общие для всех строк)
+        if self.gigachat_api and (
+            self.gigachat_attempts is None or self.gigachat_used < self.gigachat_attempts
+        ):
+            self.gigachat_used += 1
+            try:
+                found = await self._http(
+                    "gigachat", self.gigachat_api.search_organization_in_egrul, org_name
+                )
+            except Exception as e:
+                self.log(f"  ⚠️ Ошибка GigaChat ({org_name}): {e}")
+            else:
+                if found["found"]:
+                    return self._finish(result, found, "GigaChat (ЕГРЮЛ)")
+
+        return result
+
+    @staticmethod
+    def _row_searcher(searcher, cancel_event):
+        """Копия HTTP-сеарчера для одной строки (None - источник ищется в браузере)"""
+        if searcher is None:
+            return None
+        searcher = copy.copy(searcher)
+        searcher.cancel_event = cancel_event
+        return searcher
+
+    @staticmethod
+    def _finish(result, found, source):
+        result.update(found)
+        result["source"] = source
+        return result
+
+    async def _kontur(self, searcher, org_name=None, inn=None, prefetched=None):
+        """
+        Поиск в Контур Фокус: HTTP, при необходимости - браузер
+
+        Args:
+            searcher: KonturFokusHttpSearcher строки или None (HTTP выключен)
+            prefetched: Задача с заранее сделанным search_without_browser
+        """
+        if searcher is not None:
+            if prefetched is None:
+                prefetched = self._http(
+                    "kontur", searcher.search_without_browser, org_name, inn
+                )
+            found, reason = await prefetched
+            if reason is None:
+                return found
+            self.kontur_paths.record("browser")
+
+        # Поиск базового класса: у парсера с kontur_http он не повторяет HTTP-запрос
+        return await self._in_browser(
+            "Контур Фокус",
+            lambda parser: KonturFokusSearcher.search(
+                parser.kontur_fokus_searcher, org_name=org_name, inn=inn
+            ),
+        )
+
+    async def _egrul(self, searcher, org_name, prefetched=None):
+        """Поиск в ЕГРЮЛ по HTTP (searcher строки) или в браузере (searcher is None)"""
+        if searcher is None:
+            return await self._in_browser(
+                "ЕГРЮЛ", lambda parser: parser.egrul_searcher.search(org_name)
+            )
+        if prefetched is None:
+            prefetched = self._http("egrul", searcher.search, org_name)
+        return await prefetched
+
+    @asynccontextmanager
+    async def _domain_slot(self, domain):
+        """Место среди одновременных запросов к сайту domain"""
+        async with self._semaphores[domain]:
+            self._in_flight[domain] = self._in_flight.get(domain, 0) + 1
+            self.peak_in_flight[domain] = max(
+                self.peak_in_flight.get(domain, 0), self._in_flight[domain]
+            )
+            try:
+                yield
+            finally:
+                self._in_flight[domain] -= 1
+
+    async def _http(self, domain, function, *args):
+        """Блокирующий HTTP-запрос в пуле потоков с ограничением по сайту"""
+        async with self._domain_slot(domain):
+            return await self._in_executor(self._http_executor, function, *args)
+
+    async def _in_browser(self, source, step, **attrs):
+        """Шаг в браузере свободного парсера (step получает OrganizationParser)"""
+        async with self._domain_slot("rusprofile"):
+            return await self._in_executor(
+                self._browser_executor, self._run_browser_step, source, step, attrs
+            )
+
+    @staticmethod
+    async def _in_executor(executor, function, *args):
+        """
+        Вызов в пуле потоков, который при отмене дожидается конца вызова
+
+        Поток пула отмену не замечает и работает дальше, поэтому отмененная
+        корутина не выходит (и не отдает место у сайта), пока вызов не закончится.
+        """
+        future = asyncio.get_running_loop().run_in_executor(executor, function, *args)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            await asyncio.wait([future])
+            if not future.cancelled():
+                future.exception()  # Обычно SearchCancelled - результат отмененного вызова не нужен
+            raise
+
+    def _run_browser_step(self, source, step, attrs):
+        """
+        Шаг в браузере с перезапуском упавшего Chrome (в потоке пула)
+
+        Сеарчеры перехватывают ошибки сами, поэтому упавший Chrome чаще всего
+        выглядит как «не найдено»; такой результат, как и в
+        OrganizationParser._search_organization_recovering, перепроверяется на
+        живость браузера, и шаг повторяется в новом. Строка попадает в кэш
+        только с результатом повтора.
+        """
+        parser = self._idle_parsers.get()
+        try:
+            manager = parser.browser_manager
+            if manager is not None:
+                manager.maybe_recycle()
+            with self.tracer.span("searcher", source=source, **attrs):
+                try:
+                    found = step(parser)
+                    if found.get("found") or manager is None or manager.is_alive():
+                        return found
+                    reason = "браузер перестал отвечать"
+                except WebDriverException as e:
+                    if manager is None or manager.is_alive():
+                        raise
+                    reason = f"браузер упал ({type(e).__name__})"
+                # Закрытый остановкой браузер restart не поднимет (BrowserClosed)
+                manager.restart(reason)
+                return step(parser)
+        finally:
+            self._idle_parsers.put(parser)
+
+    def stats_line(self):
+        """Строка лога со скоростью и пиковой нагрузкой на сайты"""
+        rate = self.rows / self.elapsed if self.elapsed else 0.0
+        limits = dict(self.domain_limits, rusprofile=len(self.parsers))
+        peaks = ", ".join(
+            f"{domain} {self.peak_in_flight.get(domain, 0)}/{limit}"
+            for domain, limit in limits.items()
+            if self.peak_in_flight.get(domain)
+        )
+        line = f"🚀 Асинхронный движок: {self.rows} строк за {self.elapsed:.1f} с ({rate:.2f} строк/с)"
+        if peaks:
+            line += f", одновременных запросов (пик/лимит): {peaks}"
+        if self.gigachat_used:
+            line += f", попыток GigaChat: {self.gigachat_used}"
+        return line
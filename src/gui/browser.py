@@ -0,0 +1,536 @@
+"""
+Модуль браузера Chrome для парсинга
+"""
+
+import sys
+import shutil
+import tempfile
+import threading
+import subprocess
+from urllib.parse import urlparse
+
+from selenium import webdriver as wd
+from selenium.common.exceptions import WebDriverException
+
+
+class CountingChrome(wd.Chrome):
+    """
+    Chrome со счетчиком команд WebDriver.
+
+    Каждая команда (find_element, send_keys, execute_script, get ...) - отдельный
+    HTTP-запрос к chromedriver, поэтому их число показывает, во что обходится
+    поиск помимо ожиданий.
+    """
+
+    # Байты страницы по Navigation/Resource Timing. Для сторонних ресурсов без
+    # Timing-Allow-Origin размер не сообщается, поэтому оценка снизу.
+    PAGE_METRICS_SCRIPT = """
+        var entries = performance.getEntriesByType('navigation')
+            .concat(performance.getEntriesByType('resource'));
+        var bytes = 0;
+        for (var i = 0; i < entries.length; i++) {
+            bytes += entries[i].transferSize || entries[i].encodedBodySize || 0;
+        }
+        return {bytes: bytes, resources: entries.length};
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._count_lock = threading.Lock()
+        self.command_count = 0
+        self.command_counts = {}  # {команда: количество}
+        # Байты страниц считаются только при measure_pages (лишняя команда на страницу)
+        self.measure_pages = False
+        self.page_count = 0
+        self.page_bytes = 0
+        self.page_resources = 0
+        self.page_load_seconds = 0.0
+        super().__init__(*args, **kwargs)
+
+    def execute(self, driver_command, params=None):
+        with self._count_lock:
+            self.command_count += 1
+            self.command_counts[driver_command] = self.command_counts.get(driver_command, 0) + 1
+        return super().execute(driver_command, params)
+
+    def record_page(self, load_seconds):
+        """
+        Учет загруженной страницы: время browser.get и переданные байты
+
+        Байты читаются одной командой execute_script, поэтому только при measure_pages.
+        """
+        metrics = {}
+        if self.measure_pages:
+            try:
+                metrics = self.execute_script(self.PAGE_METRICS_SCRIPT) or {}
+            except Exception:
+                pass
+        with self._count_lock:
+            self.page_count += 1
+            self.page_load_seconds += load_seconds
+            self.page_bytes += int(metrics.get("bytes") or 0)
+            self.page_resources += int(metrics.get("resources") or 0)
+
+    def page_stats(self):
+        """Средние показатели загруженных страниц"""
+        with self._count_lock:
+            pages = self.page_count
+            return {
+                "pages": pages,
+                "bytes": self.page_bytes,
+                "bytes_per_page": self.page_bytes / pages if pages else 0.0,
+                "resources_per_page": self.page_resources / pages if pages else 0.0,
+                "load_seconds_per_page": self.page_load_seconds / pages if pages else 0.0,
+            }
+
+
+class ResourceFilter:
+    """
+    Сетевой фильтр браузера через CDP Network.setBlockedURLs.
+
+    Блокирует картинки, медиа и шрифты на сайтах источников и запросы к
+    известным трекерам и рекламным сетям. Шаблоны ограничены доменами
+    источников, поэтому сторонние виджеты (iframe reCAPTCHA и ее картинки
+    на google.com/gstatic.com) не затрагиваются; домены из allow_domains
+    исключаются и из списка источников, и из трекеров.
+    """
+
+    BLOCKED_EXTENSIONS = {
+        "image": ("png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico", "bmp"),
+        "media": ("mp4", "webm", "ogg", "mp3", "wav", "m4a"),
+        "font": ("woff", "woff2", "ttf", "otf", "eot"),
+    }
+
+    TRACKER_DOMAINS = (
+        "google-analytics.com",
+        "googletagmanager.com",
+        "doubleclick.net",
+        "googlesyndication.com",
+        "googleadservices.com",
+        "mc.yandex.ru",
+        "an.yandex.ru",
+        "yandexadexchange.net",
+        "adfox.ru",
+        "top-fwz1.mail.ru",
+        "counter.yadro.ru",
+        "tns-counter.ru",
+        "vk.com/rtrg",
+        "connect.facebook.net",
+        "criteo.com",
+        "hotjar.com",
+    )
+
+    ALLOW_DOMAINS = (
+        "google.com",
+        "gstatic.com",
+        "recaptcha.net",
+        "captcha-api.yandex.ru",
+        "smartcaptcha.yandexcloud.net",
+    )
+
+    def __init__(
+        self,
+        site_urls,
+        blocked_types=("image", "media", "font"),
+        block_trackers=True,
+        allow_domains=None,
+    ):
+        self.site_domains = [urlparse(url).hostname for url in site_urls if urlparse(url).hostname]
+        self.blocked_types = tuple(blocked_types)
+        self.block_trackers = block_trackers
+        self.allow_domains = tuple(self.ALLOW_DOMAINS if allow_domains is None else allow_domains)
+
+    def _is_allowed(self, domain):
+        return any(
+            domain == allowed or domain.endswith("." + allowed) for allowed in self.allow_domains
+        )
+
+    def patterns(self):
+        """Шаблоны URL для Network.setBlockedURLs ("*" - любая подстрока)"""
+        extensions = [
+            extension
+            for resource_type in self.blocked_types
+            for extension in self.BLOCKED_EXTENSIONS.get(resource_type, ())
+        ]
+
+        patterns = []
+        for domain in dict.fromkeys(self.site_domains):
+            if self._is_allowed(domain):
+                continue
+            domain = domain[4:] if domain.startswith("www.") else domain
+            for extension in extensions:
+                # Сам домен (с портом или без) и его поддомены (статика, CDN сайта)
+                patterns.append(f"*://{domain}*/*.{extension}*")
+                patterns.append(f"*://*.{domain}*/*.{extension}*")
+
+        if self.block_trackers:
+            for tracker in self.TRACKER_DOMAINS:
+                if not self._is_allowed(tracker.split("/")[0]):
+                    patterns.append(f"*://{tracker}*")
+                    patterns.append(f"*://*.{tracker}*")
+
+        return patterns
+
+    def apply(self, browser):
+        """
+        Включение фильтра в браузере
+
+        Returns:
+            int: Количество шаблонов блокировки
+        """
+        patterns = self.patterns()
+        browser.execute_cdp_cmd("Network.enable", {})
+        browser.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        return len(patterns)
+
+
+def process_tree_rss_mb(pid):
+    """
+    Суммарная RSS процесса и всех его потомков в МБ
+
+    В Windows - рабочие наборы процессов через Win32 API, в остальных ОС - через ps.
+
+    Returns:
+        float | None: None, если память процессов узнать не удалось
+    """
+    if sys.platform == "win32":
+        return _windows_process_tree_rss_mb(pid)
+
+    try:
+        output = subprocess.run(
+            ["ps", "-A", "-o", "pid=,ppid=,rss="],
+            capture_output=True,
+            text=True,
+            timeout=5,
+            check=True,
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+    children = {}
+    rss = {}
+    for line in output.splitlines():
+        parts = line.split()
+        if len(parts) != 3 or not all(part.isdigit() for part in parts):
+            continue
+        child_pid, parent_pid, child_rss = (int(part) for part in parts)
+        children.setdefault(parent_pid, []).append(child_pid)
+        rss[child_pid] = child_rss
+
+    if pid not in rss:
+        return None
+
+    total_kb = 0
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        total_kb += rss.get(current, 0)
+        stack.extend(children.get(current, ()))
+    return total_kb / 1024
+
+
+def _windows_process_tree_rss_mb(pid):
+    """Суммарный рабочий набор процесса и его потомков в Windows (Toolhelp32 + GetProcessMemoryInfo)"""
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class ProcessEntry32(ctypes.Structure):
+            _fields_ = [
+                ("dwSize", wintypes.DWORD),
+                ("cntUsage", wintypes.DWORD),
+                ("th32ProcessID", wintypes.DWORD),
+                ("th32DefaultHeapID", ctypes.c_size_t),
+                ("th32ModuleID", wintypes.DWORD),
+                ("cntThreads", wintypes.DWORD),
+                ("th32ParentProcessID", wintypes.DWORD),
+                ("pcPriClassBase", wintypes.LONG),
+                ("dwFlags", wintypes.DWORD),
+                ("szExeFile", wintypes.WCHAR * 260),
+            ]
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        TH32CS_SNAPPROCESS = 0x2
+        PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+        INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        kernel32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+        kernel32.OpenProcess.restype = wintypes.HANDLE
+        psapi = ctypes.WinDLL("psapi", use_last_error=True)
+
+        # Дерево процессов из снимка Toolhelp32
+        snapshot = kernel32.CreateToolhelp32Snapshot(TH32CS_SNAPPROCESS, 0)
+        if not snapshot or snapshot == INVALID_HANDLE_VALUE:
+            return None
+        children = {}
+        processes = set()
+        try:
+            entry = ProcessEntry32()
+            entry.dwSize = ctypes.sizeof(entry)
+            has_entry = kernel32.Process32FirstW(snapshot, ctypes.byref(entry))
+            while has_entry:
+                processes.add(entry.th32ProcessID)
+                children.setdefault(entry.th32ParentProcessID, []).append(entry.th32ProcessID)
+                has_entry = kernel32.Process32NextW(snapshot, ctypes.byref(entry))
+        finally:
+            kernel32.CloseHandle(snapshot)
+
+        if pid not in processes:
+            return None
+
+        total = 0
+        stack = [pid]
+        seen = set()
+        while stack:
+            current = stack.pop()
+            if current in seen:
+                continue  # Идентификаторы процессов в Windows переиспользуются
+            seen.add(current)
+            stack.extend(children.get(current, ()))
+
+            handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, current)
+            if not handle:
+                continue
+            try:
+                counters = ProcessMemoryCounters()
+                counters.cb = ctypes.sizeof(counters)
+                if psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+                    total += counters.WorkingSetSize
+            finally:
+                kernel32.CloseHandle(handle)
+        return total / (1024 * 1024)
+    except (AttributeError, OSError, ImportError):
+        return None
+
+
+class BrowserClosed(Exception):
+    """Браузер закрыт (парсинг остановлен) - запускать новый нельзя"""
+
+
+class BrowserManager:
+    """
+    Жизненный цикл одного Chrome.
+
+    - браузер создается фабрикой create_browser(profile_dir) со своим
+      временным профилем, который удаляется при закрытии или пересоздании
+    - пересоздается каждые max_pages страниц или при росте RSS процессов
+      Chrome выше max_rss_mb (проверяется между строками, не во время поиска)
+    - после падения браузера restart() поднимает новый, а on_new_browser
+      позволяет владельцу заново привязать к нему сеарчеры
+    - после shutdown() менеджер закрыт навсегда: start()/restart() из
+      потока, который еще ищет, не поднимут Chrome, который некому закрыть
+    """
+
+    MAX_PAGES = 300
+    MAX_RSS_MB = 1500
+    RSS_CHECK_EVERY = 25  # Страниц между проверками RSS
+
+    def __init__(
+        self,
+        create_browser,
+        key=None,
+        log_callback=None,
+        max_pages=None,
+        max_rss_mb=None,
+        on_new_browser=None,
+    ):
+        self.create_browser = create_browser
+        self.key = key  # Настройки браузера, с которыми его можно переиспользовать
+        self.log_callback = log_callback
+        self.max_pages = self.MAX_PAGES if max_pages is None else max_pages
+        self.max_rss_mb = self.MAX_RSS_MB if max_rss_mb is None else max_rss_mb
+        self.on_new_browser = on_new_browser
+
+        self.browser = None
+        self.profile_dir = None
+        self.restarts = 0
+        self.closed = False
+        self._pages_at_rss_check = 0
+        self._lock = threading.Lock()  # shutdown() может прийти из другого потока
+
+    def log(self, message):
+        if self.log_callback:
+            self.log_callback(message)
+        else:
+            print(message)
+
+    def start(self):
+        """
+        Запуск браузера с новым временным профилем
+
+        Raises:
+            BrowserClosed: Менеджер уже закрыт (в том числе во время запуска)
+        """
+        if self.closed:
+            raise BrowserClosed()
+        profile_dir = tempfile.mkdtemp(prefix="fill_optimization_chrome_")
+        try:
+            browser = self.create_browser(profile_dir)
+        except Exception:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+            raise
+
+        with self._lock:
+            closed = self.closed
+            if not closed:
+                self.browser, self.profile_dir = browser, profile_dir
+        if closed:
+            # shutdown() пришел, пока Chrome запускался
+            try:
+                browser.quit()
+            except Exception:
+                pass
+            shutil.rmtree(profile_dir, ignore_errors=True)
+            raise BrowserClosed()
+
+        self._pages_at_rss_check = 0
+        if self.on_new_browser:
+            self.on_new_browser(self.browser)
+        return self.browser
+
+    def _quit(self):
+        with self._lock:
+            browser, self.browser = self.browser, None
+            profile_dir, self.profile_dir = self.profile_dir, None
+        if browser is not None:
+            try:
+                browser.quit()
+            except Exception:
+                pass  # Браузер мог уже упасть
+        if profile_dir:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+
+    def restart(self, reason):
+        """
+        Пересоздание браузера
+
+        Raises:
+            BrowserClosed: Менеджер закрыт - новый браузер не запускается
+        """
+        if self.closed:
+            raise BrowserClosed()
+        self.log(f"🔄 Перезапуск браузера: {reason}")
+        self._quit()
+        self.restarts += 1
+        return self.start()
+
+    def shutdown(self):
+        """Закрытие браузера и удаление его профиля (менеджер больше не запускается)"""
+        with self._lock:
+            self.closed = True
+        self._quit()
+
+    def is_alive(self):
+        """Браузер отвечает на команды"""
+        if self.browser is None:
+            return False
+        try:
+            self.browser.window_handles
+            return True
+        except WebDriverException:
+            return False
+
+    @property
+    def pages(self):
+        """Страниц, загруженных текущим браузером"""
+        return getattr(self.browser, "page_count", 0)
+
+    def rss_mb(self):
+        service = getattr(self.browser, "service", None)
+        process = getattr(service, "process", None)
+        if process is None:
+            return None
+        return process_tree_rss_mb(process.pid)
+
+    def recycle_reason(self):
+        """
+        Причина пересоздать браузер (None - пересоздавать не нужно)
+        """
+        if self.max_pages and self.pages >= self.max_pages:
+            return f"загружено {self.pages} страниц"
+
+        if self.max_rss_mb and self.pages - self._pages_at_rss_check >= self.RSS_CHECK_EVERY:
+            self._pages_at_rss_check = self.pages
+            rss = self.rss_mb()
+            if rss is not None and rss > self.max_rss_mb:
+                return f"память Chrome {rss:.0f} МБ > {self.max_rss_mb} МБ"
+
+        return None
+
+    def maybe_recycle(self):
+        """Плановое пересоздание браузера между строками"""
+        reason = self.recycle_reason()
+        if reason:
+            self.restart(reason)
+            return True
+        return False
+
+
+class BrowserPool:
+    """
+    Теплые браузеры между запусками парсинга.
+
+    Парсер, закончив работу, возвращает BrowserManager в пул вместо закрытия
+    Chrome; следующий запуск с теми же настройками (key) получает его без
+    холодного старта. Пул закрывается при выходе из приложения.
+    """
+
+    def __init__(self, max_idle=4):
+        self.max_idle = max_idle
+        self._lock = threading.Lock()
+        self._idle = []
+
+    def acquire(self, key):
+        """Свободный живой браузер с такими же настройками или None"""
+        while True:
+            with self._lock:
+                index = next(
+                    (i for i, manager in enumerate(self._idle) if manager.key == key), None
+                )
+                if index is None:
+                    return None
+                manager = self._idle.pop(index)
+
+            if manager.is_alive():
+                return manager
+            manager.shutdown()
+
+    def release(self, manager):
+        """
+        Возврат браузера в пул (лишние, упавшие и отработавшие свое закрываются)
+
+        Returns:
+            bool: True, если браузер оставлен запущенным
+        """
+        if manager.recycle_reason() or not manager.is_alive():
+            manager.shutdown()
+            return False
+
+        manager.on_new_browser = None
+        manager.log_callback = None
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(manager)
+                return True
+        manager.shutdown()
+        return False
+
+    def shutdown(self):
+        """Закрытие всех свободных браузеров"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for manager in idle:
+            manager.shutdown()
@@ -0,0 +1,88 @@
+"""
+Модуль постоянного кэша исправлений орфографии LanguageTool
+"""
+
+import time
+import sqlite3
+import threading
+
+from .result_cache import get_cache_path
+
+
+class SpellCorrectionCache:
+    """
+    Кэш исправлений орфографии на SQLite.
+
+    Ключ - строка после clean_formatting и версия LanguageTool:
+    после обновления LanguageTool старые исправления не используются.
+    """
+
+    # Ограничение SQLite на число параметров в одном запросе
+    _QUERY_CHUNK = 500
+
+    def __init__(self, lt_version, path=None):
+        self.lt_version = str(lt_version or "unknown")
+        self.path = path or get_cache_path("spelling.sqlite3")
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS corrections (
+                    text TEXT NOT NULL,
+                    lt_version TEXT NOT NULL,
+                    corrected TEXT NOT NULL,
+                    stored_at REAL NOT NULL,
+                    PRIMARY KEY (text, lt_version)
+                )
+                """
+            )
+
+    def get_many(self, texts):
+        """
+        Поиск сохраненных исправлений
+
+        Returns:
+            dict: {строка: исправленная строка} для найденных строк
+        """
+        found = {}
+        texts = list(texts)
+
+        with self._lock:
+            for chunk_start in range(0, len(texts), self._QUERY_CHUNK):
+                chunk = texts[chunk_start:chunk_start + self._QUERY_CHUNK]
+                placeholders = ", ".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT text, corrected FROM corrections "
+                    f"WHERE lt_version = ? AND text IN ({placeholders})",
+                    [self.lt_version, *chunk],
+                ).fetchall()
+                found.update(rows)
+
+        return found
+
+    def put_many(self, corrections):
+        """Сохранение исправлений {строка: исправленная строка}"""
+        if not corrections:
+            return
+
+        stored_at = time.time()
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO corrections (text, lt_version, corrected, stored_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    [
+                        (text, self.lt_version, corrected, stored_at)
+                        for text, corrected in corrections.items()
+                    ],
+                )
+
+    def close(self):
+        """Закрытие соединения с базой"""
+        with self._lock:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
@@ -0,0 +1,488 @@
+"""
+Модуль извлечения данных организаций из HTML-снимка страницы (lxml + XPath)
+
+Страница забирается из браузера одной командой (page_source), а дальше
+все проверки и извлечение идут по разобранному дереву без обращений к
+chromedriver. Экстракторы работают и с сохраненными HTML-файлами.
+"""
+
+import re
+from functools import partial
+
+from lxml import etree
+from lxml import html as lxml_html
+
+
+INN_REGEX = re.compile(r"ИНН[:\s]*(\d{10,12})")
+OGRN_REGEX = re.compile(r"ОГРН[:\s]*(\d{13,15})")
+POSTAL_CODE_REGEX = re.compile(r"\b(\d{6})\b")
+WHITESPACE_REGEX = re.compile(r"\s+")
+
+# Теги, текст которых не виден на странице
+SKIPPED_TAGS = frozenset(("head", "script", "style", "noscript", "template", "svg"))
+
+# Блочные теги: их текст начинается с новой строки (как в innerText)
+BLOCK_TAGS = frozenset((
+    "address", "article", "aside", "blockquote", "body", "dd", "details", "dialog",
+    "div", "dl", "dt", "fieldset", "figcaption", "figure", "footer", "form",
+    "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "html", "legend", "li",
+    "main", "nav", "ol", "option", "p", "pre", "section", "summary", "table",
+    "tbody", "td", "tfoot", "th", "thead", "tr", "ul",
+))
+
+
+def _class_xpath(tag, class_name):
+    """XPath элементов с классом (с учетом нескольких классов в атрибуте)"""
+    return f'//{tag}[contains(concat(" ", normalize-space(@class), " "), " {class_name} ")]'
+
+
+def _is_hidden(element):
+    if element.get("hidden") is not None:
+        return True
+    style = (element.get("style") or "").replace(" ", "").lower()
+    return "display:none" in style or "visibility:hidden" in style
+
+
+def _collect_text(element, parts):
+    tag = element.tag if isinstance(element.tag, str) else None
+
+    # Комментарии и инструкции обработки не дают текста, но их хвост виден
+    if tag is not None and tag not in SKIPPED_TAGS and not _is_hidden(element):
+        is_block = tag in BLOCK_TAGS
+        if is_block:
+            parts.append("\n")
+        if tag == "br":
+            parts.append("\n")
+        if element.text:
+            parts.append(WHITESPACE_REGEX.sub(" ", element.text))
+        for child in element:
+            _collect_text(child, parts)
+        if is_block:
+            parts.append("\n")
+
+    if element.tail:
+        parts.append(WHITESPACE_REGEX.sub(" ", element.tail))
+
+
+def render_text(element):
+    """
+    Видимый текст элемента в духе innerText / WebElement.text
+
+    Блочные элементы и <br> разбивают текст на строки, пробелы внутри
+    строки схлопываются, пустые строки отбрасываются.
+    """
+    if element is None:
+        return ""
+
+    parts = []
+    tail = element.tail
+    element.tail = None
+    try:
+        _collect_text(element, parts)
+    finally:
+        element.tail = tail
+
+    lines = (line.strip() for line in "".join(parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+class PageSnapshot:
+    """
+    Снимок страницы: HTML, разобранное дерево и видимый текст.
+
+    Дерево и текст строятся лениво и один раз, поэтому несколько проверок
+    одного снимка (капча, тип страницы, извлечение) стоят одного page_source.
+    """
+
+    def __init__(self, html_source):
+        self.html = html_source or ""
+        self._tree = None
+        self._text = None
+        self._html_lower = None
+
+    @classmethod
+    def from_browser(cls, browser):
+        """Снимок текущей страницы браузера (одна команда WebDriver)"""
+        return cls(browser.page_source)
+
+    @classmethod
+    def from_file(cls, path):
+        """Снимок сохраненной страницы"""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(f.read())
+
+    @property
+    def tree(self):
+        if self._tree is None:
+            try:
+                self._tree = lxml_html.document_fromstring(self.html)
+            except (etree.ParserError, ValueError):
+                self._tree = lxml_html.document_fromstring("<html><body></body></html>")
+        return self._tree
+
+    @property
+    def text(self):
+        """Видимый текст <body>"""
+        if self._text is None:
+            bodies = self.tree.xpath("//body")
+            self._text = render_text(bodies[0] if bodies else self.tree)
+        return self._text
+
+    @property
+    def text_lower(self):
+        return self.text.lower()
+
+    @property
+    def html_lower(self):
+        if self._html_lower is None:
+            self._html_lower = self.html.lower()
+        return self._html_lower
+
+    def select(self, xpath):
+        """Элементы по скомпилированному XPath"""
+        return xpath(self.tree)
+
+    def first_text(self, xpath):
+        """Видимый текст первого найденного элемента ("" если элемента нет)"""
+        elements = xpath(self.tree)
+        return render_text(elements[0]) if elements else ""
+
+
+class OrganizationRecord:
+    """Данные организации, извлеченные со страницы источника"""
+
+    FIELDS = ("name", "address", "postal_code", "inn", "ogrn")
+
+    def __init__(self, name="", address="", postal_code="", inn="", ogrn=""):
+        self.name = name
+        self.address = address
+        self.postal_code = postal_code or extract_postal_code(address)
+        self.inn = inn
+        self.ogrn = ogrn
+
+    def __repr__(self):
+        values = ", ".join(f"{field}={getattr(self, field)!r}" for field in self.FIELDS)
+        return f"OrganizationRecord({values})"
+
+    def as_dict(self):
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def apply_to(self, result):
+        """Перенос непустых полей в словарь результата сеарчера"""
+        for field, value in self.as_dict().items():
+            if value:
+                result[field] = value
+        return result
+
+
+class SearchResultItem:
+    """Элемент списка выдачи: текст блока и ссылка"""
+
+    def __init__(self, index, text, link_text="", href=""):
+        self.index = index  # Порядковый номер в выдаче (для клика в браузере)
+        self.text = text
+        self.link_text = link_text
+        self.href = href
+
+    def __repr__(self):
+        return f"SearchResultItem({self.index}, {self.link_text or self.text[:40]!r})"
+
+
+def extract_postal_code(address):
+    match = POSTAL_CODE_REGEX.search(address or "")
+    return match.group(1) if match else ""
+
+
+def extract_inn_ogrn(text):
+    """ИНН и ОГРН из текста страницы"""
+    inn_match = INN_REGEX.search(text)
+    ogrn_match = OGRN_REGEX.search(text)
+    return (
+        inn_match.group(1) if inn_match else "",
+        ogrn_match.group(1) if ogrn_match else "",
+    )
+
+
+class RusProfileExtractor:
+    """Страницы RusProfile: капча, тип страницы поиска, карточка организации"""
+
+    NAME = etree.XPath('//*[@id="clip_name-long"]')
+    ADDRESS = etree.XPath('//*[@id="clip_address"]')
+    RESULT_LINKS = etree.XPath(_class_xpath("a", "list-element__title"))
+    COMPANY_NAME = etree.XPath(_class_xpath("*", "company-name"))
+    RECAPTCHA_IFRAMES = etree.XPath(
+        '//iframe[contains(@src, "recaptcha") or contains(@title, "reCAPTCHA")]'
+    )
+    CAPTCHA_FORMS = etree.XPath('//form[contains(@id, "captcha") or contains(@class, "captcha")]')
+
+    NOT_FOUND_PHRASES = ("не найдено", "попробуйте смягчить фильтры")
+    CAPTCHA_PHRASES = (
+        "вы робот",
+        "подтвердите что вы не робот",
+        "подтвердите, что вы не робот",
+        "проверка на робота",
+        "вы похожи на робота",
+    )
+
+    @classmethod
+    def has_content(cls, snapshot):
+        """Карточка организации или список результатов"""
+        return bool(
+            snapshot.select(cls.NAME)
+            or snapshot.select(cls.RESULT_LINKS)
+            or snapshot.select(cls.COMPANY_NAME)
+        )
+
+    @classmethod
+    def is_not_found(cls, snapshot):
+        text = snapshot.text_lower
+        return any(phrase in text for phrase in cls.NOT_FOUND_PHRASES)
+
+    @classmethod
+    def has_recaptcha_widget(cls, snapshot):
+        html_lower = snapshot.html_lower
+        return "g-recaptcha" in html_lower or "recaptcha/api.js" in html_lower
+
+    @classmethod
+    def is_captcha(cls, snapshot):
+        """
+        Капча на странице
+
+        Выдача или сообщение «не найдено» - не капча. Иначе капча есть, если
+        на странице iframe reCAPTCHA или форма капчи, либо текст про робота
+        вместе с виджетом reCAPTCHA.
+        """
+        if cls.has_content(snapshot) or cls.is_not_found(snapshot):
+            return False
+
+        if snapshot.select(cls.RECAPTCHA_IFRAMES) or snapshot.select(cls.CAPTCHA_FORMS):
+            return True
+
+        text = snapshot.text_lower
+        has_captcha_text = any(phrase in text for phrase in cls.CAPTCHA_PHRASES)
+        return has_captcha_text and cls.has_recaptcha_widget(snapshot)
+
+    @classmethod
+    def page_kind(cls, snapshot):
+        """
+        Тип страницы поиска
+
+        Returns:
+            str | None: "company" (сразу открылась карточка), "results",
+            "not_found" или None, если страница еще пустая
+        """
+        if snapshot.select(cls.NAME):
+            return "company"
+        if snapshot.select(cls.RESULT_LINKS):
+            return "results"
+        if cls.is_not_found(snapshot):
+            return "not_found"
+        return None
+
+    @classmethod
+    def result_links(cls, snapshot):
+        """Ссылки на организации из списка выдачи"""
+        return [link.get("href") for link in snapshot.select(cls.RESULT_LINKS) if link.get("href")]
+
+    @classmethod
+    def company(cls, snapshot):
+        """
+        Карточка организации
+
+        Returns:
+            OrganizationRecord | None: None, если на странице нет названия или адреса
+        """
+        name = snapshot.first_text(cls.NAME)
+        address = snapshot.first_text(cls.ADDRESS)
+        if not name or not address:
+            return None
+
+        inn, ogrn = extract_inn_ogrn(snapshot.text)
+        return OrganizationRecord(name=name, address=address, inn=inn, ogrn=ogrn)
+
+
+class KonturFokusExtractor:
+    """Страница поиска Контур Фокус (данные берутся из текста выдачи)"""
+
+    # Карточки организаций в выдаче
+    RESULT_CARDS = etree.XPath(_class_xpath("*", "org"))
+
+    NAME_KEYWORDS = (
+        "АВТОНОМНАЯ",
+        "ГОСУДАРСТВЕННАЯ",
+        "МУНИЦИПАЛЬНАЯ",
+        "ОБЩЕОБРАЗОВАТЕЛЬНАЯ",
+        "НЕКОММЕРЧЕСКАЯ",
+        "БЮДЖЕТНАЯ",
+        "АВТОНОМНОЕ",
+        "ГОСУДАРСТВЕННОЕ",
+        "МУНИЦИПАЛЬНОЕ",
+        "ОБЩЕОБРАЗОВАТЕЛЬНОЕ",
+        "НЕКОММЕРЧЕСКОЕ",
+        "БЮДЖЕТНОЕ",
+    )
+    ADDRESS_REGEX = re.compile(
+        r"\b(\d{6})[,\s]+([^\n]+(?:обл|край|респ|г\.|г |область|севастополь)[^\n]+)",
+        re.IGNORECASE,
+    )
+    # Признаки проверки «не робот ли вы» вместо выдачи
+    CHALLENGE_MARKERS = (
+        "captcha",
+        "challenge",
+        "проверка браузера",
+        "вы не робот",
+        "включите javascript",
+        "enable javascript",
+    )
+
+    @staticmethod
+    def has_results(snapshot):
+        """На странице появились реквизиты (признак загруженной выдачи)"""
+        return "ИНН" in snapshot.text
+
+    @classmethod
+    def has_result_cards(cls, snapshot):
+        """
+        В выдаче есть карточки организаций
+
+        Строже has_results: слово «ИНН» есть и в подсказке поля поиска,
+        поэтому по тексту пустую оболочку страницы не отличить от выдачи.
+        """
+        return bool(snapshot.select(cls.RESULT_CARDS))
+
+    @staticmethod
+    def is_not_found(snapshot):
+        return "не найдено" in snapshot.text
+
+    @classmethod
+    def browser_required(cls, snapshot):
+        """
+        Почему страницу, полученную без браузера, нельзя разобрать
+
+        Returns:
+            str | None: Причина (проверка или выдача, которую строят скрипты)
+            или None, если на странице уже есть карточки выдачи или «не найдено»
+        """
+        if cls.has_result_cards(snapshot) or cls.is_not_found(snapshot):
+            return None
+        html = snapshot.html_lower
+        if any(marker in html for marker in cls.CHALLENGE_MARKERS):
+            return "проверка «не робот»"
+        return "выдачу строят скрипты"
+
+    @classmethod
+    def first_organization(cls, snapshot):
+        """
+        Первая организация выдачи
+
+        Данные берутся из первой карточки выдачи, а если карточек нет -
+        из текста всей страницы.
+
+        Returns:
+            OrganizationRecord | None: None, если нет ни ИНН, ни названия
+        """
+        cards = snapshot.select(cls.RESULT_CARDS)
+        page_text = render_text(cards[0]) if cards else snapshot.text
+        inn, ogrn = extract_inn_ogrn(page_text)
+
+        name = ""
+        for line in page_text.split("\n"):
+            if any(word in line.upper() for word in cls.NAME_KEYWORDS):
+                if len(line) > 10 and "ИНН" not in line:
+                    name = line.strip()
+                    break
+
+        address = postal_code = ""
+        address_match = cls.ADDRESS_REGEX.search(page_text)
+        if address_match:
+            postal_code = address_match.group(1)
+            address = postal_code + ", " + address_match.group(2).strip()
+
+        if not inn and not name:
+            return None
+        return OrganizationRecord(
+            name=name, address=address, postal_code=postal_code, inn=inn, ogrn=ogrn
+        )
+
+
+class EgrulExtractor:
+    """Выдача и выписка ЕГРЮЛ"""
+
+    RESULTS = etree.XPath(_class_xpath("*", "res-text"))
+    LINK = etree.XPath(".//a")
+
+    NAME_REGEX = re.compile(r"Полное наименование[:\s]*([^\n]+)")
+    ADDRESS_REGEX = re.compile(r"Адрес[:\s]*([^\n]+)")
+
+    @classmethod
+    def results(cls, snapshot):
+        """Блоки выдачи с текстом и ссылкой на выписку"""
+        items = []
+        for index, element in enumerate(snapshot.select(cls.RESULTS)):
+            links = cls.LINK(element)
+            link = links[0] if links else None
+            items.append(
+                SearchResultItem(
+                    index=index,
+                    text=render_text(element),
+                    link_text=render_text(link) if link is not None else "",
+                    href=link.get("href", "") if link is not None else "",
+                )
+            )
+        return items
+
+    @classmethod
+    def detail(cls, snapshot):
+        """Выписка об организации (название и адрес могут отсутствовать)"""
+        page_text = snapshot.text
+        inn, ogrn = extract_inn_ogrn(page_text)
+
+        name_match = cls.NAME_REGEX.search(page_text)
+        address_match = cls.ADDRESS_REGEX.search(page_text)
+        return OrganizationRecord(
+            name=name_match.group(1).strip() if name_match else "",
+            address=address_match.group(1).strip() if address_match else "",
+            inn=inn,
+            ogrn=ogrn,
+        )
+
+    @staticmethod
+    def json_results(rows):
+        """
+        Строки JSON-выдачи ЕГРЮЛ (/search-result/<токен>) как блоки выдачи
+
+        Текст блока собирается так же, как его показывает сайт: название,
+        адрес, ИНН/ОГРН и дата прекращения деятельности, если она есть.
+        """
+        items = []
+        for index, row in enumerate(rows):
+            field = partial(EgrulExtractor._json_field, row)
+            parts = [field("n"), field("a")]
+            parts.append(f"ИНН: {field('i')}, ОГРН: {field('o')}")
+            if field("e"):
+                parts.append(f"Дата прекращения деятельности: {field('e')}")
+            items.append(
+                SearchResultItem(
+                    index=index,
+                    text=" ".join(part for part in parts if part),
+                    link_text=field("n"),
+                    href=field("t"),
+                )
+            )
+        return items
+
+    @staticmethod
+    def json_record(row):
+        """Организация из строки JSON-выдачи ЕГРЮЛ"""
+        return OrganizationRecord(
+            name=EgrulExtractor._json_field(row, "n"),
+            address=EgrulExtractor._json_field(row, "a"),
+            inn=EgrulExtractor._json_field(row, "i"),
+            ogrn=EgrulExtractor._json_field(row, "o"),
+        )
+
+    @staticmethod
+    def _json_field(row, key):
+        """Поле строки JSON-выдачи как строка (пустая, если поля нет)"""
+        value = row.get(key)
+        return "" if value is None else str(value).strip()
@@ -4,6 +4,9 @@
 
 import pandas as pd
 import os
+import queue
+import threading
+import time
 from dotenv import load_dotenv
 from PySide6.QtWidgets import (
     QWidget,
@@ -23,7 +26,16 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, QThread, Signal, QFile, QTextStream
 
 from .text_processor_upd import TextProcessor
+from .async_engine import AsyncSearchEngine
 from .parser_core import OrganizationParser
+from .morphology import stats_line as morphology_stats_line
+from .rate_limiter import get_rate_limiter, rates_from_env
+from .result_cache import ResultCache
+from .run_journal import RunJournal
+from .tracing import Tracer
+from excel_handler.reader import read_column
+from excel_handler.writer import write_results
+from excel_handler.utils import SOURCE_COLUMN, peak_rss_mb
 
 # Импортируем GigaChat API
 try:
@@ -45,8 +57,29 @@ class ParserThread(QThread):
     log_message = Signal(str)
     finished = Signal(pd.DataFrame)
 
+    UTILIZATION_LOG_SECONDS = 60  # Как часто выводить загрузку лимитов запросов
+
     def __init__(
-        self, data, df, use_gigachat=False, gigachat_retries=3, use_recaptcha=False, humanization_mode="normal"
+        self,
+        data,
+        df,
+        use_gigachat=False,
+        gigachat_retries=3,
+        use_recaptcha=False,
+        humanization_mode="normal",
+        workers=1,
+        use_cache=True,
+        cache_only=False,
+        journal=None,
+        resume=False,
+        tracer=None,
+        block_resources=False,
+        browser_pool=None,
+        fan_out=False,
+        egrul_http=False,
+        kontur_http=False,
+        async_engine=False,
+        rate_limit=False,
     ):
         super().__init__()
         self.data = data
@@ -55,11 +88,36 @@ class ParserThread(QThread):
         self.gigachat_retries = gigachat_retries
         self.use_recaptcha = use_recaptcha  # НОВОЕ
         self.humanization_mode = humanization_mode  # Режим хуманизации
+        self.workers = max(1, int(workers))  # Количество браузеров (воркеров)
+        self.use_cache = use_cache or cache_only  # Кэш результатов между запусками
+        self.cache_only = cache_only  # Только кэш, без браузера
+        self.result_cache = None
+        self.journal = journal  # Журнал результатов (RunJournal)
+        self.resume = resume  # Продолжить по журналу прошлого запуска
+        self.tracer = tracer or Tracer()  # Трассировка этапов поиска
+        self.block_resources = block_resources  # Не загружать картинки, шрифты и трекеры
+        self.browser_pool = browser_pool  # Теплые браузеры между запусками (BrowserPool)
+        self.fan_out = fan_out  # Параллельный поиск во всех источниках (браузер на источник)
+        self.egrul_http = egrul_http  # Поиск в ЕГРЮЛ по HTTP без браузера
+        self.kontur_http = kontur_http  # Контур Фокус сначала по HTTP, браузер - запасной путь
+        self.async_engine = async_engine  # Много строк одновременно (AsyncSearchEngine)
+        self.engine = None
+        self.rate_limit = rate_limit  # Общий лимит частоты запросов к сайтам (RateLimiter)
+        self.rate_limiter = get_rate_limiter()
+        self._utilization_logged_at = 0.0
         self.gigachat_api = None
-        self.parser = None
+        self.parser = None  # Парсер первого воркера (для GigaChat и совместимости)
+        self.parsers = []  # Парсеры всех воркеров
         self._stop_requested = False  # Флаг для корректного завершения
         self._paused = False  # Флаг паузы
 
+        # Общее состояние воркеров
+        self._lock = threading.Lock()
+        self._completed = 0
+        self._not_found_items = []
+        self._worker_stats = {}
+        self._worker_error = None  # Первая ошибка, остановившая воркер
+
         # Инициализируем GigaChat если нужно
         if self.use_gigachat and GIGACHAT_AVAILABLE:
             auth_token = os.getenv("GIGACHAT_AUTH_TOKEN")
@@ -76,22 +134,57 @@ class ParserThread(QThread):
             else:
                 self.log_message.emit("⚠️ GIGACHAT_AUTH_TOKEN не найден в .env")
 
+    def create_parser(self, log_callback):
+        """Создание парсера для одного воркера"""
+        recaptcha_api_key = os.getenv("RUCAPTCHA_API_KEY")  # Берем из .env
+
+        return OrganizationParser(
+            log_callback=log_callback,
+            use_gigachat=False,  # Сначала без GigaChat
+            gigachat_api=None,
+            gigachat_retries=0,
+            use_recaptcha_solver=self.use_recaptcha,  # НОВОЕ
+            recaptcha_api_key=recaptcha_api_key,  # НОВОЕ
+            humanization_mode=self.humanization_mode,  # Режим хуманизации
+            result_cache=self.result_cache,
+            tracer=self.tracer,
+            block_resources=self.block_resources,
+            browser_pool=self.browser_pool,
+            # Асинхронный движок сам запрашивает источники заранее, браузеры источников не нужны
+            fan_out=self.fan_out and not self.async_engine,
+            egrul_http=self.egrul_http,
+            kontur_http=self.kontur_http,
+        )
+
     def run(self):
         try:
-            # Инициализируем парсер
-            recaptcha_api_key = os.getenv("RUCAPTCHA_API_KEY")  # Берем из .env
-
-            self.parser = OrganizationParser(
-                log_callback=self.emit_log,
-                use_gigachat=False,  # Сначала без GigaChat
-                gigachat_api=None,
-                gigachat_retries=0,
-                use_recaptcha_solver=self.use_recaptcha,  # НОВОЕ
-                recaptcha_api_key=recaptcha_api_key,  # НОВОЕ
-                humanization_mode=self.humanization_mode,  # Режим хуманизации
-            )
+            # Открываем файл трассировки
+            try:
+                self.tracer.open()
+            except Exception as e:
+                self.log_message.emit(f"⚠️ Не удалось открыть файл трассировки: {e}")
+
+            # Лимиты запросов к сайтам (без лимитов запросы только считаются)
+            rates = rates_from_env() if self.rate_limit else {}
+            self.rate_limiter.configure(rates)
+            self._utilization_logged_at = time.time()
+            if rates:
+                limits = ", ".join(
+                    f"{domain} {per_minute:g}/мин (подряд {burst})"
+                    for domain, (per_minute, burst) in rates.items()
+                )
+                self.log_message.emit(f"🚦 Лимиты запросов: {limits}")
 
-            self.parser.init_browser()
+            # Открываем кэш результатов
+            if self.use_cache:
+                try:
+                    self.result_cache = ResultCache(cache_only=self.cache_only)
+                    if self.cache_only:
+                        self.log_message.emit("💾 Режим «только кэш»: браузер не запускается")
+                except Exception as e:
+                    self.log_message.emit(f"⚠️ Не удалось открыть кэш результатов: {e}")
+                    if self.cache_only:
+                        raise
 
             # Инициализируем колонки пустыми значениями
             self.df["Полное название"] = ""
@@ -105,45 +198,73 @@ class ParserThread(QThread):
             # Получаем индексы строк, для которых есть данные
             data_indices = self.df.index[: len(self.data)].tolist()
 
-            # Список ненайденных организаций для обработки через GigaChat
-            not_found_items = []
+            # Восстанавливаем строки из журнала прошлого запуска
+            resolved_rows = self.prepare_journal(data_indices)
 
-            # Основной цикл поиска (без GigaChat)
+            # Общая очередь строк для всех воркеров
+            tasks = queue.Queue()
             for idx, (row_idx, org_name) in enumerate(zip(data_indices, self.data), 1):
-                # Проверяем флаг остановки
-                if self._stop_requested:
-                    self.log_message.emit("\n⚠️ Получен запрос на остановку парсинга")
-                    break
+                if row_idx not in resolved_rows:
+                    tasks.put((idx, row_idx, org_name))
 
-                # Ожидание снятия паузы
-                while self._paused and not self._stop_requested:
-                    self.msleep(100)  # Небольшая задержка, чтобы не нагружать CPU
+            workers_count = min(self.workers, max(1, tasks.qsize()))
+            if workers_count > 1:
+                self.log_message.emit(f"🧵 Запуск {workers_count} браузеров для параллельного поиска")
 
-                if self._stop_requested:
-                    break
+            # Основной цикл поиска (без GigaChat)
+            if self.async_engine and not self.cache_only:
+                self.run_async_engine(tasks, workers_count)
+            else:
+                threads = [
+                    threading.Thread(
+                        target=self.worker_loop,
+                        args=(worker_id, tasks, workers_count > 1),
+                        daemon=True,
+                    )
+                    for worker_id in range(1, workers_count + 1)
+                ]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+
+                # Строки остаются в очереди, только если упали все воркеры (например,
+                # не запустился Chrome): пустой «Источник» у них - не «найдено»
+                if not self._stop_requested and not tasks.empty():
+                    raise RuntimeError(
+                        f"не удалось обработать {tasks.qsize()} строк: "
+                        f"{self._worker_error or 'все браузеры остановились'}"
+                    )
 
-                self.progress.emit(idx, len(self.data))
-                self.log_message.emit(f"\n{'='*60}")
-                self.log_message.emit(f"📋 [{idx}/{len(self.data)}] {org_name}")
+            if self._stop_requested:
+                self.log_message.emit("\n⚠️ Получен запрос на остановку парсинга")
 
-                result = self.parser.search_organization(org_name)
+            self.log_worker_stats()
+            self.log_sleep_stats()
+            self.log_fan_out_stats()
+            self.log_kontur_path_stats()
+            if self.engine:
+                self.log_message.emit(self.engine.stats_line())
+            for line in self.rate_limiter.stats_lines():
+                self.log_message.emit(line)
 
-                self.df.at[row_idx, "Полное название"] = result.get("name", "")
-                self.df.at[row_idx, "Родительный падеж"] = result.get(
-                    "name_genitive", ""
-                )
-                self.df.at[row_idx, "Адрес"] = result.get("address", "")
-                self.df.at[row_idx, "Индекс"] = result.get("postal_code", "")
-                self.df.at[row_idx, "ИНН"] = result.get("inn", "")
-                self.df.at[row_idx, "ОГРН"] = result.get("ogrn", "")
-                self.df.at[row_idx, "Источник"] = result.get("source", "Не найдено")
+            if self.result_cache:
+                self.log_message.emit(self.result_cache.stats_line())
+            self.log_message.emit(morphology_stats_line())
 
-                # Сохраняем ненайденные для обработки через GigaChat
-                if result.get("source") == "Не найдено":
-                    not_found_items.append((row_idx, org_name))
+            # Порядок ненайденных как во входном файле
+            not_found_items = sorted(self._not_found_items, key=lambda item: item[0])
 
             # Если включен GigaChat и есть ненайденные организации
-            if not self._stop_requested and self.use_gigachat and self.gigachat_api and not_found_items:
+            # (асинхронный движок уже спросил GigaChat в каскаде строк)
+            gigachat_done = self.engine is not None and self.engine.gigachat_api is not None
+            if (
+                not self._stop_requested
+                and self.use_gigachat
+                and self.gigachat_api
+                and not gigachat_done
+                and not_found_items
+            ):
                 self.log_message.emit(f"\n{'='*60}")
                 self.log_message.emit(
                     f"🤖 GigaChat: обработка {len(not_found_items)} ненайденных организаций"
@@ -153,6 +274,10 @@ class ParserThread(QThread):
                 )
                 self.log_message.emit(f"{'='*60}")
 
+                # GigaChat не использует браузер, поэтому достаточно одного парсера
+                if self.parser is None:
+                    self.parser = self.create_parser(self.emit_log)
+
                 # Подключаем GigaChat к парсеру
                 self.parser.gigachat_api = self.gigachat_api
                 self.parser.use_gigachat = True
@@ -184,21 +309,17 @@ class ParserThread(QThread):
                     gigachat_attempts_used += 1
 
                     if gigachat_result["found"]:
-                        self.df.at[row_idx, "Полное название"] = gigachat_result.get(
-                            "name", ""
-                        )
-                        self.df.at[row_idx, "Адрес"] = gigachat_result.get(
-                            "address", ""
-                        )
-                        self.df.at[row_idx, "Индекс"] = gigachat_result.get(
-                            "postal_code", ""
-                        )
-                        self.df.at[row_idx, "ИНН"] = gigachat_result.get("inn", "")
-                        self.df.at[row_idx, "ОГРН"] = gigachat_result.get("ogrn", "")
                         source = gigachat_result.get("source", "GigaChat")
                         if not source or source == "Не найдено":
                             source = "GigaChat"
-                        self.df.at[row_idx, "Источник"] = source
+                        gigachat_result = dict(gigachat_result, source=source)
+
+                        with self._lock:
+                            self.apply_result(row_idx, gigachat_result)
+                        if self.journal:
+                            self.journal.record(row_idx, org_name, gigachat_result)
+                        if self.result_cache:
+                            self.result_cache.put(org_name, gigachat_result)
                         found_count += 1
                         self.log_message.emit("  ✅ Найдено через GigaChat!")
 
@@ -211,14 +332,304 @@ class ParserThread(QThread):
                         f"\n📊 Обработано через GigaChat: {found_count} из {len(not_found_items)} (лимит попыток достигнут)"
                     )
 
+            for line in self.tracer.summary_lines():
+                self.log_message.emit(line)
+
+            peak_memory = peak_rss_mb()
+            if peak_memory is not None:
+                self.log_message.emit(f"🧠 Пиковая память приложения (без Chrome): {peak_memory:.0f} МБ")
+
             self.finished.emit(self.df)
 
         except Exception as e:
             self.log_message.emit(f"❌ КРИТИЧЕСКАЯ ОШИБКА: {str(e)}")
 
         finally:
-            if self.parser:
-                self.parser.close_browser()
+            # После остановки браузеры не возвращаются в пул: поиск в них мог быть прерван
+            self.close_browsers(keep_warm=not self._stop_requested)
+            if self.result_cache:
+                self.result_cache.close()
+            if self.journal:
+                self.journal.close()
+            self.tracer.close()
+
+    def prepare_journal(self, data_indices):
+        """
+        Открытие журнала результатов
+
+        При продолжении прошлого запуска уже найденные строки переносятся
+        из журнала в DataFrame и больше не ищутся.
+
+        Returns:
+            set: Индексы строк, восстановленных из журнала
+        """
+        resolved_rows = set()
+        if not self.journal:
+            return resolved_rows
+
+        entries = {}
+        if self.resume:
+            try:
+                entries = self.journal.load()
+            except Exception as e:
+                self.log_message.emit(f"⚠️ Не удалось прочитать журнал: {e}")
+
+        for row_idx, org_name in zip(data_indices, self.data):
+            entry = entries.get(RunJournal._row_key(row_idx))
+            # Строка считается найденной, только если запрос совпадает с журналом
+            if entry is None or entry[0] != org_name:
+                continue
+
+            result = entry[1]
+            self.apply_result(row_idx, result)
+            resolved_rows.add(row_idx)
+            if result.get("source") == "Не найдено":
+                self._not_found_items.append((row_idx, org_name))
+
+        try:
+            self.journal.open(reset=not self.resume)
+        except Exception as e:
+            self.log_message.emit(f"⚠️ Журнал недоступен, промежуточные результаты не сохраняются: {e}")
+            self.journal = None
+
+        if resolved_rows:
+            self._completed = len(resolved_rows)
+            self.progress.emit(self._completed, len(self.data))
+            self.log_message.emit(
+                f"♻️ Восстановлено из журнала: {len(resolved_rows)} из {len(self.data)} строк"
+            )
+
+        return resolved_rows
+
+    def apply_result(self, row_idx, result):
+        """Запись результата поиска в строку DataFrame"""
+        self.df.at[row_idx, "Полное название"] = result.get("name", "")
+        self.df.at[row_idx, "Родительный падеж"] = result.get("name_genitive", "")
+        self.df.at[row_idx, "Адрес"] = result.get("address", "")
+        self.df.at[row_idx, "Индекс"] = result.get("postal_code", "")
+        self.df.at[row_idx, "ИНН"] = result.get("inn", "")
+        self.df.at[row_idx, "ОГРН"] = result.get("ogrn", "")
+        self.df.at[row_idx, "Источник"] = result.get("source", "Не найдено")
+
+    def record_result(self, row_idx, org_name, result):
+        """Сохранение результата строки: журнал, DataFrame и прогресс"""
+        if self.journal:
+            self.journal.record(row_idx, org_name, result)
+
+        with self._lock:
+            self.apply_result(row_idx, result)
+
+            # Сохраняем ненайденные для обработки через GigaChat
+            if result.get("source") == "Не найдено":
+                self._not_found_items.append((row_idx, org_name))
+
+            self._completed += 1
+            completed = self._completed
+
+            log_utilization = time.time() - self._utilization_logged_at >= self.UTILIZATION_LOG_SECONDS
+            if log_utilization:
+                self._utilization_logged_at = time.time()
+
+        self.progress.emit(completed, len(self.data))
+        if log_utilization:
+            line = self.rate_limiter.utilization_line()
+            if line:
+                self.emit_log(line)
+
+    def run_async_engine(self, tasks, browsers):
+        """Поиск всех строк асинхронным движком (browsers браузеров на всех)"""
+        pending = []
+        while not tasks.empty():
+            pending.append(tasks.get_nowait())
+
+        for browser_id in range(1, browsers + 1):
+            if self._stop_requested:
+                return
+            if browsers > 1:
+                def log_callback(message, browser_id=browser_id):
+                    self.emit_log(f"[{browser_id}] {message}")
+            else:
+                log_callback = self.emit_log
+
+            parser = self.create_parser(log_callback)
+            with self._lock:
+                self.parsers.append(parser)
+                if self.parser is None:
+                    self.parser = parser
+            parser.init_browser()
+
+        # GigaChat - последний шаг каскада каждой строки, попытки общие на весь файл
+        self.engine = AsyncSearchEngine(
+            self.parsers,
+            gigachat_api=self.gigachat_api if self.use_gigachat else None,
+            gigachat_attempts=self.gigachat_retries,
+            result_cache=self.result_cache,
+            log_callback=self.emit_log,
+            should_stop=lambda: self._stop_requested,
+            is_paused=lambda: self._paused,
+        )
+        self.log_message.emit(
+            f"🚀 Асинхронный движок: до {self.engine.max_in_flight} строк одновременно, "
+            f"браузеров: {browsers}"
+        )
+
+        def on_result(index, result):
+            _, row_idx, org_name = pending[index]
+            self.record_result(row_idx, org_name, result)
+
+        self.engine.search_all([org_name for _, _, org_name in pending], on_result)
+
+    def worker_loop(self, worker_id, tasks, prefix_logs):
+        """Цикл одного воркера: свой браузер, строки берутся из общей очереди"""
+        if prefix_logs:
+            def log_callback(message):
+                self.emit_log(f"[{worker_id}] {message}")
+        else:
+            log_callback = self.emit_log
+
+        started_at = time.time()
+        processed = 0
+        task = None  # Строка в работе (при падении воркера возвращается в очередь)
+
+        try:
+            parser = self.create_parser(log_callback)
+            with self._lock:
+                self.parsers.append(parser)
+                if self.parser is None:
+                    self.parser = parser
+
+            if self._stop_requested:
+                return
+
+            if not self.cache_only:
+                parser.init_browser()
+
+            while not self._stop_requested:
+                # Ожидание снятия паузы
+                while self._paused and not self._stop_requested:
+                    self.msleep(100)  # Небольшая задержка, чтобы не нагружать CPU
+
+                if self._stop_requested:
+                    break
+
+                try:
+                    task = tasks.get_nowait()
+                except queue.Empty:
+                    break
+                idx, row_idx, org_name = task
+
+                log_callback(f"\n{'='*60}")
+                log_callback(f"📋 [{idx}/{len(self.data)}] {org_name}")
+
+                try:
+                    result = parser.search_organization(org_name)
+                except Exception as e:
+                    if self._stop_requested:
+                        break
+                    # Строка считается ненайденной, воркер переходит к следующей
+                    log_callback(f"❌ Ошибка поиска: {str(e)}")
+                    result = OrganizationParser._empty_result()
+                processed += 1
+                self.record_result(row_idx, org_name, result)
+                task = None
+
+        except Exception as e:
+            if task is not None:
+                tasks.put(task)  # Строку доищет другой воркер
+            if not self._stop_requested:
+                log_callback(f"❌ Ошибка воркера: {str(e)}")
+                with self._lock:
+                    if self._worker_error is None:
+                        self._worker_error = str(e)
+
+        finally:
+            with self._lock:
+                self._worker_stats[worker_id] = (processed, time.time() - started_at)
+
+    def log_worker_stats(self):
+        """Вывод производительности каждого воркера"""
+        if len(self._worker_stats) < 2:
+            return
+
+        self.log_message.emit("\n🧵 Производительность браузеров:")
+        for worker_id, (processed, elapsed) in sorted(self._worker_stats.items()):
+            per_minute = processed / elapsed * 60 if elapsed > 0 else 0
+            self.log_message.emit(
+                f"  • Браузер {worker_id}: {processed} строк, {per_minute:.1f} строк/мин"
+            )
+
+    def log_sleep_stats(self):
+        """Вывод суммарного времени пауз хуманизации по доменам"""
+        slept = {}
+        with self._lock:
+            parsers = list(self.parsers)
+        for parser in parsers:
+            for humanizer in parser.humanizers():
+                for domain, seconds in humanizer.slept_seconds.items():
+                    slept[domain] = slept.get(domain, 0.0) + seconds
+
+        if not slept:
+            return
+
+        pressure = parsers[0].humanizer.pacing.snapshot() if self.humanization_mode == "adaptive" else {}
+        self.log_message.emit("\n😴 Паузы хуманизации по доменам:")
+        for domain, seconds in sorted(slept.items(), key=lambda item: item[1], reverse=True):
+            line = f"  • {domain}: {seconds:.1f} с"
+            if domain in pressure:
+                line += f" (давление защиты {pressure[domain]:.2f})"
+            self.log_message.emit(line)
+
+    def log_fan_out_stats(self):
+        """Вывод времени, сэкономленного параллельным поиском по источникам"""
+        with self._lock:
+            parsers = list(self.parsers)
+        rows = sum(parser.fan_out_rows for parser in parsers)
+        if not rows:
+            return
+
+        saved = sum(parser.fan_out_saved_seconds for parser in parsers)
+        self.log_message.emit(
+            f"\n⚡ Параллельный поиск сэкономил {saved:.0f} с на {rows} строках "
+            f"({saved / rows:.1f} с на строку)"
+        )
+
+    def log_kontur_path_stats(self):
+        """Вывод числа поисков в Контур Фокус по HTTP и через браузер"""
+        counts = {}
+        with self._lock:
+            parsers = list(self.parsers)
+        for parser in parsers:
+            if parser.kontur_paths is None:
+                continue
+            for path, count in parser.kontur_paths.snapshot().items():
+                counts[path] = counts.get(path, 0) + count
+
+        total = sum(counts.values())
+        if not total:
+            return
+
+        http = counts.get("http", 0)
+        self.log_message.emit(
+            f"\n🌐 Контур Фокус: {http} из {total} поисков без браузера, "
+            f"{counts.get('browser', 0)} через браузер"
+        )
+
+    def close_browsers(self, keep_warm=True):
+        """
+        Закрытие браузеров всех воркеров
+
+        Args:
+            keep_warm: Возвращать браузеры в пул. Только когда воркеры уже
+                       завершились; при остановке из главного потока браузеры
+                       закрываются (это же прерывает идущие в них поиски)
+        """
+        with self._lock:
+            parsers = list(self.parsers)
+        for parser in parsers:
+            try:
+                parser.close_browser(keep_warm=keep_warm)
+            except Exception:
+                pass
 
     def emit_log(self, message):
         """Передача сообщения в главный поток"""
@@ -228,16 +639,22 @@ class ParserThread(QThread):
 class FillExcelColumns(QWidget):
     """Главное окно приложения"""
 
-    def __init__(self):
+    LOW_MEMORY_LOG_LINES = 5000  # Строк лога в окне в режиме экономии памяти
+
+    def __init__(self, language_tool=None, browser_pool=None):
         super().__init__()
         self.df = None
         self.parser_thread = None
         self.text_processor = None
+        self.language_tool = language_tool  # Общий LanguageToolManager приложения
+        self.browser_pool = browser_pool  # Общий пул теплых браузеров приложения
         self.file_loaded = False
         self.is_parsing = False
         self.is_paused = False  # Флаг паузы
         self.current_file_path = None
+        self.low_memory = False  # Файл загружен в режиме экономии памяти
         self.browse_file_button = None
+        self.resume_requested = False  # Продолжить прошлый запуск по журналу
 
         self.setWindowTitle("Парсер организаций")
         self.setGeometry(100, 100, 900, 750)
@@ -326,7 +743,17 @@ class FillExcelColumns(QWidget):
         self.pause_button.setEnabled(False)  # Неактивна до начала парсинга
         self.pause_button.setVisible(False)  # Скрыта до начала парсинга
 
+        self.resume_parse_button = QPushButton("♻️ Продолжить прошлый запуск")
+        self.resume_parse_button.clicked.connect(self.resume_parsing_clicked)
+        self.resume_parse_button.setObjectName("resumeParseButton")
+        self.resume_parse_button.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.resume_parse_button.setToolTip(
+            "Найденные ранее строки берутся из журнала, поиск продолжается с места остановки"
+        )
+        self.resume_parse_button.setVisible(False)  # Видна, только если есть журнал
+
         buttons_layout.addWidget(self.start_parse_button)
+        buttons_layout.addWidget(self.resume_parse_button)
         buttons_layout.addWidget(self.pause_button)
         buttons_layout.addStretch()
 
@@ -338,18 +765,37 @@ class FillExcelColumns(QWidget):
         humanization_layout = QHBoxLayout()
         humanization_layout.addWidget(QLabel("⚡ Скорость хуманизации:"))
         self.humanization_mode = QComboBox()
-        self.humanization_mode.addItems(["Быстрая (fast)", "Нормальная (normal)", "Безопасная (safe)"])
+        self.humanization_mode.addItems(
+            ["Быстрая (fast)", "Нормальная (normal)", "Безопасная (safe)", "Адаптивная (adaptive)"]
+        )
         self.humanization_mode.setCurrentIndex(1)  # По умолчанию "normal"
         self.humanization_mode.setObjectName("humanizationMode")
         self.humanization_mode.setToolTip(
             "Быстрая - минимальные задержки\n"
             "Нормальная - баланс скорости и безопасности\n"
-            "Безопасная - максимальная имитация человека"
+            "Безопасная - максимальная имитация человека\n"
+            "Адаптивная - быстрая, замедляется только на сайте с капчей или медленными ответами"
         )
         humanization_layout.addWidget(self.humanization_mode)
         humanization_layout.addStretch()
         settings_layout.addLayout(humanization_layout)
 
+        # Количество параллельных браузеров
+        workers_layout = QHBoxLayout()
+        workers_layout.addWidget(QLabel("🧵 Параллельных браузеров:"))
+        self.workers_count = QSpinBox()
+        self.workers_count.setMinimum(1)
+        self.workers_count.setMaximum(8)
+        self.workers_count.setValue(1)
+        self.workers_count.setObjectName("workersCount")
+        self.workers_count.setToolTip(
+            "Каждый браузер обрабатывает свою часть строк.\n"
+            "Больше браузеров - быстрее, но выше нагрузка и риск капчи"
+        )
+        workers_layout.addWidget(self.workers_count)
+        workers_layout.addStretch()
+        settings_layout.addLayout(workers_layout)
+
         # Настройки GigaChat
         gigachat_layout = QHBoxLayout()
         self.gigachat_checkbox = QCheckBox("🤖 Использовать GigaChat")
@@ -383,6 +829,107 @@ class FillExcelColumns(QWidget):
         recaptcha_layout.addStretch()
         settings_layout.addLayout(recaptcha_layout)
 
+        # Настройки кэша результатов
+        cache_layout = QHBoxLayout()
+        self.cache_checkbox = QCheckBox("💾 Использовать кэш результатов")
+        self.cache_checkbox.setChecked(True)
+        self.cache_checkbox.setObjectName("cacheCheckbox")
+        self.cache_checkbox.setToolTip(
+            "Организации, найденные в прошлых запусках, берутся из кэша без браузера, "
+            "исправления орфографии - без повторной проверки LanguageTool"
+        )
+        self.cache_only_checkbox = QCheckBox("Только кэш (без браузера)")
+        self.cache_only_checkbox.setChecked(False)
+        self.cache_only_checkbox.setObjectName("cacheOnlyCheckbox")
+        self.cache_only_checkbox.setEnabled(False)  # Неактивна до загрузки файла
+
+        cache_layout.addWidget(self.cache_checkbox)
+        cache_layout.addWidget(self.cache_only_checkbox)
+        cache_layout.addStretch()
+        settings_layout.addLayout(cache_layout)
+
+        # Общий лимит запросов к сайтам
+        rate_layout = QHBoxLayout()
+        self.rate_limit_checkbox = QCheckBox("🚦 Общий лимит запросов к сайтам")
+        self.rate_limit_checkbox.setChecked(False)
+        self.rate_limit_checkbox.setObjectName("rateLimitCheckbox")
+        self.rate_limit_checkbox.setToolTip(
+            "Все браузеры и HTTP-запросы берут очередь у общего планировщика: не больше\n"
+            "заданного числа запросов в минуту к каждому сайту (RATE_LIMIT_<САЙТ> в .env,\n"
+            "например RATE_LIMIT_RUSPROFILE=60/5). Загрузка лимитов выводится в лог"
+        )
+        rate_layout.addWidget(self.rate_limit_checkbox)
+        rate_layout.addStretch()
+        settings_layout.addLayout(rate_layout)
+
+        # Фильтр ресурсов браузера
+        resources_layout = QHBoxLayout()
+        self.block_resources_checkbox = QCheckBox("🧱 Не загружать картинки, шрифты и трекеры")
+        self.block_resources_checkbox.setChecked(True)
+        self.block_resources_checkbox.setObjectName("blockResourcesCheckbox")
+        self.block_resources_checkbox.setToolTip(
+            "Страницы источников грузятся без картинок, видео, шрифтов, счетчиков и рекламы.\n"
+            "Капча (reCAPTCHA) не блокируется"
+        )
+        resources_layout.addWidget(self.block_resources_checkbox)
+
+        self.fan_out_checkbox = QCheckBox("⚡ Искать во всех источниках сразу")
+        self.fan_out_checkbox.setChecked(False)
+        self.fan_out_checkbox.setObjectName("fanOutCheckbox")
+        self.fan_out_checkbox.setToolTip(
+            "RusProfile, Контур Фокус и ЕГРЮЛ опрашиваются одновременно, каждый в своем браузере\n"
+            "(3 браузера на поток). Приоритет источников сохраняется, лишние поиски отменяются"
+        )
+        resources_layout.addWidget(self.fan_out_checkbox)
+        resources_layout.addStretch()
+        settings_layout.addLayout(resources_layout)
+
+        # Источники без браузера
+        http_layout = QHBoxLayout()
+        self.egrul_http_checkbox = QCheckBox("🌐 ЕГРЮЛ без браузера (HTTP)")
+        self.egrul_http_checkbox.setChecked(False)
+        self.egrul_http_checkbox.setObjectName("egrulHttpCheckbox")
+        self.egrul_http_checkbox.setToolTip(
+            "Поиск в ЕГРЮЛ идет прямыми HTTP-запросами к egrul.nalog.ru:\n"
+            "без Chrome, за доли секунды, результаты отбираются так же"
+        )
+        http_layout.addWidget(self.egrul_http_checkbox)
+
+        self.kontur_http_checkbox = QCheckBox("🌐 Контур Фокус сначала без браузера")
+        self.kontur_http_checkbox.setChecked(False)
+        self.kontur_http_checkbox.setObjectName("konturHttpCheckbox")
+        self.kontur_http_checkbox.setToolTip(
+            "Страница поиска Контур Фокуса запрашивается обычным HTTP-запросом.\n"
+            "Браузер открывается, только если сайт требует JavaScript или показывает проверку"
+        )
+        http_layout.addWidget(self.kontur_http_checkbox)
+
+        self.async_engine_checkbox = QCheckBox("🚀 Асинхронный движок")
+        self.async_engine_checkbox.setChecked(False)
+        self.async_engine_checkbox.setObjectName("asyncEngineCheckbox")
+        self.async_engine_checkbox.setToolTip(
+            "Сотни строк ищутся одновременно: Контур Фокус и ЕГРЮЛ по HTTP с ограничением\n"
+            "одновременных запросов к каждому сайту, RusProfile - в браузерах по их числу"
+        )
+        http_layout.addWidget(self.async_engine_checkbox)
+        http_layout.addStretch()
+        settings_layout.addLayout(http_layout)
+
+        # Экономия памяти для больших файлов
+        memory_layout = QHBoxLayout()
+        self.low_memory_checkbox = QCheckBox("🪶 Экономия памяти (большие файлы)")
+        self.low_memory_checkbox.setChecked(False)
+        self.low_memory_checkbox.setObjectName("lowMemoryCheckbox")
+        self.low_memory_checkbox.setToolTip(
+            f"Из файла читается только столбец «{SOURCE_COLUMN}»,\n"
+            "результат записывается построчно, не собирая лист в памяти.\n"
+            f"В окне лога остаются последние {self.LOW_MEMORY_LOG_LINES} строк"
+        )
+        self.low_memory_checkbox.toggled.connect(self.low_memory_toggled)
+        memory_layout.addWidget(self.low_memory_checkbox)
+        memory_layout.addStretch()
+        settings_layout.addLayout(memory_layout)
+
         settings_group.setLayout(settings_layout)
 
         # Прогресс бар
@@ -516,7 +1063,14 @@ class FillExcelColumns(QWidget):
     def process_file(self, file_path):
         """Загрузка выбранного файла"""
         try:
-            self.df = pd.read_excel(file_path)
+            low_memory = self.low_memory_checkbox.isChecked()
+            # Освобождаем прошлый файл до чтения нового
+            self.df = None
+            if low_memory:
+                self.df = read_column(file_path)
+            else:
+                self.df = pd.read_excel(file_path)
+            self.low_memory = low_memory
             self.file_loaded = True
             self.current_file_path = file_path
             file_name = os.path.basename(file_path)
@@ -524,11 +1078,15 @@ class FillExcelColumns(QWidget):
             self.file_info_label.setStyleSheet("color: #4CAF50; font-weight: bold; padding: 5px;")
             self.add_log(f"✅ Файл загружен: {file_path}")
             self.add_log(f"📊 Строк в файле: {len(self.df)}")
+            if low_memory:
+                self.add_log(f"🪶 Экономия памяти: загружен только столбец «{SOURCE_COLUMN}»")
             # Активируем кнопку запуска и настройки
             self.start_parse_button.setEnabled(True)
             self.gigachat_checkbox.setEnabled(True)
             self.gigachat_retries.setEnabled(True)
             self.recaptcha_checkbox.setEnabled(True)
+            self.cache_only_checkbox.setEnabled(True)
+            self.update_resume_button()
         except Exception as e:
             QMessageBox.warning(self, "Ошибка", f"Не удалось загрузить файл: {str(e)}")
             self.file_loaded = False
@@ -537,6 +1095,28 @@ class FillExcelColumns(QWidget):
             self.file_info_label.setStyleSheet("color: #666; padding: 5px;")
             self.start_parse_button.setEnabled(False)
             self.recaptcha_checkbox.setEnabled(False)
+            self.update_resume_button()
+
+    def low_memory_toggled(self, checked):
+        """Переключение режима экономии памяти"""
+        # Ограничение окна лога: старые строки удаляются (0 - без ограничения)
+        self.log_text.document().setMaximumBlockCount(
+            self.LOW_MEMORY_LOG_LINES if checked else 0
+        )
+
+        # Уже загруженный файл перечитывается в выбранном режиме
+        if self.file_loaded and not self.is_parsing and checked != self.low_memory:
+            self.process_file(self.current_file_path)
+
+    def update_resume_button(self):
+        """Показывает кнопку продолжения, если для файла есть журнал прошлого запуска"""
+        has_journal = bool(
+            self.file_loaded
+            and self.current_file_path
+            and RunJournal.for_input_file(self.current_file_path).exists()
+        )
+        self.resume_parse_button.setVisible(has_journal and not self.is_parsing)
+        self.resume_parse_button.setEnabled(has_journal and not self.is_parsing)
 
     def parse_excel_data(self):
         # """Парсинг данных из Excel"""
@@ -568,7 +1148,11 @@ class FillExcelColumns(QWidget):
         self.add_log("=" * 60)
 
         # Создаем и запускаем worker
-        self.worker = TextProcessor(raw_data_column)
+        self.worker = TextProcessor(
+            raw_data_column,
+            use_cache=self.cache_checkbox.isChecked(),
+            language_tool=self.language_tool,
+        )
 
         # Подключаем сигналы
         self.worker.log_signal.connect(self.add_log)
@@ -608,12 +1192,24 @@ class FillExcelColumns(QWidget):
                 self.stop_parsing()
             return
 
+        self.launch_parsing(resume=False)
+
+    def resume_parsing_clicked(self):
+        """Продолжение прерванного парсинга по журналу"""
+        if self.is_parsing:
+            return
+        self.launch_parsing(resume=True)
+
+    def launch_parsing(self, resume):
+        """Запуск нормализации и парсинга"""
         if not self.file_loaded or self.df is None:
             QMessageBox.warning(self, "Ошибка", "Сначала загрузите файл!")
             return
 
         # Устанавливаем флаг парсинга
         self.is_parsing = True
+        self.resume_requested = resume
+        self.resume_parse_button.setVisible(False)
 
         # Блокируем элементы интерфейса на время парсинга
         self.start_parse_button.setText("⏹ Остановить парсинг")
@@ -627,6 +1223,16 @@ class FillExcelColumns(QWidget):
         self.gigachat_retries.setEnabled(False)
         self.recaptcha_checkbox.setEnabled(False)
         self.humanization_mode.setEnabled(False)
+        self.workers_count.setEnabled(False)
+        self.cache_checkbox.setEnabled(False)
+        self.cache_only_checkbox.setEnabled(False)
+        self.block_resources_checkbox.setEnabled(False)
+        self.fan_out_checkbox.setEnabled(False)
+        self.egrul_http_checkbox.setEnabled(False)
+        self.kontur_http_checkbox.setEnabled(False)
+        self.async_engine_checkbox.setEnabled(False)
+        self.rate_limit_checkbox.setEnabled(False)
+        self.low_memory_checkbox.setEnabled(False)
 
         self.parse_excel_data()
 
@@ -644,11 +1250,32 @@ class FillExcelColumns(QWidget):
 
         # Получаем режим хуманизации из выпадающего списка
         mode_index = self.humanization_mode.currentIndex()
-        humanization_modes = ["fast", "normal", "safe"]
+        humanization_modes = ["fast", "normal", "safe", "adaptive"]
         humanization_mode = humanization_modes[mode_index]
 
         self.parser_thread = ParserThread(
-            data, self.df.copy(), use_gigachat, retries, use_recaptcha, humanization_mode
+            data,
+            # В режиме экономии памяти DataFrame - один столбец из файла,
+            # его копия не нужна: при повторном запуске колонки результата
+            # заполняются заново
+            self.df if self.low_memory else self.df.copy(),
+            use_gigachat,
+            retries,
+            use_recaptcha,
+            humanization_mode,
+            workers=self.workers_count.value(),
+            use_cache=self.cache_checkbox.isChecked(),
+            cache_only=self.cache_only_checkbox.isChecked(),
+            journal=RunJournal.for_input_file(self.current_file_path),
+            resume=self.resume_requested,
+            tracer=Tracer.for_input_file(self.current_file_path),
+            block_resources=self.block_resources_checkbox.isChecked(),
+            browser_pool=self.browser_pool,
+            fan_out=self.fan_out_checkbox.isChecked(),
+            egrul_http=self.egrul_http_checkbox.isChecked(),
+            kontur_http=self.kontur_http_checkbox.isChecked(),
+            async_engine=self.async_engine_checkbox.isChecked(),
+            rate_limit=self.rate_limit_checkbox.isChecked(),
         )
         self.parser_thread.progress.connect(self.update_progress)
         self.parser_thread.log_message.connect(self.add_log)
@@ -684,12 +1311,11 @@ class FillExcelColumns(QWidget):
             self.parser_thread._stop_requested = True
             self.parser_thread._paused = False  # Снимаем паузу
 
-            # Закрываем браузер если он открыт
-            if self.parser_thread.parser:
-                try:
-                    self.parser_thread.parser.close_browser()
-                except Exception as e:
-                    self.add_log(f"\n⚠️ Ошибка при закрытии браузера: {e}")
+            # Закрываем браузеры всех воркеров
+            try:
+                self.parser_thread.close_browsers(keep_warm=False)
+            except Exception as e:
+                self.add_log(f"\n⚠️ Ошибка при закрытии браузера: {e}")
 
             # Ждем завершения потока (максимум 5 секунд)
             if not self.parser_thread.wait(5000):
@@ -714,7 +1340,8 @@ class FillExcelColumns(QWidget):
             self.log_text.verticalScrollBar().maximum()
         )
         # Активируем кнопку сохранения логов, если есть логи
-        if self.log_text.toPlainText().strip():
+        # (без toPlainText: копия всего лога на каждое сообщение)
+        if message.strip():
             self.save_log_button.setEnabled(True)
 
     def parsing_finished(self, result_df):
@@ -741,13 +1368,24 @@ class FillExcelColumns(QWidget):
 
         if save_path:
             try:
-                self.df.to_excel(save_path, index=False)
+                if self.low_memory:
+                    write_results(self.current_file_path, save_path, self.df)
+                else:
+                    self.df.to_excel(save_path, index=False)
                 QMessageBox.information(
                     self,
                     "✅ Успех",
                     f"Результаты сохранены!\n\n📊 Найдено: {found}/{total}\n📁 {save_path}",
                 )
                 self.add_log(f"✅ Файл сохранен: {save_path}")
+
+                # Результаты сохранены - журнал прошлого запуска больше не нужен
+                RunJournal.for_input_file(self.current_file_path).remove()
+
+                # Трасса этапов поиска переносится к файлу результата
+                trace_path = self.parser_thread.tracer.move_next_to(save_path)
+                if trace_path:
+                    self.add_log(f"⏱ Трасса этапов: {trace_path}")
             except Exception as e:
                 QMessageBox.warning(
                     self, "Ошибка", f"Не удалось сохранить файл: {str(e)}"
@@ -780,6 +1418,17 @@ class FillExcelColumns(QWidget):
         self.gigachat_retries.setEnabled(self.file_loaded)
         self.recaptcha_checkbox.setEnabled(self.file_loaded)
         self.humanization_mode.setEnabled(self.file_loaded)
+        self.workers_count.setEnabled(True)
+        self.cache_checkbox.setEnabled(True)
+        self.cache_only_checkbox.setEnabled(self.file_loaded)
+        self.block_resources_checkbox.setEnabled(True)
+        self.fan_out_checkbox.setEnabled(True)
+        self.egrul_http_checkbox.setEnabled(True)
+        self.kontur_http_checkbox.setEnabled(True)
+        self.async_engine_checkbox.setEnabled(True)
+        self.rate_limit_checkbox.setEnabled(True)
+        self.low_memory_checkbox.setEnabled(True)
+        self.update_resume_button()
 
 
 if __name__ == "__main__":
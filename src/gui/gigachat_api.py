@@ -5,9 +5,12 @@
 import re
 import requests
 import json
+import threading
 from datetime import datetime, timedelta
 import urllib3
 
+from .rate_limiter import get_rate_limiter
+
 # Отключаем предупреждения SSL
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
@@ -25,6 +28,8 @@ class TokenManager:
         self.access_token = None
         self.token_expiry = None
         self.log_callback = log_callback
+        # Запросы GigaChat идут из нескольких потоков - токен обновляет только один
+        self._lock = threading.Lock()
 
     def log(self, message):
         """Вывод сообщения в лог"""
@@ -33,12 +38,18 @@ class TokenManager:
         else:
             print(message)
 
+    def _is_valid(self):
+        return self.access_token is not None and datetime.now() < self.token_expiry
+
     def get_token(self):
         """Получить действующий токен, обновить при необходимости"""
-        if self.access_token is None or datetime.now() >= self.token_expiry:
-            if not self.refresh_token():
+        if self._is_valid():
+            return self.access_token
+        with self._lock:
+            # Пока ждали блокировку, токен мог обновить другой поток
+            if not self._is_valid() and not self.refresh_token():
                 raise Exception("Не удалось обновить токен GigaChat")
-        return self.access_token
+            return self.access_token
 
     def refresh_token(self):
         """Обновить токен через API"""
@@ -133,6 +144,7 @@ class GigaChatAPI:
                 "max_tokens": 500,
             }
 
+            get_rate_limiter().acquire("gigachat")
             response = requests.post(
                 self.api_url,
                 headers=headers,
@@ -0,0 +1,275 @@
+"""
+Модуль сеарчеров, работающих по HTTP без браузера
+"""
+
+import time
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .extractors import EgrulExtractor, KonturFokusExtractor, PageSnapshot
+from .parser_core import EgrulSearcher, KonturFokusSearcher
+
+
+# Заголовки как у обычного браузера (сайты отдают упрощенные страницы ботам)
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+    ),
+    "Accept-Language": "ru-RU,ru;q=0.9,en;q=0.8",
+}
+
+
+def create_session(pool_size=16):
+    """
+    Сессия requests с пулом соединений
+
+    Соединения с сайтом переиспользуются между запросами и потоками;
+    pool_size - сколько соединений с одним хостом держится открытыми.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(DEFAULT_HEADERS)
+    return session
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Общая HTTP-сессия процесса (создается один раз)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+
+class EgrulHttpSearcher(EgrulSearcher):
+    """
+    Поиск в ЕГРЮЛ без браузера
+
+    Сайт egrul.nalog.ru ищет в два шага: POST формы поиска возвращает токен
+    запроса ({"t": ...}), а /search-result/<токен> отдает строки выдачи в
+    JSON ({"rows": [...]}, пока запрос выполняется - {"status": "wait"}).
+    Строки оцениваются тем же _find_best_educational_match, что и блоки
+    выдачи в браузере, а полное название и адрес берутся из самой строки,
+    поэтому выписку открывать не нужно. Поиск не трогает браузер и может
+    выполняться из нескольких потоков одновременно.
+    """
+
+    TIMEOUT = 15  # Секунд на один HTTP-запрос
+    POLL_INTERVAL = 0.3  # Секунд между запросами готовности выдачи
+    MAX_POLLS = 20
+
+    def __init__(self, session=None, log_callback=None, base_url=None, tracer=None):
+        super().__init__(None, None, log_callback=log_callback, base_url=base_url, tracer=tracer)
+        self.session = session or get_session()
+
+    def search(self, org_name):
+        """Поиск в ЕГРЮЛ с умной фильтрацией результатов"""
+        result = {
+            "found": False,
+            "address": "",
+            "postal_code": "",
+        }
+
+        try:
+            # Убираем кавычки из названия для поиска
+            rows = self._query(self.remove_quotes_for_search(org_name))
+            if rows is None:
+                return result
+
+            if not rows:
+                self.log("  ⚠️ Нет результатов")
+                return result
+
+            self.log(f"  🔍 Найдено результатов: {len(rows)}")
+
+            # Фильтруем результаты по релевантности
+            best_match = self._find_best_educational_match(
+                EgrulExtractor.json_results(rows), org_name
+            )
+            if not best_match:
+                self.log("  ⚠️ Не найдено подходящих образовательных учреждений")
+                return result
+
+            self.log(f"  ✓ Выбрано: {best_match.link_text[:50]}...")
+            EgrulExtractor.json_record(rows[best_match.index]).apply_to(result)
+            if result.get("name"):
+                result["name_genitive"] = self.get_genitive_case_pymorphy(result["name"])
+
+            # Если есть полные данные
+            if result.get("name") and result.get("address"):
+                result["found"] = True
+                self.log(f"  ✅ ИНН: {result.get('inn')}, ОГРН: {result.get('ogrn')}")
+                self.log(f"  📝 {result['name'][:70]}...")
+                self.log(f"  📍 {result['address'][:70]}...")
+            elif result.get("inn") or result.get("ogrn"):
+                self.log(f"  ⚠️ Найден только ИНН: {result.get('inn')} (без полных данных)")
+
+        except requests.RequestException as e:
+            self.log(f"  ⚠️ Ошибка HTTP: {str(e)}")
+        except ValueError as e:
+            self.log(f"  ⚠️ Некорректный ответ ЕГРЮЛ: {str(e)}")
+
+        return result
+
+    def _query(self, query):
+        """
+        Отправка запроса и ожидание выдачи
+
+        Returns:
+            list | None: Строки выдачи или None, если сайт требует капчу
+            или не успел ответить
+        """
+        self._check_cancelled()
+        self._throttle()
+        with self.tracer.span("http.post", source="ЕГРЮЛ"):
+            response = self.session.post(
+                self.base_url + "/",
+                data={"vyp3CaptchaToken": "", "page": "", "query": query, "region": ""},
+                timeout=self.TIMEOUT,
+            )
+        data = self._json_object(response)
+
+        if data.get("captchaRequired"):
+            self.log("  ⚠️ ЕГРЮЛ требует капчу")
+            return None
+
+        token = data.get("t")
+        if not token:
+            raise ValueError("нет токена запроса")
+
+        for _ in range(self.MAX_POLLS):
+            self._check_cancelled()
+            self._throttle()
+            now = int(time.time() * 1000)
+            with self.tracer.span("http.get", source="ЕГРЮЛ"):
+                response = self.session.get(
+                    f"{self.base_url}/search-result/{token}",
+                    params={"r": now, "_": now},
+                    timeout=self.TIMEOUT,
+                )
+            data = self._json_object(response)
+
+            if data.get("status") != "wait":
+                rows = data.get("rows") or []
+                if not isinstance(rows, list):
+                    raise ValueError("выдача не список")
+                # Строки другого вида сайт не отдает - такие пропускаем
+                return [row for row in rows if isinstance(row, dict)]
+            time.sleep(self.POLL_INTERVAL)
+
+        self.log("  ⏱️ Timeout")
+        return None
+
+    @staticmethod
+    def _json_object(response):
+        """
+        Тело ответа как объект JSON
+
+        Raises:
+            ValueError: Тело не JSON или не объект (список, строка, null)
+        """
+        response.raise_for_status()
+        data = response.json()
+        if not isinstance(data, dict):
+            raise ValueError(f"ожидался объект JSON, получен {type(data).__name__}")
+        return data
+
+
+class FetchPathStats:
+    """Сколько поисков прошло по HTTP и сколько ушло в браузер"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {}
+
+    def record(self, path):
+        with self._lock:
+            self._counts[path] = self._counts.get(path, 0) + 1
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._counts)
+
+
+class KonturFokusHttpSearcher(KonturFokusSearcher):
+    """
+    Поиск в Контур Фокус: сначала HTTP, браузер - запасной путь
+
+    Страница поиска запрашивается обычным GET через общую сессию с пулом
+    соединений и разбирается тем же KonturFokusExtractor. Браузер (поиск
+    KonturFokusSearcher) открывается, только если ответ не разобрать:
+    ошибка HTTP, проверка «не робот» или выдача, которую строят скрипты.
+    """
+
+    TIMEOUT = 15  # Секунд на HTTP-запрос
+
+    def __init__(
+        self,
+        browser,
+        humanizer,
+        log_callback=None,
+        base_url=None,
+        tracer=None,
+        direct_input=None,
+        session=None,
+        path_stats=None,
+    ):
+        super().__init__(browser, humanizer, log_callback, base_url, tracer, direct_input)
+        self.session = session or get_session()
+        self.path_stats = path_stats or FetchPathStats()
+
+    def search(self, org_name=None, inn=None):
+        """Поиск в Контур Фокус по названию или ИНН"""
+        result, reason = self.search_without_browser(org_name=org_name, inn=inn)
+        if reason is None:
+            return result
+
+        self.log(f"  ↩️ Без браузера не получилось: {reason}, открываю в браузере")
+        self.path_stats.record("browser")
+        return super().search(org_name=org_name, inn=inn)
+
+    def search_without_browser(self, org_name=None, inn=None):
+        """
+        Поиск только по HTTP
+
+        Returns:
+            tuple: (результат, None) или (None, причина, по которой нужен браузер)
+        """
+        query = self._search_query(org_name, inn)
+        if not query:
+            return self._empty_result(), None
+
+        try:
+            snapshot = self._fetch(query)
+            reason = KonturFokusExtractor.browser_required(snapshot)
+        except requests.RequestException as e:
+            reason = f"ошибка HTTP ({type(e).__name__})"
+
+        if reason is not None:
+            return None, reason
+
+        self.path_stats.record("http")
+        return self._apply_snapshot(snapshot, self._empty_result()), None
+
+    def _fetch(self, query):
+        """Страница поиска без браузера"""
+        self._check_cancelled()
+        self._throttle()
+        with self.tracer.span("http.get", source="Контур Фокус"):
+            response = self.session.get(
+                f"{self.base_url}/search",
+                params={"country": "RU", "query": query},
+                timeout=self.TIMEOUT,
+            )
+        response.raise_for_status()
+        return PageSnapshot(response.text)
@@ -5,7 +5,9 @@
 
 import time
 import string
+import threading
 import random as rd
+from urllib.parse import urlparse
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains as AC
@@ -13,15 +15,73 @@ from selenium.webdriver.support.ui import WebDriverWait as WDW
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 
+from .tracing import traced
+
+
+class DomainPacing:
+    """
+    Давление анти-бот защиты по доменам для адаптивного режима.
+
+    Давление 0.0 соответствует профилю 'fast', 1.0 - профилю 'safe'.
+    Капча поднимает давление домена до максимума, медленный ответ - на шаг,
+    затем давление экспоненциально спадает с периодом полураспада HALF_LIFE.
+    Состояние общее для всех браузеров процесса.
+    """
+
+    HALF_LIFE = 120.0           # Секунд до уменьшения давления вдвое
+    SLOW_RESPONSE = 5.0         # Ответ дольше этого считается медленным
+    SLOW_RESPONSE_STEP = 0.3    # Рост давления за медленный ответ
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pressure = {}  # {домен: (давление, время обновления)}
+
+    def _current(self, domain, now):
+        pressure, updated_at = self._pressure.get(domain, (0.0, now))
+        return pressure * 0.5 ** ((now - updated_at) / self.HALF_LIFE)
+
+    def pressure(self, domain):
+        """Текущее давление домена с учетом спада"""
+        with self._lock:
+            return self._current(domain, time.monotonic())
+
+    def _raise(self, domain, value):
+        now = time.monotonic()
+        with self._lock:
+            self._pressure[domain] = (min(1.0, value(self._current(domain, now))), now)
+
+    def report_captcha(self, domain):
+        """Домен показал капчу - переходим к профилю 'safe'"""
+        self._raise(domain, lambda pressure: 1.0)
+
+    def report_response_time(self, domain, seconds):
+        """Время ответа домена; медленные ответы повышают давление"""
+        if seconds >= self.SLOW_RESPONSE:
+            self._raise(domain, lambda pressure: pressure + self.SLOW_RESPONSE_STEP)
+
+    def snapshot(self):
+        """Текущее давление всех доменов"""
+        now = time.monotonic()
+        with self._lock:
+            return {domain: self._current(domain, now) for domain in self._pressure}
+
+
+# Общее давление доменов для всех экземпляров Humanization
+DOMAIN_PACING = DomainPacing()
+
 
 class Humanization:
     """
-    Класс хуманизации с тремя режимами работы:
+    Класс хуманизации с режимами работы:
     1. 'fast' - Минимальные задержки, без опечаток. Для простых сайтов.
     2. 'normal' - Баланс скорости и имитации. Опечатки редкие.
     3. 'safe' - (Твой старый режим) Медленный, параноидальный. Для RusProfile и капризных защит.
+    4. 'adaptive' - Начинает с 'fast' и смещается к 'safe' только для домена,
+       который показал капчу или медленный ответ (см. DomainPacing).
     """
 
+    ADAPTIVE_MODE = 'adaptive'
+
     # Настройки для разных режимов
     SETTINGS = {
         'fast': {
@@ -50,14 +110,103 @@ class Humanization:
         }
     }
 
-    def __init__(self, mode='normal'):
-        if mode not in self.SETTINGS:
+    def __init__(self, mode='normal', tracer=None, pacing=None):
+        if mode not in self.SETTINGS and mode != self.ADAPTIVE_MODE:
             print(f"⚠️ Режим '{mode}' не найден, включен 'normal'")
             mode = 'normal'
 
         self.mode = mode
-        self.config = self.SETTINGS[mode]
+        self.tracer = tracer  # Трассировка ожиданий (Tracer)
+        self.pacing = pacing or DOMAIN_PACING  # Давление доменов (адаптивный режим)
+        self.domain = ""  # Домен текущей страницы
+        self.slept_seconds = {}  # Суммарный сон по доменам: {домен: секунды}
+
+    @property
+    def pressure(self):
+        """Давление для текущего домена (0.0 - 'fast', 1.0 - 'safe')"""
+        if self.mode != self.ADAPTIVE_MODE:
+            return None
+        return self.pacing.pressure(self.domain)
+
+    @property
+    def config(self):
+        """Профиль задержек; в адаптивном режиме - между 'fast' и 'safe'"""
+        if self.mode != self.ADAPTIVE_MODE:
+            return self.SETTINGS[self.mode]
+
+        pressure = self.pressure
+        fast, safe = self.SETTINGS['fast'], self.SETTINGS['safe']
+        return {key: self._interpolate(fast[key], safe[key], pressure) for key in fast}
+
+    @staticmethod
+    def _interpolate(low, high, ratio):
+        """Линейная интерполяция числа или кортежа чисел"""
+        if isinstance(low, tuple):
+            return tuple(
+                Humanization._interpolate(low_item, high_item, ratio)
+                for low_item, high_item in zip(low, high)
+            )
+        value = low + (high - low) * ratio
+        return round(value) if isinstance(low, int) else value
+
+    @property
+    def speed_mode(self):
+        """Режим для дискретных решений (быстрый ввод, возврат прокрутки)"""
+        if self.mode != self.ADAPTIVE_MODE:
+            return self.mode
+
+        pressure = self.pressure
+        if pressure < 1 / 3:
+            return 'fast'
+        if pressure < 2 / 3:
+            return 'normal'
+        return 'safe'
+
+    def set_url(self, url):
+        """Запоминает домен текущей страницы (для учета сна и адаптивных задержек)"""
+        self.domain = urlparse(url).netloc or self.domain
+
+    def report_captcha(self):
+        """Текущий домен показал капчу"""
+        self.pacing.report_captcha(self.domain)
+
+    def report_response_time(self, seconds):
+        """Время загрузки страницы текущего домена"""
+        self.pacing.report_response_time(self.domain, seconds)
+
+    def _sleep(self, seconds):
+        """Пауза с учетом в счетчике сна по доменам"""
+        time.sleep(seconds)
+        domain = self.domain or "-"
+        self.slept_seconds[domain] = self.slept_seconds.get(domain, 0.0) + seconds
+
+    # Установка значения поля одним вызовом с событиями, на которые реагирует страница
+    SET_FIELD_VALUE_SCRIPT = """
+        const element = arguments[0];
+        const value = arguments[1];
+        const prototype = Object.getPrototypeOf(element);
+        const descriptor = Object.getOwnPropertyDescriptor(prototype, 'value');
+        element.focus();
+        if (descriptor && descriptor.set) {
+            descriptor.set.call(element, value);
+        } else {
+            element.value = value;
+        }
+        element.dispatchEvent(new Event('input', {bubbles: true}));
+        element.dispatchEvent(new Event('change', {bubbles: true}));
+    """
+
+    @traced("humanizer.set_field_value")
+    def set_field_value(self, browser, element, text):
+        """Ввод текста одной командой WebDriver (без имитации набора)"""
+        try:
+            browser.execute_script(self.SET_FIELD_VALUE_SCRIPT, element, text)
+        except Exception as e:
+            print(f"Ошибка при установке значения поля: {e}")
+            element.clear()
+            element.send_keys(text)
 
+    @traced("humanizer.type")
     def human_like_type(self, browser, element, text):
         """Ввод текста с имитацией опечаток (зависит от режима)"""
         try:
@@ -68,30 +217,31 @@ class Humanization:
             actions.perform()
 
             element.clear()
-            time.sleep(rd.uniform(0.1, 0.3))
+            self._sleep(rd.uniform(0.1, 0.3))
 
             # Если режим 'fast', вводим кусками или очень быстро
-            if self.mode == 'fast':
+            if self.speed_mode == 'fast':
                 element.send_keys(text)
                 return
 
             for char in text:
                 element.send_keys(char)
-                time.sleep(rd.uniform(*self.config['type_speed']))
+                self._sleep(rd.uniform(*self.config['type_speed']))
 
                 # Логика опечаток
                 if rd.random() < self.config['typo_chance']:
                     wrong_char = rd.choice(string.ascii_lowercase)
                     element.send_keys(wrong_char)
-                    time.sleep(rd.uniform(0.1, 0.2))
+                    self._sleep(rd.uniform(0.1, 0.2))
                     element.send_keys(Keys.BACKSPACE)
-                    time.sleep(rd.uniform(0.1, 0.2))
+                    self._sleep(rd.uniform(0.1, 0.2))
 
         except Exception as e:
             print(f"Ошибка при вводе текста: {e}")
             element.clear()
             element.send_keys(text)
 
+    @traced("humanizer.scroll")
     def human_like_scroll(self, browser):
         """Прокрутка страницы. В 'fast' режиме она гораздо агрессивнее."""
         try:
@@ -111,7 +261,7 @@ class Humanization:
                 browser.execute_script(f"window.scrollTo(0, {current_scroll});")
 
                 # Пауза зависит от режима
-                time.sleep(rd.uniform(*self.config['scroll_pause']))
+                self._sleep(rd.uniform(*self.config['scroll_pause']))
 
                 # Проверка подгрузки контента (бесконечная прокрутка)
                 new_height = browser.execute_script("return document.body.scrollHeight")
@@ -119,16 +269,17 @@ class Humanization:
                     last_height = new_height
 
             # Скролл немного вверх (только в безопасных режимах)
-            if self.mode != 'fast' and rd.random() < 0.3:
+            if self.speed_mode != 'fast' and rd.random() < 0.3:
                 scroll_back = rd.randint(100, 300)
                 browser.execute_script(
                     f"window.scrollTo(0, {current_scroll - scroll_back});"
                 )
-                time.sleep(rd.uniform(0.5, 1.0))
+                self._sleep(rd.uniform(0.5, 1.0))
 
         except Exception as e:
             print(f"Ошибка при прокрутке: {e}")
 
+    @traced("humanizer.hover")
     def human_like_hover(self, browser, element):
         try:
             actions = AC(browser)
@@ -139,11 +290,12 @@ class Humanization:
             actions.move_to_element_with_offset(element, x_offset, y_offset)
             actions.perform()
 
-            time.sleep(rd.uniform(1, 2))
+            self._sleep(rd.uniform(1, 2))
 
         except Exception as e:
             print(f"Ошибка при наведении: {e}")
 
+    @traced("humanizer.click")
     def human_like_click(self, browser, element):
         timeout = 10
         old_tabs = browser.window_handles
@@ -154,7 +306,7 @@ class Humanization:
             actions.perform()
 
             # Задержка перед кликом (имитация прицеливания)
-            time.sleep(rd.uniform(*self.config['click_delay']))
+            self._sleep(rd.uniform(*self.config['click_delay']))
 
             element.click()
 
@@ -179,13 +331,15 @@ class Humanization:
             return False
         return True
 
+    @traced("humanizer.wait")
     def human_like_wait(self, base_seconds):
         """Умное ожидание с учетом множителя режима"""
         variation = rd.uniform(-0.2, 0.2)
         # Применяем множитель режима (например 0.5 для fast)
         wait_time = max(0.1, (base_seconds + variation) * self.config['wait_multiplier'])
-        time.sleep(wait_time)
+        self._sleep(wait_time)
 
+    @traced("humanizer.wait_for_element")
     def human_like_wait_for_element(self, browser, locator, timeout=10):
         try:
             element = WDW(browser, timeout).until(
@@ -201,6 +355,7 @@ class Humanization:
             print(f"❌ Ошибка поиска {locator}: {e}")
             return None
 
+    @traced("humanizer.mouse_movement")
     def random_mouse_movement(self, browser, element=None):
         try:
             actions = AC(browser)
@@ -216,7 +371,7 @@ class Humanization:
                 actions.move_by_offset(x_offset, y_offset)
 
             actions.perform()
-            time.sleep(rd.uniform(0.2, 0.5))
+            self._sleep(rd.uniform(0.2, 0.5))
 
         except Exception as e:
             print(f"Ошибка при движении мышью: {e}")
@@ -268,20 +423,20 @@ class Humanization:
             for handle in browser.window_handles:
                 if handle != first_handle:
                     browser.switch_to.window(handle)
-                    time.sleep(rd.uniform(0.3, 0.6))
+                    self._sleep(rd.uniform(0.3, 0.6))
 
                     try:
                         actions = AC(handle)
                         actions.key_down(Keys.CONTROL).send_keys("w").key_up(
                             Keys.CONTROL
                         ).perform()
-                        time.sleep(2)
+                        self._sleep(2)
                     except Exception:
                         browser.close()
 
-                    time.sleep(rd.uniform(0.5, 1.0))
+                    self._sleep(rd.uniform(0.5, 1.0))
                     break
 
         browser.switch_to.window(first_handle)
-        time.sleep(rd.uniform(0.5, 1.0))
+        self._sleep(rd.uniform(0.5, 1.0))
         print("✅ Осталась только первая вкладка")
@@ -0,0 +1,214 @@
+"""
+Модуль управления общим процессом LanguageTool
+"""
+
+import os
+import threading
+
+import language_tool_python
+
+
+LANGUAGE_TOOL_CACHE_DIR = os.path.expanduser("~/.cache/language_tool_python")
+LOCAL_LANGUAGE_TOOL_PATH = "/opt/languagetool"
+
+
+def find_local_jar(local_path=LOCAL_LANGUAGE_TOOL_PATH):
+    """Поиск jar файла локальной установки LanguageTool"""
+    if not os.path.exists(local_path):
+        return None
+
+    for root, dirs, files in os.walk(local_path):
+        for file in files:
+            if file == "languagetool.jar" or (file.startswith("LanguageTool-") and file.endswith(".jar")):
+                return os.path.join(root, file)
+    return None
+
+
+class LanguageToolManager:
+    """
+    Долгоживущий процесс LanguageTool, общий для всех файлов за сессию.
+
+    Запуск JVM и загрузка модели ru занимают 10-30 секунд, поэтому сервер
+    стартует в фоне при запуске приложения, переживает обработку файлов и
+    перезапускается, если перестал отвечать. Останавливается при закрытии
+    главного окна.
+
+    Объект повторяет нужную часть интерфейса language_tool_python.LanguageTool
+    (метод check), поэтому TextProcessor работает с ним как с обычным tool.
+    """
+
+    HEALTH_CHECK_TEXT = "Проверка"
+
+    def __init__(self, language="ru", log_callback=None):
+        self.language = language
+        self.log_callback = log_callback
+        self.version = None
+        self.restarts = 0
+
+        self._tool = None
+        self._start_error = None
+        self._start_thread = None
+        self._ready = threading.Event()
+        self._lock = threading.RLock()
+        self._environment_configured = False
+
+    def log(self, message):
+        """Вывод сообщения в лог"""
+        if self.log_callback:
+            self.log_callback(message)
+        else:
+            print(message)
+
+    def configure_environment(self):
+        """Настройка кэша и локальной установки LanguageTool (один раз за процесс)"""
+        if self._environment_configured:
+            return
+
+        # Настраиваем кэш для LanguageTool, чтобы не скачивать каждый раз
+        os.makedirs(LANGUAGE_TOOL_CACHE_DIR, exist_ok=True)
+        if "LANGUAGETOOL_CACHE_DIR" not in os.environ:
+            os.environ["LANGUAGETOOL_CACHE_DIR"] = LANGUAGE_TOOL_CACHE_DIR
+
+        # Пытаемся использовать локальную установку LanguageTool (если есть)
+        jar_path = find_local_jar()
+        if jar_path:
+            self.log(f"📦 Использую локальную установку LanguageTool: {jar_path}")
+            os.environ["LANGUAGETOOL_JAR"] = jar_path
+
+        cache_zip = os.path.join(LANGUAGE_TOOL_CACHE_DIR, "LanguageTool-latest-snapshot.zip")
+        cache_extracted = os.path.join(LANGUAGE_TOOL_CACHE_DIR, "LanguageTool-latest-snapshot")
+        if os.path.exists(cache_zip) or os.path.exists(cache_extracted):
+            self.log(f"✅ Найден кэш LanguageTool в {LANGUAGE_TOOL_CACHE_DIR}")
+        else:
+            self.log("📥 LanguageTool не найден в кэше, будет выполнена загрузка (только при первом запуске)")
+
+        # Отключаем проверку обновлений, чтобы не скачивать LanguageTool повторно
+        if "LANGUAGETOOL_DISABLE_UPDATE_CHECK" not in os.environ:
+            os.environ["LANGUAGETOOL_DISABLE_UPDATE_CHECK"] = "1"
+
+        self._environment_configured = True
+
+    def start_async(self):
+        """Запуск LanguageTool в фоновом потоке (повторный вызов ничего не делает)"""
+        with self._lock:
+            if self._tool is not None:
+                return
+            if self._start_thread is not None and self._start_thread.is_alive():
+                return
+
+            self._ready.clear()
+            self._start_error = None
+            self._start_thread = threading.Thread(
+                target=self._start, name="LanguageToolStart", daemon=True
+            )
+            self._start_thread.start()
+
+    def _start(self):
+        """Запуск процесса LanguageTool"""
+        try:
+            self.configure_environment()
+            self.log("🔧 Запуск LanguageTool...")
+            tool = language_tool_python.LanguageTool(self.language)
+            with self._lock:
+                self._tool = tool
+                self.version = getattr(tool, "language_tool_download_version", None) or "unknown"
+            self.log("✅ LanguageTool готов к работе")
+        except Exception as e:
+            self._start_error = e
+            self.log(f"❌ Не удалось запустить LanguageTool: {e}")
+        finally:
+            self._ready.set()
+
+    def wait_ready(self, timeout=None):
+        """
+        Ожидание завершения запуска
+
+        Returns:
+            bool: True, если запуск завершен (успешно или с ошибкой)
+        """
+        self.start_async()
+        return self._ready.wait(timeout)
+
+    def is_healthy(self):
+        """Проверка, что сервер LanguageTool запущен и отвечает"""
+        with self._lock:
+            tool = self._tool
+        if tool is None:
+            return False
+
+        try:
+            tool.check(self.HEALTH_CHECK_TEXT)
+            return True
+        except Exception:
+            return False
+
+    def get_tool(self, check_health=True):
+        """
+        Рабочий экземпляр LanguageTool (при необходимости запускается или перезапускается)
+
+        Args:
+            check_health: Проверить, что сервер отвечает (перед обработкой файла)
+
+        Raises:
+            RuntimeError: Если LanguageTool не удалось запустить
+        """
+        self.wait_ready()
+
+        with self._lock:
+            tool = self._tool
+        if tool is None or (check_health and not self.is_healthy()):
+            self.restart()
+
+        with self._lock:
+            if self._tool is None:
+                raise RuntimeError(f"LanguageTool недоступен: {self._start_error}")
+            return self._tool
+
+    def restart(self):
+        """Перезапуск процесса LanguageTool"""
+        with self._lock:
+            self.log("♻️ Перезапуск LanguageTool...")
+            self._close_tool()
+            self.restarts += 1
+            self._ready.clear()
+            self._start()
+            return self._tool
+
+    def check(self, text):
+        """Проверка текста; при сбое сервер перезапускается и запрос повторяется"""
+        tool = self.get_tool(check_health=False)
+        try:
+            return tool.check(text)
+        except Exception as e:
+            self.log(f"⚠️ LanguageTool не ответил: {e}")
+            tool = self.restart()
+            if tool is None:
+                raise
+            return tool.check(text)
+
+    def correct(self, text):
+        """Исправление текста (аналог LanguageTool.correct)"""
+        return language_tool_python.utils.correct(text, self.check(text))
+
+    def _close_tool(self):
+        """Остановка процесса Java"""
+        tool = self._tool
+        self._tool = None
+        if tool is None:
+            return
+
+        try:
+            tool.close()
+        except Exception as e:
+            self.log(f"⚠️ Ошибка при закрытии LT: {e}")
+
+    def shutdown(self):
+        """Остановка LanguageTool при закрытии приложения"""
+        if self._start_thread is not None and self._start_thread.is_alive():
+            self._ready.wait(10)
+
+        with self._lock:
+            if self._tool is not None:
+                self.log("🔌 Закрытие процесса LanguageTool...")
+                self._close_tool()
+                self.log("✅ Процесс Java остановлен.")
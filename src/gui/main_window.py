@@ -5,6 +5,8 @@
 import config
 from .excel_merger_module import ExcelMerger
 from .fill_excel_columns_module import FillExcelColumns
+from .browser import BrowserPool
+from .language_tool_manager import LanguageToolManager
 from .settings import run_settings_dialog
 
 from PySide6.QtWidgets import (
@@ -28,6 +30,12 @@ class MainWindow(QMainWindow):
         self.settings.setDefaultFormat(QSettings.Format.NativeFormat)
         self.load_settings()
 
+        # LanguageTool запускается в фоне сразу и используется всеми файлами за сессию
+        self.language_tool = LanguageToolManager()
+        self.language_tool.start_async()
+        # Браузеры остаются запущенными между файлами до закрытия приложения
+        self.browser_pool = BrowserPool()
+
         self.main_window_ui()
 
     def load_settings(self):
@@ -56,13 +64,17 @@ class MainWindow(QMainWindow):
             if hasattr(widget, 'parser_thread') and widget.parser_thread:
                 if widget.parser_thread.isRunning():
                     widget.parser_thread._stop_requested = True
-                    if widget.parser_thread.parser:
-                        try:
-                            widget.parser_thread.parser.close_browser()
-                        except Exception:
-                            pass
+                    try:
+                        widget.parser_thread.close_browsers()
+                    except Exception:
+                        pass
                     widget.parser_thread.wait(3000)
+            if hasattr(widget, 'worker') and widget.worker and widget.worker.isRunning():
+                widget.worker.cancel()
+                widget.worker.wait(3000)
 
+        self.language_tool.shutdown()
+        self.browser_pool.shutdown()
         self.settings.setValue("window_geometry", self.saveGeometry())
 
         event.accept()
@@ -88,7 +100,7 @@ class MainWindow(QMainWindow):
         """Создание вкладок приложения и кнопки настроек"""
         self.tab_widget = QTabWidget()
 
-        tab1 = FillExcelColumns()
+        tab1 = FillExcelColumns(language_tool=self.language_tool, browser_pool=self.browser_pool)
         tab2 = ExcelMerger()
 
         self.tab_widget.addTab(tab1, "🔍 Парсинг организаций")
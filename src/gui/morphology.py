@@ -0,0 +1,86 @@
+"""
+Модуль морфологии: общий MorphAnalyzer и кэшированное склонение слов
+"""
+
+import threading
+from functools import lru_cache
+
+import pymorphy3
+
+
+_morph = None
+_morph_lock = threading.Lock()
+
+
+def get_morph_analyzer():
+    """
+    Общий для процесса MorphAnalyzer
+
+    Создается лениво при первом обращении: загрузка словарей DAWG занимает
+    сотни миллисекунд, поэтому анализатор разделяют все сеарчеры и потоки.
+    """
+    global _morph
+    if _morph is None:
+        with _morph_lock:
+            if _morph is None:
+                _morph = pymorphy3.MorphAnalyzer()
+    return _morph
+
+
+@lru_cache(maxsize=50000)
+def inflect_word(word, case="gent"):
+    """
+    Склонение одного слова (результат кэшируется)
+
+    Returns:
+        str | None: Слово в нужном падеже или None, если склонить не удалось
+    """
+    parsed = get_morph_analyzer().parse(word)
+    if not parsed:
+        return None
+
+    inflected = parsed[0].inflect({case})
+    return inflected.word if inflected else None
+
+
+def to_genitive_case(org_name):
+    """Получение родительного падежа названия организации"""
+    if not org_name:
+        return org_name
+
+    genitive_words = []
+
+    for word in org_name.split():
+        if word.startswith(("«", '"', '"')) or word.endswith(("»", '"', '"')):
+            genitive_words.append(word)
+            continue
+
+        clean_word = word.strip(".,;:!?")
+        if not clean_word:
+            genitive_words.append(word)
+            continue
+
+        punct = word[len(clean_word):] if len(word) > len(clean_word) else ""
+        genitive_form = inflect_word(clean_word)
+
+        if genitive_form:
+            genitive_words.append(
+                genitive_form.capitalize()
+                if clean_word[0].isupper()
+                else genitive_form + punct
+            )
+        else:
+            genitive_words.append(word)
+
+    return " ".join(genitive_words)
+
+
+def stats_line():
+    """Строка со статистикой кэша склонений для лога"""
+    info = inflect_word.cache_info()
+    total = info.hits + info.misses
+    rate = round(info.hits / total * 100, 1) if total else 0.0
+    return (
+        f"🔤 Кэш склонений: попаданий {info.hits}, промахов {info.misses} "
+        f"({rate}%), слов в кэше {info.currsize}"
+    )
@@ -3,30 +3,58 @@
 """
 
 import re
-import os
 import json
 import random as rd
-import tempfile
-import pymorphy3
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from urllib.parse import quote
 from selenium import webdriver as wd
 from selenium.webdriver.common.by import By
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.common.keys import Keys
-from bs4 import BeautifulSoup as BS
+from selenium.webdriver.support.ui import WebDriverWait as WDW
 
 import config
+from .browser import BrowserClosed, BrowserManager, CountingChrome, ResourceFilter
+from .extractors import EgrulExtractor, KonturFokusExtractor, PageSnapshot, RusProfileExtractor
 from .humanization import Humanization
+from .morphology import to_genitive_case
+from .rate_limiter import get_rate_limiter
+from .rules import get_rules
 from .recaptcha_solver import ReCaptchaSolver
+from .tracing import Tracer
+from .variant_ranking import VariantRanker, get_variant_stats
+
+
+class SearchCancelled(Exception):
+    """Поиск отменен: ответ уже получен из более приоритетного источника"""
 
 
 class BaseSearcher:
     """Базовый класс для всех сеарчеров с общими утилитами"""
 
-    def __init__(self, browser, humanizer, log_callback=None):
+    # Адрес сайта источника (переопределяется base_url, например для локального стенда)
+    BASE_URL = ""
+    # Ввод запроса одной командой вместо имитации набора (переопределяется direct_input)
+    DIRECT_INPUT = False
+    # Сайт в общем лимите частоты запросов (RateLimiter)
+    RATE_DOMAIN = ""
+
+    def __init__(
+        self, browser, humanizer, log_callback=None, base_url=None, tracer=None, direct_input=None
+    ):
         self.browser = browser
         self.humanizer = humanizer
         self.log_callback = log_callback
+        self.base_url = (base_url or self.BASE_URL).rstrip("/")
+        self.tracer = tracer or Tracer()
+        self.direct_input = self.DIRECT_INPUT if direct_input is None else direct_input
+        # Отмена поиска при параллельном опросе источников (threading.Event)
+        self.cancel_event = None
+        self._rules_error_logged = False
 
     def log(self, message):
         """Вывод сообщения в лог"""
@@ -35,37 +63,69 @@ class BaseSearcher:
         else:
             print(message)
 
-    @staticmethod
-    def get_genitive_case_pymorphy(org_name):
-        """Получение родительного падежа через pymorphy3"""
-        if not org_name:
-            return org_name
-
-        morph = pymorphy3.MorphAnalyzer()
+    def _check_cancelled(self):
+        """Прерывание поиска, если он отменен (проверяется между командами браузера)"""
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise SearchCancelled()
+
+    def _throttle(self):
+        """Ожидание очереди на запрос к сайту источника (лимит общий для всех потоков)"""
+        if not get_rate_limiter().acquire(self.RATE_DOMAIN, self.cancel_event):
+            raise SearchCancelled()
+
+    def _get(self, url):
+        """Переход браузера по адресу (с трассировкой и учетом времени ответа домена)"""
+        self._check_cancelled()
+        self._throttle()
+        self.humanizer.set_url(url)
+        started = time.time()
+        with self.tracer.span("browser.get", url=url):
+            self.browser.get(url)
+        load_seconds = time.time() - started
+        self.humanizer.report_response_time(load_seconds)
+        self.browser.record_page(load_seconds)
 
-        words = org_name.split()
-        genitive_words = []
+    def _snapshot(self):
+        """Снимок текущей страницы (одна команда WebDriver вместо find_element/.text)"""
+        self._check_cancelled()
+        with self.tracer.span("browser.snapshot"):
+            return PageSnapshot.from_browser(self.browser)
 
-        for word in words:
-            if word.startswith(("«", '"', '"')) or word.endswith(("»", '"', '"')):
-                genitive_words.append(word)
-            else:
-                clean_word = word.strip(".,;:!?")
-                punct = word[len(clean_word):] if len(word) > len(clean_word) else ""
+    def _wait_for_snapshot(self, extract, timeout=10):
+        """
+        Ожидание страницы, с которой extract(снимок) возвращает непустое значение
 
-                parsed = morph.parse(clean_word)[0]
-                genitive_form = parsed.inflect({"gent"})
+        Returns:
+            Результат extract или None по таймауту
+        """
+        try:
+            return WDW(self.browser, timeout, poll_frequency=0.5).until(
+                lambda driver: extract(self._snapshot())
+            )
+        except TimeoutException:
+            return None
 
-                if genitive_form:
-                    genitive_words.append(
-                        genitive_form.word.capitalize()
-                        if clean_word[0].isupper()
-                        else genitive_form.word + punct
-                    )
-                else:
-                    genitive_words.append(word)
+    def _enter_query(self, element, text):
+        """Ввод поискового запроса в поле: имитация набора или одна команда"""
+        if self.direct_input:
+            self.humanizer.set_field_value(self.browser, element, text)
+        else:
+            self.humanizer.human_like_type(self.browser, element, text)
+            self.humanizer.random_mouse_movement(self.browser, element)
+
+    @property
+    def rules(self):
+        """Общие скомпилированные правила стандартизации"""
+        rules = get_rules()
+        if rules.load_error and not self._rules_error_logged:
+            self._rules_error_logged = True
+            self.log(f"  ⚠️ Не удалось загрузить standardization_rules.json: {rules.load_error}")
+        return rules
 
-        return " ".join(genitive_words)
+    @staticmethod
+    def get_genitive_case_pymorphy(org_name):
+        """Получение родительного падежа через общий кэшированный pymorphy3"""
+        return to_genitive_case(org_name)
 
     @staticmethod
     def remove_quotes_for_search(text):
@@ -145,102 +205,50 @@ class BaseSearcher:
 class RusProfileSearcher(BaseSearcher):
     """Класс для поиска организаций в RusProfile"""
 
+    BASE_URL = "https://www.rusprofile.ru"
+    RATE_DOMAIN = "rusprofile"
+
     def __init__(
-        self, browser, humanizer, log_callback=None, use_recaptcha_solver=False, recaptcha_solver=None
+        self,
+        browser,
+        humanizer,
+        log_callback=None,
+        use_recaptcha_solver=False,
+        recaptcha_solver=None,
+        base_url=None,
+        tracer=None,
+        direct_input=None,
+        variant_budget=None,
+        variant_stats=None,
     ):
-        super().__init__(browser, humanizer, log_callback)
+        super().__init__(browser, humanizer, log_callback, base_url, tracer, direct_input)
         self.use_recaptcha_solver = use_recaptcha_solver
         self.recaptcha_solver = recaptcha_solver
-        self._std_rules = None
+        # Не больше variant_budget вариантов названия на организацию (0 - без ограничения)
+        self.variant_budget = variant_budget
+        # Успешность видов вариантов (общая, сохраняется между запусками)
+        self.variant_stats = variant_stats
 
     def _handle_rusprofile_captcha(self):
         """
         Проверяет наличие капчи на RusProfile и обрабатывает её.
+
+        Returns:
+            bool: True, если на странице была капча
         """
+        captcha_found = False
         try:
-            # Сначала проверяем, есть ли результаты поиска или сообщение "не найдено"
-            # Если есть - это не капча, а просто отсутствие результатов
+            # Выдача, «не найдено», iframe/форма капчи и текст про робота
+            # проверяются по одному снимку страницы
             try:
-                # Проверяем наличие результатов поиска
-                has_results = (
-                    self.browser.find_elements(By.ID, "clip_name-long")
-                    or self.browser.find_elements(By.CLASS_NAME, "list-element__title")
-                    or self.browser.find_elements(By.CLASS_NAME, "company-name")
-                )
-
-                # Проверяем наличие сообщения "не найдено"
-                body = self.browser.find_element(By.TAG_NAME, "body")
-                page_text = body.text.lower()
-                has_no_results_message = (
-                    "не найдено" in page_text
-                    or "не найдено организаций" in page_text
-                    or "попробуйте смягчить фильтры" in page_text
-                )
-
-                # Если есть результаты или сообщение "не найдено" - это не капча
-                if has_results or has_no_results_message:
-                    return
+                if not RusProfileExtractor.is_captcha(self._snapshot()):
+                    return False  # Капчи нет, выходим
             except Exception:
-                pass  # Продолжаем проверку дальше
-
-            # Проверяем наличие элементов капчи (более точная проверка)
-            try:
-                # Проверяем наличие iframe с recaptcha
-                recaptcha_iframes = self.browser.find_elements(
-                    By.CSS_SELECTOR, "iframe[src*='recaptcha'], iframe[title*='reCAPTCHA']"
-                )
-
-                # Проверяем наличие формы капчи
-                captcha_forms = self.browser.find_elements(
-                    By.CSS_SELECTOR, "form[id*='captcha'], form[class*='captcha']"
-                )
-
-                # Проверяем наличие конкретных текстов о капче/роботе
-                body = self.browser.find_element(By.TAG_NAME, "body")
-                page_text = body.text.lower()
-                page_source_lower = self.browser.page_source.lower()
-
-                # Конкретные фразы, которые указывают на капчу
-                captcha_phrases = [
-                    "вы робот",
-                    "подтвердите что вы не робот",
-                    "подтвердите, что вы не робот",
-                    "проверка на робота",
-                    "вы похожи на робота",
-                ]
-
-                has_captcha_text = any(phrase in page_text for phrase in captcha_phrases)
-                has_recaptcha_widget = "g-recaptcha" in page_source_lower or "recaptcha/api.js" in page_source_lower
-
-                # Капча есть только если:
-                # 1. Есть iframe с recaptcha ИЛИ
-                # 2. Есть форма капчи ИЛИ
-                # 3. Есть конкретный текст о капче И есть виджет recaptcha
-                is_captcha = (
-                    len(recaptcha_iframes) > 0
-                    or len(captcha_forms) > 0
-                    or (has_captcha_text and has_recaptcha_widget)
-                )
-
-                if not is_captcha:
-                    return  # Капчи нет, выходим
-
-            except Exception:
-                # Если не можем проверить элементы, используем старую логику как fallback
-                try:
-                    body = self.browser.find_element(By.TAG_NAME, "body")
-                    page_text = body.text.lower()
-                    page_source_lower = self.browser.page_source.lower()
-
-                    # Только если есть и "робот" в тексте, и recaptcha в коде
-                    if "робот" in page_text and ("g-recaptcha" in page_source_lower or "recaptcha/api.js" in page_source_lower):
-                        pass  # Продолжаем обработку капчи
-                    else:
-                        return  # Не капча
-                except Exception:
-                    return  # Не можем определить, считаем что капчи нет
+                return False  # Не можем определить, считаем что капчи нет
 
             # Если дошли сюда - капча действительно обнаружена
+            captcha_found = True
+            self.humanizer.report_captcha()
             self.log("\n" + "!" * 60)
             self.log("🛑 ОБНАРУЖЕНА КАПЧА RUSPROFILE! 🛑")
 
@@ -284,13 +292,10 @@ class RusProfileSearcher(BaseSearcher):
 
                     # Проверка результата
                     try:
-                        page_text_after = self.browser.find_element(
-                            By.TAG_NAME, "body"
-                        ).text
-                        if "робот" not in page_text_after.lower():
+                        if "робот" not in self._snapshot().text_lower:
                             self.log("✅ Капча успешно пройдена!")
                             self.log("!" * 60 + "\n")
-                            return
+                            return True
                     except Exception:
                         pass
 
@@ -307,29 +312,20 @@ class RusProfileSearcher(BaseSearcher):
             # Цикл ожидания
             while True:
                 try:
-                    # Если нашли элементы успешной выдачи - выходим
-                    if (
-                        self.browser.find_elements(By.ID, "clip_name-long")
-                        or self.browser.find_elements(
-                            By.CLASS_NAME, "list-element__title"
-                        )
-                        or self.browser.find_elements(By.CLASS_NAME, "company-name")
-                    ):  # Добавил еще один признак
+                    # Проверка на закрытие браузера
+                    if not self.browser.window_handles:
+                        break
 
+                    snapshot = self._snapshot()
+
+                    # Если нашли элементы успешной выдачи - выходим
+                    if RusProfileExtractor.has_content(snapshot):
                         self.log("✅ Капча пройдена (обнаружен контент)!")
                         self.humanizer.human_like_wait(2.0)
                         break
 
-                    # Проверка на закрытие браузера
-                    if not self.browser.window_handles:
-                        break
-
                     # Проверка, исчез ли текст про робота
-                    body_text = self.browser.find_element(By.TAG_NAME, "body").text
-                    if (
-                        "робот" not in body_text.lower()
-                        and "recaptcha" not in self.browser.page_source
-                    ):
+                    if "робот" not in snapshot.text_lower and "recaptcha" not in snapshot.html:
                         # Дополнительная проверка, что мы не на пустой странице
                         self.log("✅ Текст капчи исчез. Продолжаем.")
                         time.sleep(2)
@@ -343,88 +339,11 @@ class RusProfileSearcher(BaseSearcher):
         except Exception as e:
             self.log(f"⚠️ Ошибка в логике обработки капчи: {e}")
 
-    def _load_standardization_rules(self):
-        """Загрузка правил стандартизации"""
-        if self._std_rules is not None:
-            return self._std_rules
-
-        try:
-            rules_path = os.path.join(
-                os.path.dirname(__file__), "..", "..", "standardization_rules.json"
-            )
-            rules_path = os.path.abspath(rules_path)
-            with open(rules_path, "r", encoding="utf-8") as f:
-                self._std_rules = json.load(f)
-                return self._std_rules
-        except Exception as e:
-            self.log(f"  ⚠️ Не удалось загрузить standardization_rules.json: {e}")
-            # Возвращаем минимальный набор правил
-            self._std_rules = {"abbreviations": {}, "type_synonyms": {}}
-            return self._std_rules
+        return captcha_found
 
     def _expand_abbreviations_in_text(self, text):
         """Расшифровывает все аббревиатуры в тексте, но НЕ заменяет аббревиатуры внутри кавычек"""
-        if not text:
-            return text
-
-        rules = self._load_standardization_rules()
-        result = text
-        abbreviations = rules.get("abbreviations", {})
-
-        # Извлекаем все части текста в кавычках, чтобы не заменять аббревиатуры внутри них
-        quote_pattern = r'["\'«»][^"\']+["\'»]'
-        quoted_parts = []
-        for match in re.finditer(quote_pattern, result):
-            quoted_parts.append((match.start(), match.end(), match.group()))
-
-        # Создаем версию текста без кавычек для замены
-        text_without_quotes = result
-        placeholders = {}
-        for i, (start, end, quoted_text) in enumerate(quoted_parts):
-            placeholder = f"__QUOTE_PLACEHOLDER_{i}__"
-            placeholders[placeholder] = quoted_text
-            text_without_quotes = text_without_quotes[:start] + placeholder + text_without_quotes[end:]
-
-        # Сначала заменяем ОПФ (организационно-правовые формы) в начале строки
-        # Сортируем по длине (от длинных к коротким), чтобы сначала заменять составные аббревиатуры
-        opf_abbreviations = sorted(
-            [(abbr, full_form) for abbr, full_form in abbreviations.items()
-             if abbr in ["АНОО", "АНО", "МБОУ", "ГБОУ", "МАОУ", "МКОУ", "ГКОУ",
-                         "ЧОУ", "НЧОУ", "ФГБОУ", "ФГАОУ", "ГАОУ", "ГБПОУ", "ГАПОУ"]],
-            key=lambda x: len(x[0]),
-            reverse=True
-        )
-
-        for abbr, full_form in opf_abbreviations:
-            # Ищем ОПФ в начале строки (только вне кавычек)
-            pattern = r'^' + re.escape(abbr) + r'\s+'
-            if re.search(pattern, text_without_quotes, re.IGNORECASE):
-                text_without_quotes = re.sub(pattern, full_form + " ", text_without_quotes, flags=re.IGNORECASE)
-                break  # Заменяем только первую найденную ОПФ в начале
-
-        # Затем заменяем остальные аббревиатуры (сортируем по длине для правильной замены)
-        # Исключаем короткие аббревиатуры (1-2 символа), которые могут быть частью других слов
-        other_abbreviations = sorted(
-            [(abbr, full_form) for abbr, full_form in abbreviations.items()
-             if abbr not in ["АНОО", "АНО", "МБОУ", "ГБОУ", "МАОУ", "МКОУ", "ГКОУ",
-                             "ЧОУ", "НЧОУ", "ФГБОУ", "ФГАОУ", "ГАОУ", "ГБПОУ", "ГАПОУ"]
-             and len(abbr) >= 3],  # Только аббревиатуры длиной 3+ символа
-            key=lambda x: len(x[0]),
-            reverse=True
-        )
-
-        for abbr, full_form in other_abbreviations:
-            # Ищем аббревиатуру как отдельное слово (только вне кавычек)
-            pattern = r'\b' + re.escape(abbr) + r'\b'
-            if re.search(pattern, text_without_quotes, re.IGNORECASE):
-                text_without_quotes = re.sub(pattern, full_form, text_without_quotes, flags=re.IGNORECASE)
-
-        # Восстанавливаем кавычки обратно
-        result = text_without_quotes
-        for placeholder, quoted_text in placeholders.items():
-            result = result.replace(placeholder, quoted_text)
-
-        return result
+        return self.rules.expand_abbreviations(text)
 
     def _is_educational_keyword(self, text):
         """Проверяет, содержит ли текст образовательные ключевые слова"""
@@ -432,29 +351,14 @@ class RusProfileSearcher(BaseSearcher):
             return False
 
         text_lower = text.lower()
-        rules = self._load_standardization_rules()
+        rules = self.rules
 
         # Проверяем аббревиатуры (как отдельные слова)
-        for abbr in rules.get("abbreviations", {}).keys():
-            # Ищем аббревиатуру как отдельное слово
-            pattern = r'\b' + re.escape(abbr.lower()) + r'\b'
-            if re.search(pattern, text_lower):
-                return True
+        if rules.abbreviation_regex.search(text_lower):
+            return True
 
         # Проверяем образовательные ключевые слова
-        edu_keywords = [
-            "школа", "сош", "лицей", "гимназия", "колледж", "университет",
-            "институт", "училище", "образовательн", "учреждение", "детский сад",
-            "доу", "дворец творчества", "дом творчества", "центр детского",
-            "центр развития", "центр образования"
-        ]
-
-        # Проверяем точные совпадения для более надежной проверки
-        for keyword in edu_keywords:
-            if keyword in text_lower:
-                return True
-
-        return False
+        return any(keyword in text_lower for keyword in rules.edu_keywords)
 
     def _has_unique_words(self, text, original_text=None):
         """Проверяет, содержит ли текст уникальные слова (не только общие образовательные термины)"""
@@ -464,8 +368,7 @@ class RusProfileSearcher(BaseSearcher):
         text_lower = text.lower()
 
         # Общие образовательные слова, которые не являются уникальными (загружаем из файла)
-        rules = self._load_standardization_rules()
-        common_edu_words = set(rules.get("common_words", []))
+        common_edu_words = self.rules.common_words
 
         # Извлекаем все слова из текста
         words = set(re.findall(r'\b[А-ЯЁа-яё]{3,}\b', text_lower))
@@ -540,8 +443,7 @@ class RusProfileSearcher(BaseSearcher):
             found_words = set(re.findall(r'\b[А-ЯЁа-яё]{3,}\b', found_name))
 
             # Исключаем общие слова (загружаем из файла)
-            rules = self._load_standardization_rules()
-            common_words = set(rules.get("common_words", []))
+            common_words = self.rules.common_words
             original_words -= common_words
             found_words -= common_words
 
@@ -570,16 +472,35 @@ class RusProfileSearcher(BaseSearcher):
 
     def generate_search_variants(self, org_name):
         """Генерирует варианты названия для поиска с расшифровкой аббревиатур"""
+        return [variant for variant, _ in self._generate_search_variants(org_name)]
+
+    def _generate_search_variants(self, org_name):
+        """
+        Варианты названия для поиска вместе с видом (правилом, которым получен вариант)
+
+        Returns:
+            list: [(вариант, вид)] в порядке генерации, без точных дублей
+        """
         variants = []
-        rules = self._load_standardization_rules()
+        rules = self.rules
+
+        def add(variant, kind):
+            variants.append((variant, kind))
+
+        def add_expanded(variant, kind, check_unique=False):
+            # Вариант с расшифрованными аббревиатурами, если он отличается
+            expanded = self._expand_abbreviations_in_text(variant)
+            if expanded != variant and expanded not in (v for v, _ in variants):
+                if not check_unique or self._has_unique_words(expanded, org_name):
+                    add(expanded, kind + "_expanded")
 
         # 1. ПЕРВЫЙ ВАРИАНТ: Оригинальное название с расшифрованными аббревиатурами
         expanded_original = self._expand_abbreviations_in_text(org_name)
         if expanded_original != org_name:
-            variants.append(expanded_original)
+            add(expanded_original, "original_expanded")
 
         # 2. Оригинальное название (без расшифровки)
-        variants.append(org_name)
+        add(org_name, "original")
 
         # 3. Убираем город в конце (после запятой или пробела)
         # "АНОО Лицей Интеллект Балашиха" -> "АНОО Лицей Интеллект"
@@ -587,22 +508,18 @@ class RusProfileSearcher(BaseSearcher):
             r"[,\s]+(?:г\.?\s*)?[А-ЯЁ][а-яё]+(?:\s+обл\.?)?$", "", org_name
         )
         if without_city != org_name:
-            variants.append(without_city.strip())
+            add(without_city.strip(), "without_city")
             # С расшифровкой
-            expanded_without_city = self._expand_abbreviations_in_text(without_city.strip())
-            if expanded_without_city != without_city.strip() and expanded_without_city not in variants:
-                variants.append(expanded_without_city)
+            add_expanded(without_city.strip(), "without_city")
 
         # 4. Убираем всё после последних кавычек
         # 'АНОО "Лицей "Интеллект" Балашиха' -> 'АНОО "Лицей "Интеллект"'
         quote_match = re.search(r'(.+["\'])\s+[А-ЯЁ]', org_name)
         if quote_match:
             variant = quote_match.group(1).strip()
-            variants.append(variant)
+            add(variant, "until_quote")
             # С расшифровкой
-            expanded_variant = self._expand_abbreviations_in_text(variant)
-            if expanded_variant != variant and expanded_variant not in variants:
-                variants.append(expanded_variant)
+            add_expanded(variant, "until_quote")
 
         # 5. Только текст в кавычках (НО только если содержит образовательные ключевые слова)
         # '"Лицей "Интеллект"' или "Интеллект"
@@ -612,33 +529,24 @@ class RusProfileSearcher(BaseSearcher):
             longest_quote = max(quoted, key=len)
             # Добавляем только если содержит образовательные ключевые слова
             if self._is_educational_keyword(longest_quote):
-                variants.append(longest_quote)
+                add(longest_quote, "quoted")
                 # С расшифровкой
-                expanded_quote = self._expand_abbreviations_in_text(longest_quote)
-                if expanded_quote != longest_quote and expanded_quote not in variants:
-                    variants.append(expanded_quote)
+                add_expanded(longest_quote, "quoted")
 
         # 6. Убираем организационно-правовую форму в начале
         # "АНОО Лицей Интеллект" -> "Лицей Интеллект"
-        without_opf = re.sub(
-            r'^(?:ООО|ЗАО|ОАО|АО|ИП|ФГБОУ|МБОУ|АНОО|НОУ|ГОУ|МОУ|АНО)\s+["\']?', "", org_name
-        )
+        without_opf = rules.search_opf_regex.sub("", org_name)
         if without_opf != org_name:
             without_opf_clean = without_opf.strip()
             # Добавляем только если содержит уникальные слова
             if self._has_unique_words(without_opf_clean, org_name):
-                variants.append(without_opf_clean)
+                add(without_opf_clean, "without_opf")
                 # С расшифровкой
-                expanded_without_opf = self._expand_abbreviations_in_text(without_opf_clean)
-                if expanded_without_opf != without_opf_clean and expanded_without_opf not in variants:
-                    if self._has_unique_words(expanded_without_opf, org_name):
-                        variants.append(expanded_without_opf)
+                add_expanded(without_opf_clean, "without_opf", check_unique=True)
 
         # 7. Ключевые слова (самое важное - обычно в кавычках или после ОПФ)
         # Находим основное название без ОПФ и города
-        core_name = re.sub(
-            r"^(?:ООО|ЗАО|ОАО|АО|ИП|ФГБОУ|МБОУ|АНОО|НОУ|ГОУ|МОУ|АНО)\s+", "", org_name
-        )
+        core_name = rules.search_opf_strict_regex.sub("", org_name)
         core_name = re.sub(
             r"[,\s]+(?:г\.?\s*)?[А-ЯЁ][а-яё]+(?:\s+обл\.?)?$", "", core_name
         )
@@ -646,37 +554,46 @@ class RusProfileSearcher(BaseSearcher):
             core_name_clean = core_name.strip()
             # Добавляем только если содержит уникальные слова
             if self._has_unique_words(core_name_clean, org_name):
-                variants.append(core_name_clean)
+                add(core_name_clean, "core")
                 # С расшифровкой
-                expanded_core = self._expand_abbreviations_in_text(core_name_clean)
-                if expanded_core != core_name_clean and expanded_core not in variants:
-                    if self._has_unique_words(expanded_core, org_name):
-                        variants.append(expanded_core)
+                add_expanded(core_name_clean, "core", check_unique=True)
 
         # 8. Только слова в кавычках без спецсимволов (НО только если содержат образовательные ключевые слова)
         clean_quoted = re.findall(r'["\']([А-ЯЁа-яё\s]+)["\']', org_name)
         for cq in clean_quoted:
             cq_clean = cq.strip()
-            if cq_clean and cq_clean not in variants:
+            if cq_clean and cq_clean not in (v for v, _ in variants):
                 # Добавляем только если содержит образовательные ключевые слова
                 if self._is_educational_keyword(cq_clean):
-                    variants.append(cq_clean)
+                    add(cq_clean, "clean_quoted")
                     # С расшифровкой
-                    expanded_cq = self._expand_abbreviations_in_text(cq_clean)
-                    if expanded_cq != cq_clean and expanded_cq not in variants:
-                        variants.append(expanded_cq)
+                    add_expanded(cq_clean, "clean_quoted")
 
         # Убираем дубликаты, сохраняя порядок
         seen = set()
         unique_variants = []
-        for v in variants:
+        for v, kind in variants:
             v_clean = v.strip()
             if v_clean and v_clean not in seen and len(v_clean) > 3:
                 seen.add(v_clean)
-                unique_variants.append(v_clean)
+                unique_variants.append((v_clean, kind))
 
         return unique_variants
 
+    def ranked_search_variants(self, org_name):
+        """
+        Варианты для поиска в порядке ожидаемой пользы: близкие схлопнуты,
+        лишние отсечены бюджетом
+
+        Returns:
+            list: [(вариант, вид, оценка)]
+        """
+        ranker = VariantRanker(self.rules.common_words, self.variant_stats, self.variant_budget)
+        ranked, collapsed, pruned = ranker.rank(self._generate_search_variants(org_name))
+        if collapsed or pruned:
+            self.log(f"  ✂️ Вариантов: схлопнуто близких {collapsed}, отсечено бюджетом {pruned}")
+        return ranked
+
     def search(self, org_name=None, inn=None):
         """Поиск в RusProfile по названию или ИНН с множественными попытками"""
         result = {
@@ -686,7 +603,7 @@ class RusProfileSearcher(BaseSearcher):
         }
 
         try:
-            main_url = "https://www.rusprofile.ru"
+            main_url = self.base_url
 
             if inn:
                 # Поиск по ИНН (оставляем как есть)
@@ -700,221 +617,231 @@ class RusProfileSearcher(BaseSearcher):
 
         return result
 
+    @staticmethod
+    def _reset_result(result):
+        """Очистка результата перед следующей попыткой"""
+        result["found"] = False
+        result["name"] = ""
+        result["address"] = ""
+        result["postal_code"] = ""
+        result["inn"] = ""
+        result["ogrn"] = ""
+        result["name_genitive"] = ""
+
+    def _wait_for_search_page(self, timeout=5):
+        """
+        Ожидание результатов поиска, карточки или сообщения «не найдено»
+
+        Returns:
+            str | None: Тип страницы (см. RusProfileExtractor.page_kind) или
+            None, если страница пустая
+        """
+        return self._wait_for_snapshot(RusProfileExtractor.page_kind, timeout)
+
+    def _search_name_by_url(self, main_url, search_variant):
+        """
+        Поиск по названию через адрес /search?query= (без формы)
+
+        Returns:
+            str | None: Тип страницы (см. RusProfileExtractor.page_kind) или None, если
+            нужен запасной поиск через форму (капча или пустая страница)
+        """
+        self._get(f"{main_url}/search?query={quote(search_variant)}")
+        self.humanizer.human_like_wait(rd.uniform(0.5, 1.0))
+
+        captcha_found = self._handle_rusprofile_captcha()
+        page_kind = self._wait_for_search_page()
+
+        if page_kind is None or (captcha_found and page_kind == "not_found"):
+            return None
+        return page_kind
+
+    def _search_name_by_form(self, main_url, search_variant):
+        """
+        Поиск по названию через форму расширенного поиска (запасной путь)
+
+        Returns:
+            str | None: Тип страницы (см. RusProfileExtractor.page_kind)
+        """
+        self._get(main_url + "/search-advanced")
+        self.humanizer.human_like_wait(rd.uniform(0.5, 1.0))
+
+        self._handle_rusprofile_captcha()
+
+        try:
+            search = self.humanizer.human_like_wait_for_element(
+                self.browser, (By.ID, "advanced-search-query"), 10
+            )
+            if not search:
+                return None
+
+            search.clear()
+            self._enter_query(search, search_variant)
+            self._throttle()
+            search.send_keys(Keys.ENTER)
+            self.humanizer.human_like_wait(rd.uniform(1.0, 2.0))
+
+            self._handle_rusprofile_captcha()
+        except TimeoutException:
+            return None
+
+        return self._wait_for_search_page()
+
     def _search_by_name_with_variants(self, main_url, org_name, result):
         """Поиск по названию с несколькими вариантами"""
-        variants = self.generate_search_variants(org_name)
+        variants = self.ranked_search_variants(org_name)
         original_org_name = org_name  # Сохраняем оригинальное название для валидации
+        # Уже открытые и отклоненные организации (ссылки выдачи и ИНН)
+        rejected = set()
 
         self.log(f"  🔄 Попробую {len(variants)} вариантов поиска:")
-        for i, variant in enumerate(variants, 1):
-            self.log(f"     {i}. «{variant}»")
+        for i, (variant, _, score) in enumerate(variants, 1):
+            self.log(f"     {i}. «{variant}» ({score:.1f})")
 
-        for attempt, variant in enumerate(variants, 1):
-            self.log(f"  🔍 Попытка {attempt}/{len(variants)}: «{variant}»")
+        for attempt, (variant, kind, score) in enumerate(variants, 1):
+            with self.tracer.span(
+                "variant", attempt=attempt, variant=variant, kind=kind, score=round(score, 2), found=False
+            ) as span:
+                self.log(f"  🔍 Попытка {attempt}/{len(variants)}: «{variant}»")
 
-            # Очищаем результат перед каждой попыткой
-            result["found"] = False
-            result["name"] = ""
-            result["address"] = ""
-            result["postal_code"] = ""
-            result["inn"] = ""
-            result["ogrn"] = ""
-            result["name_genitive"] = ""
-
-            try:
-                # Расширенный поиск
-                self.browser.get(main_url + "/search-advanced")
-                self.humanizer.human_like_wait(rd.uniform(0.5, 1.0))
-
-                self._handle_rusprofile_captcha()
+                # Очищаем результат перед каждой попыткой
+                self._reset_result(result)
 
                 try:
-                    search = self.humanizer.human_like_wait_for_element(
-                        self.browser, (By.ID, "advanced-search-query"), 10
+                    found = self._try_search_variant(
+                        main_url, variant, original_org_name, result, rejected, span
                     )
-                    if not search:
-                        # Очищаем результат перед следующей попыткой
-                        result["found"] = False
-                        result["name"] = ""
-                        result["address"] = ""
-                        result["postal_code"] = ""
-                        result["inn"] = ""
-                        result["ogrn"] = ""
-                        result["name_genitive"] = ""
-                        continue
+                except SearchCancelled:
+                    raise
+                except Exception as e:
+                    self.log(f"     ⚠️ Ошибка при попытке {attempt}: {str(e)}")
+                    found = False
 
-                    search.clear()
-                    # Убираем кавычки из варианта для поиска
-                    search_variant = self.remove_quotes_for_search(variant)
-                    self.humanizer.human_like_type(self.browser, search, search_variant)
-                    self.humanizer.random_mouse_movement(self.browser, search)
-                    search.send_keys(Keys.ENTER)
-                    self.humanizer.human_like_wait(rd.uniform(1.0, 2.0))
-
-                    self._handle_rusprofile_captcha()
-                except TimeoutException:
-                    # Очищаем результат перед следующей попыткой
-                    result["found"] = False
-                    result["name"] = ""
-                    result["address"] = ""
-                    result["postal_code"] = ""
-                    result["inn"] = ""
-                    result["ogrn"] = ""
-                    result["name_genitive"] = ""
-                    continue
+                # В статистику - только первая попытка (см. VariantStats)
+                if self.variant_stats is not None and attempt == 1:
+                    self.variant_stats.record(kind, found)
 
-                # Проверяем результаты
-                try:
-                    search_result = self.humanizer.human_like_wait_for_element(
-                        self.browser, (By.CLASS_NAME, "list-element__title"), 5
-                    )
-                    if not search_result:
-                        self.log("     ⚠️ Нет результатов")
-                        # Очищаем результат перед следующей попыткой
-                        result["found"] = False
-                        result["name"] = ""
-                        result["address"] = ""
-                        result["postal_code"] = ""
-                        result["inn"] = ""
-                        result["ogrn"] = ""
-                        result["name_genitive"] = ""
-                        continue
-                except TimeoutException:
-                    self.log("     ⚠️ Нет результатов")
-                    # Очищаем результат перед следующей попыткой
-                    result["found"] = False
-                    result["name"] = ""
-                    result["address"] = ""
-                    result["postal_code"] = ""
-                    result["inn"] = ""
-                    result["ogrn"] = ""
-                    result["name_genitive"] = ""
-                    continue
+                if found:
+                    self.log(f"  ✅ Успешно найдено (вариант {attempt})")
+                    span["found"] = True
+                    return result
 
-                self.humanizer.human_like_scroll(self.browser)
-                soup = BS(self.browser.page_source, "lxml")
-                publications = soup.find_all("a", {"class": "list-element__title"})
-
-                if not publications:
-                    self.log("     ⚠️ Пустой список")
-                    # Очищаем результат перед следующей попыткой
-                    result["found"] = False
-                    result["name"] = ""
-                    result["address"] = ""
-                    result["postal_code"] = ""
-                    result["inn"] = ""
-                    result["ogrn"] = ""
-                    result["name_genitive"] = ""
-                    continue
+                # Очищаем результат на случай, если там остались данные от этой попытки
+                self._reset_result(result)
 
-                self.log(f"     ✓ Найдено: {len(publications)} результат(ов)")
+        self.log("  ❌ Не найдено ни по одному варианту")
+        return result
 
-                # Открываем первый результат
-                link = publications[0]["href"]
-                try:
-                    link_element = self.humanizer.human_like_wait_for_element(
-                        self.browser, (By.XPATH, f"//a[@href='{link}']"), 5
-                    )
-                    if link_element:
-                        self.humanizer.human_like_click(self.browser, link_element)
-                    else:
-                        self.browser.get(main_url + link)
-                except TimeoutException:
-                    self.browser.get(main_url + link)
+    def _try_search_variant(self, main_url, variant, original_org_name, result, rejected, span):
+        """
+        Одна попытка поиска по варианту названия
 
-                self.humanizer.human_like_wait(rd.uniform(1.0, 2.0))
-                self.humanizer.human_like_scroll(self.browser)
+        Returns:
+            bool: True, если найдена организация, прошедшая проверку
+        """
+        # Убираем кавычки из варианта для поиска
+        search_variant = self.remove_quotes_for_search(variant)
+
+        # Сначала прямой адрес поиска, форма расширенного поиска - запасной путь
+        span["route"] = "url"
+        page_kind = self._search_name_by_url(main_url, search_variant)
+        if page_kind is None:
+            self.log("     ↩️ Поиск по адресу не дал страницы, пробую расширенный поиск")
+            span["route"] = "form"
+            page_kind = self._search_name_by_form(main_url, search_variant)
+
+        if page_kind in (None, "not_found"):
+            self.log("     ⚠️ Нет результатов")
+            return False
 
-                # Проверяем, загрузилась ли страница организации
-                if self._extract_organization_data(result):
-                    # Проверяем валидность найденной организации (используем оригинальное название)
-                    if self._validate_organization_result(original_org_name, result):
-                        self.log(f"  ✅ Успешно найдено (вариант {attempt})")
-                        return result
-                    else:
-                        self.log("     ⚠️ Найденная организация не прошла проверку валидности, продолжаю поиск...")
-                        # Полностью очищаем результат для следующей попытки
-                        result["found"] = False
-                        result["name"] = ""
-                        result["address"] = ""
-                        result["postal_code"] = ""
-                        result["inn"] = ""
-                        result["ogrn"] = ""
-                        result["name_genitive"] = ""
-                        continue
+        if page_kind == "results":
+            self.humanizer.human_like_scroll(self.browser)
+            publications = RusProfileExtractor.result_links(self._snapshot())
+
+            if not publications:
+                self.log("     ⚠️ Пустой список")
+                return False
+
+            self.log(f"     ✓ Найдено: {len(publications)} результат(ов)")
+
+            # Открываем первый результат, который еще не отклоняли
+            link = next((href for href in publications if href not in rejected), None)
+            if link is None:
+                self.log("     ⏭️ Все организации выдачи уже проверены и отклонены")
+                return False
+            rejected.add(link)
+
+            try:
+                link_element = self.humanizer.human_like_wait_for_element(
+                    self.browser, (By.XPATH, f"//a[@href='{link}']"), 5
+                )
+                if link_element:
+                    self._throttle()
+                    self.humanizer.human_like_click(self.browser, link_element)
                 else:
-                    self.log("     ⚠️ Не удалось извлечь данные")
-                    # Очищаем результат на случай, если там остались данные от предыдущей попытки
-                    result["found"] = False
-                    result["name"] = ""
-                    result["address"] = ""
-                    result["postal_code"] = ""
-                    result["inn"] = ""
-                    result["ogrn"] = ""
-                    result["name_genitive"] = ""
-                    continue
+                    self._get(main_url + link)
+            except TimeoutException:
+                self._get(main_url + link)
 
-            except Exception as e:
-                self.log(f"     ⚠️ Ошибка при попытке {attempt}: {str(e)}")
-                # Очищаем результат на случай ошибки
-                result["found"] = False
-                result["name"] = ""
-                result["address"] = ""
-                result["postal_code"] = ""
-                result["inn"] = ""
-                result["ogrn"] = ""
-                result["name_genitive"] = ""
-                continue
+            self.humanizer.human_like_wait(rd.uniform(1.0, 2.0))
+        else:
+            self.log("     ✓ Открыта карточка организации")
 
-        self.log("  ❌ Не найдено ни по одному варианту")
-        return result
+        self.humanizer.human_like_scroll(self.browser)
+
+        # Проверяем, загрузилась ли страница организации
+        if not self._extract_organization_data(result):
+            self.log("     ⚠️ Не удалось извлечь данные")
+            return False
+
+        if result.get("inn") and result["inn"] in rejected:
+            self.log("     ⏭️ Эта организация уже отклонена")
+            return False
+
+        # Проверяем валидность найденной организации (используем оригинальное название)
+        if not self._validate_organization_result(original_org_name, result):
+            self.log("     ⚠️ Найденная организация не прошла проверку валидности, продолжаю поиск...")
+            if result.get("inn"):
+                rejected.add(result["inn"])
+            return False
+
+        return True
 
     def _search_by_inn(self, main_url, inn, result):
         """Поиск по ИНН (исходная логика)"""
-        self.browser.get(f"{main_url}/search?query={inn}")
+        self._get(f"{main_url}/search?query={inn}")
         self.humanizer.human_like_wait(rd.uniform(1.5, 2.5))
 
         self._handle_rusprofile_captcha()
 
+        page_kind = self._wait_for_search_page(5)
+
         # Проверяем, открылась ли сразу страница организации
-        try:
-            name_elem = self.humanizer.human_like_wait_for_element(
-                self.browser, (By.ID, "clip_name-long"), 3
-            )
-            if name_elem:
-                self.log("  ✓ Организация найдена сразу по ИНН")
-                self.humanizer.human_like_scroll(self.browser)
-                if self._extract_organization_data(result):
-                    # Проверяем валидность (для поиска по ИНН не проверяем совпадение ключевых слов)
-                    if self._validate_organization_result("", result, check_keyword_match=False):
-                        return result
-        except TimeoutException:
-            pass
+        if page_kind == "company":
+            self.log("  ✓ Организация найдена сразу по ИНН")
+            self.humanizer.human_like_scroll(self.browser)
+            if self._extract_organization_data(result):
+                # Проверяем валидность (для поиска по ИНН не проверяем совпадение ключевых слов)
+                if self._validate_organization_result("", result, check_keyword_match=False):
+                    return result
 
         # Если не открылась сразу, ищем в списке результатов
-        try:
-            search_result = self.humanizer.human_like_wait_for_element(
-                self.browser, (By.CLASS_NAME, "list-element__title"), 5
-            )
-            if search_result:
+        elif page_kind == "results":
+            self.humanizer.human_like_scroll(self.browser)
+            publications = RusProfileExtractor.result_links(self._snapshot())
+
+            if publications:
+                self.log(f"  ✓ Найдено результатов: {len(publications)}")
+                link = publications[0]
+                self._get(main_url + link)
+                self.humanizer.human_like_wait(rd.uniform(1.0, 2.0))
+                self._handle_rusprofile_captcha()
                 self.humanizer.human_like_scroll(self.browser)
-                soup = BS(self.browser.page_source, "lxml")
-                publications = soup.find_all("a", {"class": "list-element__title"})
-
-                if publications:
-                    self.log(f"  ✓ Найдено результатов: {len(publications)}")
-                    link = publications[0]["href"]
-                    self.browser.get(main_url + link)
-                    self.humanizer.human_like_wait(rd.uniform(1.0, 2.0))
-                    self._handle_rusprofile_captcha()
-                    self.humanizer.human_like_scroll(self.browser)
 
-                    if self._extract_organization_data(result):
-                        # Проверяем валидность (для поиска по ИНН проверка менее строгая)
-                        if self._validate_organization_result("", result):
-                            return result
-        except TimeoutException:
-            pass
+                if self._extract_organization_data(result):
+                    # Проверяем валидность (для поиска по ИНН проверка менее строгая)
+                    if self._validate_organization_result("", result):
+                        return result
 
         self.log("  ⚠️ Нет результатов")
         return result
@@ -922,35 +849,13 @@ class RusProfileSearcher(BaseSearcher):
     def _extract_organization_data(self, result):
         """Извлекает данные организации со страницы"""
         try:
-            name_elem = self.humanizer.human_like_wait_for_element(
-                self.browser, (By.ID, "clip_name-long"), 10
-            )
-            address_elem = self.humanizer.human_like_wait_for_element(
-                self.browser, (By.ID, "clip_address"), 10
-            )
-
-            if not name_elem or not address_elem:
+            record = self._wait_for_snapshot(RusProfileExtractor.company, 10)
+            if record is None:
                 return False
 
-            result["name"] = name_elem.text.strip()
+            record.apply_to(result)
             result["name"] = self.normalize_organization_name(result["name"])
             result["name_genitive"] = self.get_genitive_case_pymorphy(result["name"])
-            result["address"] = address_elem.text.strip()
-
-            # Извлекаем почтовый индекс
-            postal_match = re.search(r"\b(\d{6})\b", result["address"])
-            if postal_match:
-                result["postal_code"] = postal_match.group(1)
-
-            # Извлекаем ИНН и ОГРН
-            page_text = self.browser.find_element(By.TAG_NAME, "body").text
-            inn_match = re.search(r"ИНН[:\s]*(\d{10,12})", page_text)
-            ogrn_match = re.search(r"ОГРН[:\s]*(\d{13,15})", page_text)
-
-            if inn_match:
-                result["inn"] = inn_match.group(1)
-            if ogrn_match:
-                result["ogrn"] = ogrn_match.group(1)
 
             result["found"] = True
             self.log(f"  ✅ ИНН: {result.get('inn')}  ОГРН: {result.get('ogrn')}")
@@ -959,8 +864,6 @@ class RusProfileSearcher(BaseSearcher):
 
             return True
 
-        except TimeoutException:
-            return False
         except Exception as e:
             self.log(f"  ⚠️ Ошибка извлечения данных: {str(e)}")
             return False
@@ -969,9 +872,12 @@ class RusProfileSearcher(BaseSearcher):
 class KonturFokusSearcher(BaseSearcher):
     """Класс для поиска организаций в Контур Фокус"""
 
-    def search(self, org_name=None, inn=None):
-        """Поиск в Контур Фокус по названию или ИНН"""
-        result = {
+    BASE_URL = "https://focus.kontur.ru"
+    RATE_DOMAIN = "kontur"
+
+    @staticmethod
+    def _empty_result():
+        return {
             "found": False,
             "name": "",
             "address": "",
@@ -981,96 +887,73 @@ class KonturFokusSearcher(BaseSearcher):
             "name_genitive": "",
         }
 
+    def _search_query(self, org_name=None, inn=None):
+        """Текст запроса: ИНН или название без кавычек"""
+        if inn:
+            return inn
+        if not org_name:
+            return ""
+        # Убираем кавычки из запроса для поиска
+        return self.remove_quotes_for_search(org_name)
+
+    def search(self, org_name=None, inn=None):
+        """Поиск в Контур Фокус по названию или ИНН"""
+        result = self._empty_result()
+
         try:
-            query = inn if inn else org_name
+            query = self._search_query(org_name, inn)
             if not query:
                 return result
 
-            # Убираем кавычки из запроса для поиска
-            if not inn:
-                query = self.remove_quotes_for_search(query)
-
-            url = f"https://focus.kontur.ru/search?country=RU&query={query}"
-            self.browser.get(url)
+            url = f"{self.base_url}/search?country=RU&query={query}"
+            self._get(url)
             self.humanizer.human_like_wait(rd.uniform(0.5, 1.0))
 
-            try:
-                self.humanizer.human_like_wait_for_element(
-                    self.browser, (By.XPATH, "//*[contains(text(), 'ИНН')]"), 5
-                )
-                self.humanizer.human_like_wait(rd.uniform(1, 2))
-                self.humanizer.human_like_scroll(self.browser)
+            # Недогруженную страницу не разбираем: без выдачи результат пустой
+            loaded = self._wait_for_snapshot(
+                lambda snapshot: (
+                    KonturFokusExtractor.has_results(snapshot)
+                    or KonturFokusExtractor.is_not_found(snapshot)
+                ),
+                5,
+            )
+            if not loaded:
+                self.log("  ⏱️ Timeout")
+                return result
 
-                page_text = self.browser.find_element(By.TAG_NAME, "body").text
+            self.humanizer.human_like_wait(rd.uniform(1, 2))
+            self.humanizer.human_like_scroll(self.browser)
 
-                if "не найдено" in page_text:
-                    self.log("  ⚠️ Нет результатов")
-                    return result
+            return self._apply_snapshot(self._snapshot(), result)
 
-                inn_match = re.search(r"ИНН[:\s]*(\d{10,12})", page_text)
-                if inn_match:
-                    result["inn"] = inn_match.group(1)
-
-                ogrn_match = re.search(r"ОГРН[:\s]*(\d{13,15})", page_text)
-                if ogrn_match:
-                    result["ogrn"] = ogrn_match.group(1)
-
-                # Поиск полного названия
-                lines = page_text.split("\n")
-                for line in lines:
-                    if any(
-                        word in line.upper()
-                        for word in [
-                            "АВТОНОМНАЯ",
-                            "ГОСУДАРСТВЕННАЯ",
-                            "МУНИЦИПАЛЬНАЯ",
-                            "ОБЩЕОБРАЗОВАТЕЛЬНАЯ",
-                            "НЕКОММЕРЧЕСКАЯ",
-                            "БЮДЖЕТНАЯ",
-                            "АВТОНОМНОЕ",
-                            "ГОСУДАРСТВЕННОЕ",
-                            "МУНИЦИПАЛЬНОЕ",
-                            "ОБЩЕОБРАЗОВАТЕЛЬНОЕ",
-                            "НЕКОММЕРЧЕСКОЕ",
-                            "БЮДЖЕТНОЕ",
-                        ]
-                    ):
-                        if len(line) > 10 and "ИНН" not in line:
-                            result["name"] = line.strip()
-                            result["name_genitive"] = self.get_genitive_case_pymorphy(
-                                result["name"]
-                            )
-                            break
+        except Exception as e:
+            self.log(f"  ⚠️ Ошибка: {str(e)}")
 
-                # Поиск адреса
-                address_match = re.search(
-                    r"(\d{6})[,\s]+([^\n]+(?:обл|край|респ|г\.|г |область|севастополь)[^\n]+)",
-                    page_text,
-                    re.IGNORECASE,
-                )
-                if address_match:
-                    result["address"] = (
-                        address_match.group(1) + ", " + address_match.group(2).strip()
-                    )
-                    result["postal_code"] = address_match.group(1)
+        return result
 
-                if result["inn"] or result["name"]:
-                    result["found"] = True
-                    self.log(f"  ✅ ИНН: {result['inn']}, ОГРН: {result['ogrn']}")
+    def _apply_snapshot(self, snapshot, result):
+        """Заполнение результата первой организацией выдачи"""
+        if KonturFokusExtractor.is_not_found(snapshot):
+            self.log("  ⚠️ Нет результатов")
+            return result
 
-                    if result["name"]:
-                        self.log(f"  📝 {result['name'][:70]}...")
-                    else:
-                        self.log("  ⚠️ Название не найдено")
+        record = KonturFokusExtractor.first_organization(snapshot)
+        if record is not None:
+            record.apply_to(result)
+            if result["name"]:
+                result["name_genitive"] = self.get_genitive_case_pymorphy(result["name"])
 
-                    if result["address"]:
-                        self.log(f"  📍 {result['address'][:70]}...")
+        if result["inn"] or result["name"]:
+            result["found"] = True
+            self.log(f"  ✅ ИНН: {result['inn']}, ОГРН: {result['ogrn']}")
 
-            except TimeoutException:
-                self.log("  ⏱️ Timeout")
+            if result["name"]:
+                self.log(f"  📝 {result['name'][:70]}...")
+            else:
+                self.log("  ⚠️ Название не найдено")
 
-        except Exception as e:
-            self.log(f"  ⚠️ Ошибка: {str(e)}")
+            if result["address"]:
+                self.log(f"  📍 {result['address'][:70]}...")
 
         return result
 
@@ -1078,46 +961,28 @@ class KonturFokusSearcher(BaseSearcher):
 class EgrulSearcher(BaseSearcher):
     """Класс для поиска организаций в ЕГРЮЛ"""
 
-    def _load_standardization_rules(self):
-        """Загрузка правил стандартизации"""
-        if hasattr(self, "_std_rules"):
-            return self._std_rules
-
-        try:
-            rules_path = os.path.join(
-                os.path.dirname(__file__), "..", "..", "standardization_rules.json"
-            )
-            with open(rules_path, "r", encoding="utf-8") as f:
-                self._std_rules = json.load(f)
-                return self._std_rules
-        except Exception as e:
-            self.log(f"  ⚠️ Не удалось загрузить standardization_rules.json: {e}")
-            # Возвращаем минимальный набор правил
-            self._std_rules = {"abbreviations": {}, "type_synonyms": {}}
-            return self._std_rules
+    BASE_URL = "https://egrul.nalog.ru"
+    RATE_DOMAIN = "egrul"
+    # ЕГРЮЛ не требует имитации набора
+    DIRECT_INPUT = True
 
     def _expand_abbreviations(self, text):
         """Расширяет аббревиатуры в тексте для лучшего сопоставления"""
-        rules = self._load_standardization_rules()
+        rules = self.rules
+        text_lower = text.lower()
 
-        expanded_variants = [text.lower()]
+        expanded_variants = [text_lower]
 
         # Добавляем варианты с расшифрованными аббревиатурами
-        for abbr, full_form in rules.get("abbreviations", {}).items():
-            if abbr.lower() in text.lower():
-                variant = re.sub(
-                    r"\b" + re.escape(abbr) + r"\b",
-                    full_form,
-                    text,
-                    flags=re.IGNORECASE,
-                )
+        for abbr, full_form in rules.abbreviations.items():
+            if abbr.lower() in text_lower:
+                variant = rules.abbreviation_word_regexes[abbr].sub(full_form, text)
                 expanded_variants.append(variant.lower())
 
         # Добавляем синонимы типов учреждений
-        for type_name, synonyms in rules.get("type_synonyms", {}).items():
-            if type_name.lower() in text.lower():
-                for synonym in synonyms:
-                    expanded_variants.append(synonym.lower())
+        for type_name, synonyms in rules.type_synonyms_lower:
+            if type_name in text_lower:
+                expanded_variants.extend(synonyms)
 
         return expanded_variants
 
@@ -1128,31 +993,10 @@ class EgrulSearcher(BaseSearcher):
         Использует standardization_rules.json для умного сопоставления
         """
 
-        rules = self._load_standardization_rules()
-
-        # Создаем набор образовательных ключевых слов из правил
-        edu_keywords = set()
-
-        # Добавляем все аббревиатуры
-        for abbr in rules.get("abbreviations", {}).keys():
-            edu_keywords.add(abbr.lower())
-
-        # Добавляем распространенные слова
-        edu_keywords.update(
-            [
-                "школа",
-                "сош",
-                "лицей",
-                "гимназия",
-                "колледж",
-                "университет",
-                "институт",
-                "училище",
-                "образовательн",
-                "учреждение",
-                "детский сад",
-            ]
-        )
+        rules = self.rules
+
+        # Образовательные ключевые слова: все аббревиатуры и распространенные слова
+        edu_keywords = rules.egrul_edu_keywords
 
         # Негативные ключевые слова
         negative_keywords = [
@@ -1172,6 +1016,7 @@ class EgrulSearcher(BaseSearcher):
 
         # Извлекаем числа из запроса
         query_numbers = set(re.findall(r"\b\d+\b", query))
+        query_lower = query.lower()
 
         # Получаем расширенные варианты запроса
         query_variants = self._expand_abbreviations(query)
@@ -1211,16 +1056,14 @@ class EgrulSearcher(BaseSearcher):
                     score += len(variant_words.intersection(result_words)) * 3
 
                 # Бонус за совпадение аббревиатур
-                for abbr in rules.get("abbreviations", {}).keys():
-                    if abbr.lower() in query.lower() and abbr.lower() in text:
+                for abbr in rules.abbreviations_lower:
+                    if abbr in query_lower and abbr in text:
                         score += 8
 
                 # Бонус за точное совпадение типа учреждения
-                for type_name, synonyms in rules.get("type_synonyms", {}).items():
-                    if type_name.lower() in query.lower():
-                        if type_name.lower() in text or any(
-                            syn.lower() in text for syn in synonyms
-                        ):
+                for type_name, synonyms in rules.type_synonyms_lower:
+                    if type_name in query_lower:
+                        if type_name in text or any(syn in text for syn in synonyms):
                             score += 10
 
                 # Штраф за несовпадение региона (если регион указан)
@@ -1233,7 +1076,7 @@ class EgrulSearcher(BaseSearcher):
                     "одинцов",
                 }
                 for region in query_region_words:
-                    if region in query.lower() and region not in text:
+                    if region in query_lower and region not in text:
                         score -= 5
 
                 candidates.append((score, res, text))
@@ -1262,8 +1105,8 @@ class EgrulSearcher(BaseSearcher):
         }
 
         try:
-            url = "https://egrul.nalog.ru/"
-            self.browser.get(url)
+            url = self.base_url + "/"
+            self._get(url)
             self.humanizer.human_like_wait(rd.uniform(0.5, 1.0))
 
             try:
@@ -1276,21 +1119,16 @@ class EgrulSearcher(BaseSearcher):
 
                 # Убираем кавычки из названия для поиска
                 search_org_name = self.remove_quotes_for_search(org_name)
-                self.humanizer.human_like_type(self.browser, search_field, search_org_name)
-                self.humanizer.random_mouse_movement(self.browser, search_field)
+                self._enter_query(search_field, search_org_name)
+                self._throttle()
                 search_field.send_keys(Keys.RETURN)
 
-                self.humanizer.human_like_wait_for_element(
-                    self.browser, (By.CLASS_NAME, "res-text"), 10
-                )
+                # Все результаты разбираются из одного снимка страницы
+                all_results = self._wait_for_snapshot(EgrulExtractor.results, 10) or []
                 self.humanizer.human_like_wait(rd.uniform(1.0, 1.5))
                 self.humanizer.human_like_scroll(self.browser)
 
-                # Ищем все результаты
                 try:
-                    all_results = self.browser.find_elements(
-                        By.CSS_SELECTOR, ".res-text"
-                    )
 
                     if not all_results:
                         self.log("  ⚠️ Нет результатов")
@@ -1308,40 +1146,23 @@ class EgrulSearcher(BaseSearcher):
                         return result
 
                     # Кликаем на лучшее совпадение
-                    result_link = best_match.find_element(By.TAG_NAME, "a")
-                    self.log(f"  ✓ Выбрано: {result_link.text[:50]}...")
+                    result_link = self.browser.find_elements(By.CSS_SELECTOR, ".res-text")[
+                        best_match.index
+                    ].find_element(By.TAG_NAME, "a")
+                    self.log(f"  ✓ Выбрано: {best_match.link_text[:50]}...")
 
+                    self._throttle()
                     self.humanizer.human_like_click(self.browser, result_link)
                     self.humanizer.human_like_wait(rd.uniform(1.5, 2.5))
                     self.humanizer.human_like_scroll(self.browser)
 
-                    detail_text = self.browser.find_element(By.TAG_NAME, "body").text
-
                     # Извлекаем данные
-                    inn_match = re.search(r"ИНН[:\s]*(\d{10,12})", detail_text)
-                    if inn_match:
-                        result["inn"] = inn_match.group(1)
-
-                    ogrn_match = re.search(r"ОГРН[:\s]*(\d{13,15})", detail_text)
-                    if ogrn_match:
-                        result["ogrn"] = ogrn_match.group(1)
-
-                    name_match = re.search(
-                        r"Полное наименование[:\s]*([^\n]+)", detail_text
-                    )
-                    if name_match:
-                        result["name"] = name_match.group(1).strip()
+                    EgrulExtractor.detail(self._snapshot()).apply_to(result)
+                    if result.get("name"):
                         result["name_genitive"] = self.get_genitive_case_pymorphy(
                             result["name"]
                         )
 
-                    address_match = re.search(r"Адрес[:\s]*([^\n]+)", detail_text)
-                    if address_match:
-                        result["address"] = address_match.group(1).strip()
-                        postal_match = re.search(r"\b(\d{6})\b", result["address"])
-                        if postal_match:
-                            result["postal_code"] = postal_match.group(1)
-
                     # Если есть полные данные
                     if result.get("name") and result.get("address"):
                         result["found"] = True
@@ -1369,9 +1190,68 @@ class EgrulSearcher(BaseSearcher):
         return result
 
 
+class SearchLane:
+    """
+    Источник со своим браузером для параллельного поиска (fan_out)
+
+    Поиск идет в потоке пула; лог попытки копится в буфере и выводится,
+    только если результат источника понадобился для ответа.
+    """
+
+    def __init__(self, name, title, humanizer):
+        self.name = name  # Ключ источника в base_urls/direct_input
+        self.title = title  # Название источника в логе и результате
+        # Своя хуманизация: домен текущей страницы у каждого браузера свой
+        self.humanizer = humanizer
+        self.manager = None  # BrowserManager браузера источника
+        self.searcher = None
+        self.future = None  # Текущий или последний поиск
+
+        # Итог последнего поиска
+        self.result = {"found": False}
+        self.duration = 0.0
+        self.commands = 0
+        self.logs = []
+
+    def run(self, org_name, cancel_event, tracer):
+        """Поиск по названию (выполняется в потоке пула)"""
+        logs = []
+        self.searcher.log_callback = logs.append
+        self.searcher.cancel_event = cancel_event
+        browser = self.searcher.browser
+        commands_before = getattr(browser, "command_count", 0)
+        started = time.perf_counter()
+
+        result = {"found": False}
+        with tracer.span("searcher", source=self.title, fan_out=True) as span:
+            try:
+                result = self.searcher.search(org_name)
+            except Exception as e:
+                logs.append(f"  ⚠️ Ошибка: {str(e)}")
+            span["cancelled"] = cancel_event.is_set()
+            span["webdriver_commands"] = getattr(browser, "command_count", 0) - commands_before
+
+        self.result = result
+        self.duration = time.perf_counter() - started
+        self.commands = getattr(browser, "command_count", 0) - commands_before
+        self.logs = logs
+
+    def wait(self):
+        """Ожидание завершения текущего поиска (браузер снова свободен)"""
+        if self.future is not None:
+            self.future.result()
+
+
 class OrganizationParser:
     """Класс для парсинга информации об организациях"""
 
+    # Источники, которые в режиме fan_out ищут в своих браузерах (в порядке приоритета);
+    # RusProfile ищет в основном браузере
+    FAN_OUT_SOURCES = (
+        ("kontur", "Контур Фокус"),
+        ("egrul", "ЕГРЮЛ"),
+    )
+
     def __init__(
         self,
         log_callback=None,
@@ -1381,13 +1261,59 @@ class OrganizationParser:
         use_recaptcha_solver=False,
         recaptcha_api_key=None,
         humanization_mode="normal",
+        result_cache=None,
+        base_urls=None,
+        tracer=None,
+        direct_input=None,
+        variant_budget=None,
+        block_resources=False,
+        measure_pages=False,
+        browser_pool=None,
+        max_pages=None,
+        max_rss_mb=None,
+        fan_out=False,
+        egrul_http=False,
+        kontur_http=False,
     ):
         self.log_callback = log_callback
         self.browser = None
-        self.humanizer = Humanization(mode=humanization_mode)
+        self.browser_manager = None  # Жизненный цикл браузера (BrowserManager)
+        # Теплые браузеры между запусками (BrowserPool); без пула браузер закрывается
+        self.browser_pool = browser_pool
+        # Пересоздание браузера: каждые max_pages страниц или при RSS Chrome > max_rss_mb
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        # Трассировка этапов поиска (без файла интервалы только суммируются)
+        self.tracer = tracer or Tracer()
+        self.humanizer = Humanization(mode=humanization_mode, tracer=self.tracer)
         self.use_gigachat = use_gigachat
         self.gigachat_api = gigachat_api
         self.gigachat_retries = gigachat_retries
+        self.result_cache = result_cache  # Постоянный кэш результатов (ResultCache)
+        # Переопределение адресов источников: {"rusprofile": ..., "kontur": ..., "egrul": ...}
+        self.base_urls = dict(base_urls or {})
+        # Прямой ввод запроса по сеарчерам: {"rusprofile": bool, "egrul": bool}
+        self.direct_input = dict(direct_input or {})
+        self._search_commands = {}  # Команды WebDriver текущего поиска по источникам
+        # Бюджет вариантов названия для RusProfile (None - VariantRanker.DEFAULT_BUDGET)
+        self.variant_budget = variant_budget
+        self.variant_stats = get_variant_stats()
+        # Фильтр картинок/медиа/шрифтов/трекеров и загрузка страниц без ожидания ресурсов
+        self.block_resources = block_resources
+        # Учет байтов и времени загрузки страниц (лишняя команда WebDriver на страницу)
+        self.measure_pages = measure_pages
+        # Параллельный поиск по названию во всех источниках (по браузеру на источник)
+        self.fan_out = fan_out
+        self.fan_out_lanes = []
+        self.fan_out_rows = 0  # Строк, прошедших параллельный поиск
+        self.fan_out_saved_seconds = 0.0  # Сэкономлено относительно последовательного каскада
+        self._fan_out_executor = None
+        self._fan_out_cancel = None  # Отмена поисков текущей строки (threading.Event)
+        # Поиск в ЕГРЮЛ по HTTP без браузера (EgrulHttpSearcher)
+        self.egrul_http = egrul_http
+        # Контур Фокус сначала по HTTP, браузер - запасной путь (KonturFokusHttpSearcher)
+        self.kontur_http = kontur_http
+        self.kontur_paths = None  # Поисков по HTTP и через браузер (FetchPathStats)
 
         self.use_recaptcha_solver = use_recaptcha_solver
         self.recaptcha_solver = None
@@ -1412,8 +1338,8 @@ class OrganizationParser:
         else:
             print(message)
 
-    def init_browser(self):
-        """Инициализация браузера Chrome"""
+    def _chrome_options(self, profile_dir):
+        """Настройки Chrome с профилем в profile_dir"""
         chrome_options = wd.ChromeOptions()
         chrome_options.add_argument("--window-size=1920,1080")
         chrome_options.add_argument("--start-maximized")
@@ -1426,22 +1352,137 @@ class OrganizationParser:
         chrome_options.add_argument("--log-level=3")
         chrome_options.add_argument("--disable-blink-features=AutomationControlled")
         chrome_options.add_argument("--disable-features=VizDisplayCompositor")
-        chrome_options.add_argument(f"--user-data-dir={tempfile.mkdtemp()}")
+        chrome_options.add_argument(f"--user-data-dir={profile_dir}")
         chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
         chrome_options.add_experimental_option("useAutomationExtension", False)
+        if self.block_resources:
+            # browser.get возвращается после DOMContentLoaded, не дожидаясь картинок и скриптов
+            chrome_options.page_load_strategy = "eager"
         with open("user_agents.json", "r", encoding="utf-8") as f:
             user_agents = json.load(f)
         selected_user_agent = rd.choice(user_agents)
         chrome_options.add_argument(f"--user-agent={selected_user_agent}")
+        return chrome_options
+
+    def _create_browser(self, profile_dir):
+        """Новый Chrome (фабрика для BrowserManager)"""
+        browser = CountingChrome(options=self._chrome_options(profile_dir))
+        browser.execute_script(
+            "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
+        )
+        return browser
 
+    def _browser_key(self):
+        """Настройки, при совпадении которых браузер из пула можно переиспользовать"""
+        return (config.UserAppSettings.is_dev_mode, self.block_resources)
+
+    def init_browser(self):
+        """Инициализация браузера Chrome (теплый из пула или новый)"""
         self.log("\n🌐 ЭТАП 2: Поиск в базах данных")
         self.log("=" * 60)
+
+        self.browser_manager = self._start_browser_manager(self._browser_key(), self._bind_browser)
+
+        if self.fan_out:
+            self._init_fan_out_lanes()
+
+    def _start_browser_manager(self, key, on_new_browser):
+        """Браузер с настройками key: теплый из пула или новый"""
+        manager = self.browser_pool.acquire(key) if self.browser_pool else None
+        if manager is not None:
+            self.log("♻️ Использую уже запущенный браузер")
+            manager.log_callback = self.log
+            manager.on_new_browser = on_new_browser
+            on_new_browser(manager.browser)
+            return manager
+
         self.log("🚀 Запуск браузера...")
-        self.browser = wd.Chrome(options=chrome_options)
-        self.browser.execute_script(
-            "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
+        manager = BrowserManager(
+            self._create_browser,
+            key=key,
+            log_callback=self.log,
+            max_pages=self.max_pages,
+            max_rss_mb=self.max_rss_mb,
+            on_new_browser=on_new_browser,
         )
+        manager.start()
         self.humanizer.human_like_wait(rd.uniform(0.5, 1.5))
+        return manager
+
+    def _init_fan_out_lanes(self):
+        """Отдельные браузеры для источников параллельного поиска"""
+        self.fan_out_lanes = []
+        for name, title in self.FAN_OUT_SOURCES:
+            lane = SearchLane(name, title, Humanization(mode=self.humanizer.mode, tracer=self.tracer))
+            self.fan_out_lanes.append(lane)
+
+            # Источнику, который ищет по HTTP, отдельный браузер не нужен
+            lane.searcher = self._create_http_searcher(name)
+            if lane.searcher is not None:
+                continue
+
+            lane.manager = self._start_browser_manager(
+                self._browser_key() + (name,),
+                partial(self._bind_lane_browser, lane),
+            )
+
+        self._fan_out_executor = ThreadPoolExecutor(
+            max_workers=len(self.fan_out_lanes), thread_name_prefix="fan_out"
+        )
+        browsers = 1 + sum(1 for lane in self.fan_out_lanes if lane.manager is not None)
+        self.log(
+            f"⚡ Параллельный поиск: {len(self.fan_out_lanes) + 1} источника, "
+            f"браузеров на поток: {browsers}"
+        )
+
+    def _create_http_searcher(self, name):
+        """
+        Сеарчер источника, работающий без браузера, если он включен
+
+        Returns:
+            BaseSearcher | None
+        """
+        # Импорт здесь: http_searchers сам импортирует сеарчеры из этого модуля
+        from .http_searchers import EgrulHttpSearcher
+
+        if name == "egrul" and self.egrul_http:
+            return EgrulHttpSearcher(
+                log_callback=self.log_callback,
+                base_url=self.base_urls.get("egrul"),
+                tracer=self.tracer,
+            )
+        return None
+
+    def _create_searcher(self, name, browser, humanizer, log_callback=None):
+        """Сеарчер Контур Фокуса или ЕГРЮЛ для браузера browser"""
+        from .http_searchers import FetchPathStats, KonturFokusHttpSearcher
+
+        searcher = self._create_http_searcher(name)
+        if searcher is not None:
+            return searcher
+
+        kwargs = {
+            "browser": browser,
+            "humanizer": humanizer,
+            "log_callback": log_callback,
+            "base_url": self.base_urls.get(name),
+            "tracer": self.tracer,
+            "direct_input": self.direct_input.get(name),
+        }
+        if name == "egrul":
+            return EgrulSearcher(**kwargs)
+        if self.kontur_http:
+            if self.kontur_paths is None:
+                self.kontur_paths = FetchPathStats()
+            return KonturFokusHttpSearcher(path_stats=self.kontur_paths, **kwargs)
+        return KonturFokusSearcher(**kwargs)
+
+    def _bind_browser(self, browser):
+        """Привязка парсера и сеарчеров к браузеру (при запуске и после перезапуска)"""
+        self.browser = browser
+        self.browser.measure_pages = self.measure_pages
+        if self.block_resources:
+            self.apply_resource_filter()
 
         # Инициализируем сеарчеры после создания браузера
         self.rusprofile_searcher = RusProfileSearcher(
@@ -1450,27 +1491,188 @@ class OrganizationParser:
             log_callback=self.log_callback,
             use_recaptcha_solver=self.use_recaptcha_solver,
             recaptcha_solver=self.recaptcha_solver,
+            base_url=self.base_urls.get("rusprofile"),
+            tracer=self.tracer,
+            direct_input=self.direct_input.get("rusprofile"),
+            variant_budget=self.variant_budget,
+            variant_stats=self.variant_stats,
         )
-        self.kontur_fokus_searcher = KonturFokusSearcher(
-            browser=self.browser,
-            humanizer=self.humanizer,
-            log_callback=self.log_callback,
+        self.kontur_fokus_searcher = self._create_searcher(
+            "kontur", self.browser, self.humanizer, self.log_callback
         )
-        self.egrul_searcher = EgrulSearcher(
-            browser=self.browser,
-            humanizer=self.humanizer,
-            log_callback=self.log_callback,
+        self.egrul_searcher = self._create_searcher(
+            "egrul", self.browser, self.humanizer, self.log_callback
         )
 
-    def close_browser(self):
-        """Закрытие браузера"""
-        if self.browser:
-            self.browser.quit()
-            self.log("✅ Браузер закрыт")
+    def _bind_lane_browser(self, lane, browser):
+        """Привязка сеарчера источника параллельного поиска к его браузеру"""
+        browser.measure_pages = self.measure_pages
+        if self.block_resources:
+            self.apply_resource_filter(browser)
+
+        lane.searcher = self._create_searcher(lane.name, browser, lane.humanizer)
+
+    def apply_resource_filter(self, browser=None):
+        """Блокировка картинок, медиа, шрифтов и трекеров на сайтах источников"""
+        site_urls = [
+            self.base_urls.get("rusprofile") or RusProfileSearcher.BASE_URL,
+            self.base_urls.get("kontur") or KonturFokusSearcher.BASE_URL,
+            self.base_urls.get("egrul") or EgrulSearcher.BASE_URL,
+        ]
+        try:
+            count = ResourceFilter(site_urls).apply(browser or self.browser)
+            self.log(f"🧱 Фильтр ресурсов: картинки, медиа, шрифты и трекеры ({count} шаблонов)")
+        except Exception as e:
+            self.log(f"⚠️ Не удалось включить фильтр ресурсов: {e}")
+
+    def close_browser(self, keep_warm=True):
+        """
+        Закрытие браузера (при наличии пула - возврат в пул теплым)
+
+        Args:
+            keep_warm: False - закрыть и при наличии пула. Так закрываются
+                       браузеры, в которых еще может идти поиск (остановка
+                       парсинга из другого потока): в пуле их взял бы
+                       следующий файл, пока старый воркер ими управляет.
+        """
+        self.variant_stats.save()
+        self._close_fan_out_lanes(keep_warm)
+
+        manager, self.browser_manager = self.browser_manager, None
+        if manager is None:
+            return
+
+        if keep_warm and self.browser_pool and self.browser_pool.release(manager):
+            self.log("♻️ Браузер оставлен запущенным для следующего файла")
+            return
+
+        manager.shutdown()
+        self.log("✅ Браузер закрыт")
+
+    def _close_fan_out_lanes(self, keep_warm=True):
+        """Отмена поисков и закрытие браузеров параллельного поиска"""
+        lanes, self.fan_out_lanes = self.fan_out_lanes, []
+        executor, self._fan_out_executor = self._fan_out_executor, None
+        if self._fan_out_cancel is not None:
+            self._fan_out_cancel.set()
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+        for lane in lanes:
+            manager, lane.manager = lane.manager, None
+            if manager is None:
+                continue
+            # Браузер, в котором еще идет отмененный поиск, в пул не возвращается
+            busy = lane.future is not None and not lane.future.done()
+            if busy or not (keep_warm and self.browser_pool and self.browser_pool.release(manager)):
+                manager.shutdown()
+
+    def _browser_managers(self):
+        """Все браузеры парсера: основной и браузеры параллельного поиска"""
+        managers = [self.browser_manager] + [lane.manager for lane in self.fan_out_lanes]
+        return [manager for manager in managers if manager is not None]
+
+    def humanizers(self):
+        """Хуманизация всех браузеров парсера (для статистики пауз)"""
+        return [self.humanizer] + [lane.humanizer for lane in self.fan_out_lanes]
 
     def search_organization(self, org_name):
-        """Каскадный поиск организации через разные источники"""
-        result = {
+        """Поиск организации с использованием кэша результатов"""
+        with self.tracer.span("search_organization") as span:
+            self._search_commands = {}
+            result = self._search_organization_cached(org_name)
+            span["result_source"] = result.get("source")
+
+            if self._search_commands:
+                total_commands = sum(self._search_commands.values())
+                span["webdriver_commands"] = total_commands
+                by_source = ", ".join(
+                    f"{source}: {count}" for source, count in self._search_commands.items()
+                )
+                self.log(f"📡 Команд WebDriver: {total_commands} ({by_source})")
+
+            return result
+
+    def webdriver_command_count(self):
+        """Число команд WebDriver, отправленных браузером с момента запуска"""
+        return getattr(self.browser, "command_count", 0)
+
+    @contextmanager
+    def _searcher_span(self, source, **attrs):
+        """Интервал вызова сеарчера с подсчетом команд WebDriver"""
+        commands_before = self.webdriver_command_count()
+        with self.tracer.span("searcher", source=source, **attrs) as span:
+            try:
+                yield span
+            finally:
+                commands = self.webdriver_command_count() - commands_before
+                span["webdriver_commands"] = commands
+                self._search_commands[source] = self._search_commands.get(source, 0) + commands
+
+    def _search_organization_cached(self, org_name):
+        """Поиск организации: сначала кэш, затем каскад источников"""
+        if self.result_cache:
+            cached = self.result_cache.get(org_name)
+            if cached is not None:
+                self.log(f"💾 Найдено в кэше (источник: {cached.get('source', 'Не найдено')})")
+                return cached
+
+            if self.result_cache.cache_only:
+                self.log("💾 Нет в кэше, поиск пропущен (режим «только кэш»)")
+                return self._empty_result()
+
+        result = self._search_organization_recovering(org_name)
+
+        if self.result_cache:
+            try:
+                self.result_cache.put(org_name, result)
+            except Exception as e:
+                self.log(f"  ⚠️ Не удалось сохранить результат в кэш: {e}")
+
+        return result
+
+    def _search_organization_recovering(self, org_name):
+        """
+        Каскад источников с перезапуском упавшего браузера
+
+        Сеарчеры перехватывают ошибки сами, поэтому падение Chrome выглядит как
+        «Не найдено»; такой результат перепроверяется на живость браузера, и
+        строка повторяется в новом браузере (в кэш попадает только повтор).
+        """
+        # Браузеры не пересоздаются, пока в них идут отмененные поиски прошлой строки
+        self._wait_fan_out_lanes()
+        managers = self._browser_managers()
+        for manager in managers:
+            manager.maybe_recycle()
+
+        try:
+            result = self._search_organization_cascade(org_name)
+            if result.get("source") != "Не найдено":
+                return result
+            dead = [manager for manager in managers if not manager.is_alive()]
+            if not dead:
+                return result
+            reason = "браузер перестал отвечать"
+        except WebDriverException as e:
+            dead = [manager for manager in managers if not manager.is_alive()]
+            if not dead:
+                raise
+            reason = f"браузер упал ({str(e).splitlines()[0] if str(e) else type(e).__name__})"
+
+        # Браузеры закрыты остановкой парсинга: строка не повторяется, а прерывается
+        if any(manager.closed or manager not in self._browser_managers() for manager in dead):
+            raise BrowserClosed()
+
+        self._wait_fan_out_lanes()
+        for manager in dead:
+            manager.restart(reason)
+        self.log("🔁 Повтор строки в новом браузере")
+        return self._search_organization_cascade(org_name)
+
+    @staticmethod
+    def _empty_result():
+        """Пустой итоговый результат"""
+        return {
             "name": "",
             "address": "",
             "postal_code": "",
@@ -1479,28 +1681,18 @@ class OrganizationParser:
             "source": "Не найдено",
         }
 
-        # 1. RusProfile
-        self.log("🔍 Поиск в RusProfile...")
-        rusprofile_result = self.rusprofile_searcher.search(org_name=org_name)
-        if rusprofile_result["found"]:
-            result.update(rusprofile_result)
-            result["source"] = "RusProfile"
-            return result
-
-        # 2. Контур Фокус
-        self.log("🔍 Поиск в Контур Фокус...")
-        fokus_result = self.kontur_fokus_searcher.search(org_name=org_name)
-        if fokus_result["found"]:
-            result.update(fokus_result)
-            result["source"] = "Контур Фокус"
-            return result
+    def _search_organization_cascade(self, org_name):
+        """Каскадный поиск организации через разные источники"""
+        result = self._empty_result()
 
-        # 3. ЕГРЮЛ - ищем ИНН и полные данные
-        self.log("🔍 Поиск в ЕГРЮЛ...")
-        egrul_result = self.egrul_searcher.search(org_name)
-        if egrul_result["found"]:
-            result.update(egrul_result)
-            result["source"] = "ЕГРЮЛ"
+        # 1-3. RusProfile, Контур Фокус, ЕГРЮЛ по названию
+        if self.fan_out_lanes:
+            source, found_result, egrul_result = self._search_by_name_fan_out(org_name)
+        else:
+            source, found_result, egrul_result = self._search_by_name_sequential(org_name)
+        if source:
+            result.update(found_result)
+            result["source"] = source
             return result
 
         # Если в ЕГРЮЛ нашли ИНН (но не полные данные), пробуем повторить поиск по ИНН
@@ -1509,9 +1701,20 @@ class OrganizationParser:
                 f"  🔗 Найден ИНН в ЕГРЮЛ: {egrul_result.get('inn')}, повторный поиск..."
             )
 
+            # Сначала смотрим, не находили ли эту организацию раньше по ИНН
+            if self.result_cache:
+                cached = self.result_cache.get_by_inn(egrul_result.get("inn"))
+                cached_source = (cached or {}).get("source", "").split(" → ")[-1]
+                if cached_source in ("RusProfile", "Контур Фокус"):
+                    self.log(f"  💾 Найдено в кэше по ИНН ({cached_source})")
+                    result.update(cached)
+                    result["source"] = f"ЕГРЮЛ → {cached_source}"
+                    return result
+
             # Пробуем RusProfile по ИНН
             self.log("  🔍 Повторный поиск в RusProfile по ИНН...")
-            rusprofile_result = self.rusprofile_searcher.search(inn=egrul_result.get("inn"))
+            with self._searcher_span("RusProfile", by="inn"):
+                rusprofile_result = self.rusprofile_searcher.search(inn=egrul_result.get("inn"))
             if rusprofile_result["found"]:
                 result.update(rusprofile_result)
                 result["source"] = "ЕГРЮЛ → RusProfile"
@@ -1519,9 +1722,10 @@ class OrganizationParser:
 
             # Пробуем Контур Фокус по ИНН
             self.log("  🔍 Повторный поиск в Контур Фокус по ИНН...")
-            fokus_result = self.kontur_fokus_searcher.search(
-                org_name=None, inn=egrul_result.get("inn")
-            )
+            with self._searcher_span("Контур Фокус", by="inn"):
+                fokus_result = self.kontur_fokus_searcher.search(
+                    org_name=None, inn=egrul_result.get("inn")
+                )
             if fokus_result["found"]:
                 result.update(fokus_result)
                 result["source"] = "ЕГРЮЛ → Контур Фокус"
@@ -1539,6 +1743,123 @@ class OrganizationParser:
         self.log("❌ Не найдено нигде")
         return result
 
+    def _search_by_name_sequential(self, org_name):
+        """
+        Поиск по названию в источниках по очереди до первого найденного
+
+        Returns:
+            tuple: (источник или None, его результат, результат ЕГРЮЛ)
+        """
+        # 1. RusProfile
+        self.log("🔍 Поиск в RusProfile...")
+        with self._searcher_span("RusProfile"):
+            rusprofile_result = self.rusprofile_searcher.search(org_name=org_name)
+        if rusprofile_result["found"]:
+            return "RusProfile", rusprofile_result, {}
+
+        # 2. Контур Фокус
+        self.log("🔍 Поиск в Контур Фокус...")
+        with self._searcher_span("Контур Фокус"):
+            fokus_result = self.kontur_fokus_searcher.search(org_name=org_name)
+        if fokus_result["found"]:
+            return "Контур Фокус", fokus_result, {}
+
+        # 3. ЕГРЮЛ - ищем ИНН и полные данные
+        self.log("🔍 Поиск в ЕГРЮЛ...")
+        with self._searcher_span("ЕГРЮЛ"):
+            egrul_result = self.egrul_searcher.search(org_name)
+        if egrul_result["found"]:
+            return "ЕГРЮЛ", egrul_result, egrul_result
+
+        return None, None, egrul_result
+
+    def _search_by_name_fan_out(self, org_name):
+        """
+        Параллельный поиск по названию во всех источниках сразу
+
+        RusProfile ищет в текущем потоке в основном браузере, остальные
+        источники - каждый в своем браузере в потоке пула. Ответ выбирается
+        в порядке приоритета каскада: результат источника берется, только
+        если все более приоритетные ничего не нашли, и каждый результат
+        проходит _validate_organization_result. Как только ответ известен,
+        поиски в менее приоритетных источниках отменяются.
+
+        Returns:
+            tuple: (источник или None, его результат, результат ЕГРЮЛ)
+        """
+        self._wait_fan_out_lanes()
+        cancel_event = self._fan_out_cancel = threading.Event()
+        started = time.perf_counter()
+        for lane in self.fan_out_lanes:
+            lane.future = self._fan_out_executor.submit(lane.run, org_name, cancel_event, self.tracer)
+
+        source, found_result, egrul_result = None, None, {}
+        used = 0
+        try:
+            self.log("🔍 Поиск в RusProfile...")
+            with self._searcher_span("RusProfile"):
+                rusprofile_result = self.rusprofile_searcher.search(org_name=org_name)
+            # Время, которое каскад потратил бы на уже опрошенные источники
+            sequential_seconds = time.perf_counter() - started
+
+            if self._is_valid_fan_out_result(org_name, rusprofile_result):
+                source, found_result = "RusProfile", rusprofile_result
+            else:
+                for lane in self.fan_out_lanes:
+                    lane.wait()
+                    used += 1
+
+                    self.log(f"🔍 Поиск в {lane.title}...")
+                    for line in lane.logs:
+                        self.log(line)
+                    sequential_seconds += lane.duration
+                    self._search_commands[lane.title] = (
+                        self._search_commands.get(lane.title, 0) + lane.commands
+                    )
+
+                    if lane.name == "egrul":
+                        egrul_result = lane.result
+                    if self._is_valid_fan_out_result(
+                        org_name, lane.result, check_keyword_match=False
+                    ):
+                        source, found_result = lane.title, lane.result
+                        break
+        finally:
+            cancel_event.set()
+
+        elapsed = time.perf_counter() - started
+        saved = max(0.0, sequential_seconds - elapsed)
+        self.fan_out_rows += 1
+        self.fan_out_saved_seconds += saved
+
+        line = (
+            f"⚡ Параллельный поиск: {elapsed:.1f} с вместо ~{sequential_seconds:.1f} с "
+            f"по очереди (экономия {saved:.1f} с)"
+        )
+        cancelled = [lane.title for lane in self.fan_out_lanes[used:]]
+        if cancelled:
+            line += f", не понадобились: {', '.join(cancelled)}"
+        self.log(line)
+
+        return source, found_result, egrul_result
+
+    def _is_valid_fan_out_result(self, org_name, result, check_keyword_match=True):
+        """
+        Результат источника подходит как ответ параллельного поиска
+
+        Совпадение ключевых слов проверяется только для RusProfile: ЕГРЮЛ
+        выбирает запись своим сопоставлением, а полные названия из ЕГРЮЛ и
+        Контур Фокуса не содержат сокращений исходного названия (СОШ, МБОУ).
+        """
+        return bool(result.get("found")) and self.rusprofile_searcher._validate_organization_result(
+            org_name, result, check_keyword_match=check_keyword_match
+        )
+
+    def _wait_fan_out_lanes(self):
+        """Ожидание поисков прошлой строки в браузерах параллельного поиска"""
+        for lane in self.fan_out_lanes:
+            lane.wait()
+
     # Методы get_genitive_case_pymorphy и normalize_organization_name теперь в BaseSearcher
     # Оставляем их для обратной совместимости
     @staticmethod
@@ -1577,7 +1898,7 @@ class OrganizationParser:
     # - _search_by_name_with_variants -> RusProfileSearcher
     # - _search_by_inn -> RusProfileSearcher
     # - _extract_organization_data -> RusProfileSearcher
-    # - _load_standardization_rules -> EgrulSearcher
+    # - _load_standardization_rules -> модуль rules (общий для всех компонентов)
     # - _expand_abbreviations -> EgrulSearcher
     # - _find_best_educational_match -> EgrulSearcher
 
@@ -1590,7 +1911,8 @@ class OrganizationParser:
         }
 
         try:
-            gigachat_result = self.gigachat_api.search_organization_in_egrul(org_name)
+            with self.tracer.span("gigachat", source="GigaChat"):
+                gigachat_result = self.gigachat_api.search_organization_in_egrul(org_name)
 
             if gigachat_result["found"]:
                 result.update(gigachat_result)
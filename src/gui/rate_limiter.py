@@ -0,0 +1,256 @@
+"""
+Модуль общего ограничения частоты запросов к сайтам источников
+"""
+
+import os
+import time
+import threading
+from collections import deque
+
+
+# Безопасные лимиты по сайтам: (запросов в минуту, запросов подряд без ожидания)
+DEFAULT_RATES = {
+    "rusprofile": (30, 3),
+    "kontur": (40, 5),
+    "egrul": (120, 10),
+    "gigachat": (30, 2),
+}
+
+
+def parse_rate(text):
+    """
+    Разбор лимита вида "30/5" (запросов в минуту / подряд) или "30"
+
+    Returns:
+        tuple | None: (запросов в минуту, подряд) или None, если лимит выключен ("0")
+    """
+    per_minute, _, burst = str(text).strip().partition("/")
+    per_minute = float(per_minute)
+    if per_minute <= 0:
+        return None
+    return per_minute, int(burst) if burst else 1
+
+
+def rates_from_env(defaults=DEFAULT_RATES):
+    """
+    Лимиты с учетом переменных окружения RATE_LIMIT_<САЙТ>
+
+    Например, RATE_LIMIT_RUSPROFILE=60/5 в .env; "0" снимает лимит с сайта.
+    Некорректные значения пропускаются.
+    """
+    rates = dict(defaults)
+    for domain in list(rates):
+        value = os.getenv(f"RATE_LIMIT_{domain.upper()}")
+        if not value:
+            continue
+        try:
+            rates[domain] = parse_rate(value)
+        except ValueError:
+            continue
+    return {domain: rate for domain, rate in rates.items() if rate}
+
+
+class TokenBucket:
+    """
+    Корзина токенов одного сайта
+
+    Токены пополняются со скоростью requests_per_minute и копятся до burst.
+    Запрос, которому токена не хватило, не ждет освобождения в цикле, а
+    сразу бронирует время отправки: остаток корзины уходит в минус, и каждый
+    следующий запрос встает за предыдущим. Так запросы всех потоков
+    отправляются в порядке прихода, и ни один поток не обгоняет другие.
+    Бронь отмененного запроса не возвращается: его время отправки просто
+    пропадает, а очередь и лимит остаются как были.
+    Без requests_per_minute запросы только считаются.
+    """
+
+    def __init__(self, requests_per_minute=None, burst=1):
+        self.requests_per_minute = requests_per_minute
+        self.burst = max(1, int(burst))
+        self._rate = requests_per_minute / 60.0 if requests_per_minute else None
+        self._tokens = float(self.burst)
+        self._updated = self._created = time.monotonic()
+        self._lock = threading.Lock()
+
+        self._sent = deque()  # Время отправки запросов за последнюю минуту
+        self.total = 0
+        self.waited_seconds = 0.0
+        self.waiting = 0  # Запросов в очереди сейчас
+        self.max_waiting = 0
+
+    def reserve(self):
+        """
+        Бронирование токена
+
+        Returns:
+            float: Через сколько секунд можно отправлять запрос
+        """
+        with self._lock:
+            if self._rate is None:
+                return 0.0
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self._rate)
+
+    def acquire(self, cancel_event=None):
+        """
+        Ожидание своей очереди на запрос
+
+        Args:
+            cancel_event: threading.Event, прерывающий ожидание
+
+        Returns:
+            bool: False, если ожидание прервано cancel_event (забронированное
+            время при этом остается занятым)
+        """
+        delay = self.reserve()
+        if delay > 0:
+            with self._lock:
+                self.waiting += 1
+                self.max_waiting = max(self.max_waiting, self.waiting)
+            try:
+                if cancel_event is not None:
+                    if cancel_event.wait(delay):
+                        # Токен не возвращаем: запросы за этим уже ждут своего
+                        # времени, и возврат дал бы следующему обогнать их
+                        return False
+                else:
+                    time.sleep(delay)
+            finally:
+                with self._lock:
+                    self.waiting -= 1
+
+        with self._lock:
+            now = time.monotonic()
+            self._sent.append(now)
+            self.total += 1
+            self.waited_seconds += delay
+        return True
+
+    def snapshot(self):
+        """Загрузка сайта: текущая частота, доля от лимита, ожидания"""
+        with self._lock:
+            now = time.monotonic()
+            while self._sent and self._sent[0] < now - 60:
+                self._sent.popleft()
+            # Частота за последнюю минуту (или за время работы, если прошло меньше минуты)
+            window = min(60.0, now - self._created)
+            per_minute = len(self._sent) * 60 / window if window > 0 else 0.0
+            return {
+                "requests_per_minute": self.requests_per_minute,
+                "burst": self.burst,
+                "per_minute": per_minute,
+                "utilization": (
+                    per_minute / self.requests_per_minute if self.requests_per_minute else None
+                ),
+                "total": self.total,
+                "waited_seconds": self.waited_seconds,
+                "waiting": self.waiting,
+                "max_waiting": self.max_waiting,
+            }
+
+
+class RateLimiter:
+    """
+    Общий планировщик запросов по сайтам
+
+    Каждый переход браузера и HTTP-запрос к сайту источника сначала берет
+    токен корзины своего сайта (acquire), поэтому лимит действует на все
+    потоки и браузеры процесса вместе, а не на каждый по отдельности.
+    """
+
+    def __init__(self, rates=None):
+        """
+        Args:
+            rates: {сайт: (запросов в минуту, подряд)}; сайты без лимита
+                   только учитываются в статистике
+        """
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self.configure(rates or {})
+
+    def configure(self, rates):
+        """Новые лимиты (статистика сайтов начинается заново)"""
+        with self._lock:
+            self._buckets = {
+                domain: TokenBucket(requests_per_minute, burst)
+                for domain, (requests_per_minute, burst) in rates.items()
+            }
+
+    def bucket(self, domain):
+        """Корзина сайта (для сайта без лимита создается считающая)"""
+        with self._lock:
+            bucket = self._buckets.get(domain)
+            if bucket is None:
+                bucket = self._buckets[domain] = TokenBucket()
+            return bucket
+
+    def acquire(self, domain, cancel_event=None):
+        """
+        Ожидание очереди на запрос к сайту domain
+
+        Returns:
+            bool: False, если ожидание прервано cancel_event
+        """
+        if not domain:
+            return True
+        return self.bucket(domain).acquire(cancel_event)
+
+    def snapshot(self):
+        """Загрузка по сайтам: {сайт: TokenBucket.snapshot()}"""
+        with self._lock:
+            buckets = dict(self._buckets)
+        return {domain: bucket.snapshot() for domain, bucket in buckets.items()}
+
+    def utilization_line(self):
+        """Строка лога с текущей загрузкой лимитов"""
+        parts = []
+        for domain, stats in self.snapshot().items():
+            if not stats["total"]:
+                continue
+            part = f"{domain} {stats['per_minute']:.0f}"
+            if stats["requests_per_minute"]:
+                part += f"/{stats['requests_per_minute']:g} в мин ({stats['utilization']:.0%})"
+            else:
+                part += " в мин"
+            if stats["waiting"]:
+                part += f", в очереди {stats['waiting']}"
+            parts.append(part)
+        if not parts:
+            return None
+        return "🚦 Загрузка сайтов: " + "; ".join(parts)
+
+    def stats_lines(self):
+        """Итоги по сайтам для конца прогона"""
+        lines = []
+        for domain, stats in sorted(self.snapshot().items()):
+            if not stats["total"]:
+                continue
+            if stats["requests_per_minute"]:
+                limit = f"лимит {stats['requests_per_minute']:g}/мин, подряд {stats['burst']}"
+            else:
+                limit = "без лимита"
+            lines.append(
+                f"  • {domain}: {stats['total']} запросов ({limit}), "
+                f"ожидание очереди {stats['waited_seconds']:.1f} с, "
+                f"в очереди до {stats['max_waiting']}"
+            )
+        if lines:
+            lines.insert(0, "\n🚦 Запросы к сайтам:")
+        return lines
+
+
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter():
+    """Общий планировщик запросов процесса (создается один раз, без лимитов)"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        with _rate_limiter_lock:
+            if _rate_limiter is None:
+                _rate_limiter = RateLimiter()
+    return _rate_limiter
@@ -0,0 +1,163 @@
+"""
+Модуль постоянного кэша результатов поиска организаций
+"""
+
+import os
+import re
+import json
+import time
+import sqlite3
+import threading
+
+
+CACHE_DIR = os.path.expanduser("~/.cache/fill_optimization_module")
+
+
+def get_cache_path(file_name):
+    """Путь к файлу внутри общей папки кэша приложения"""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    return os.path.join(CACHE_DIR, file_name)
+
+
+class ResultCache:
+    """
+    Кэш итоговых результатов OrganizationParser.search_organization на SQLite.
+
+    Результат сохраняется под несколькими ключами:
+    - нормализованный поисковый запрос ("q:...")
+    - ИНН найденной организации ("inn:..."): по нему каскад переиспользует
+      результат, когда ЕГРЮЛ вернул ИНН
+
+    Срок жизни записи зависит от источника, из которого получен результат.
+    """
+
+    DAY = 24 * 60 * 60
+
+    # Время жизни записей по источнику (в секундах)
+    SOURCE_TTL = {
+        "RusProfile": 30 * DAY,
+        "Контур Фокус": 30 * DAY,
+        "ЕГРЮЛ": 60 * DAY,
+        "ЕГРЮЛ → RusProfile": 30 * DAY,
+        "ЕГРЮЛ → Контур Фокус": 30 * DAY,
+        "GigaChat (ЕГРЮЛ)": 7 * DAY,
+        "GigaChat": 7 * DAY,
+        "Не найдено": 3 * DAY,  # Отрицательные результаты живут недолго
+    }
+    DEFAULT_TTL = 14 * DAY
+
+    def __init__(self, path=None, ttl=None, cache_only=False):
+        """
+        Args:
+            path: Путь к файлу базы (по умолчанию в ~/.cache)
+            ttl: Переопределение времени жизни по источникам {источник: секунды}
+            cache_only: Режим "только кэш" - промахи не ищутся в браузере
+        """
+        self.path = path or get_cache_path("results.sqlite3")
+        self.ttl = dict(self.SOURCE_TTL)
+        if ttl:
+            self.ttl.update(ttl)
+        self.cache_only = cache_only
+
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS results (
+                    key TEXT PRIMARY KEY,
+                    source TEXT NOT NULL,
+                    result TEXT NOT NULL,
+                    stored_at REAL NOT NULL
+                )
+                """
+            )
+
+    @staticmethod
+    def normalize_query(name):
+        """Нормализация поискового запроса для ключа кэша"""
+        text = str(name or "").lower().replace("ё", "е")
+        text = re.sub(r'["\'«»“”„]', " ", text)
+        text = re.sub(r"\s+", " ", text)
+        return text.strip()
+
+    def get_ttl(self, source):
+        """Время жизни записи для источника"""
+        return self.ttl.get(source, self.DEFAULT_TTL)
+
+    def _get(self, key):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT source, result, stored_at FROM results WHERE key = ?", (key,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        source, payload, stored_at = row
+        if time.time() - stored_at > self.get_ttl(source):
+            return None
+
+        try:
+            return json.loads(payload)
+        except ValueError:
+            return None
+
+    def get(self, org_name):
+        """Поиск результата по названию организации (учитывается в статистике)"""
+        key = self.normalize_query(org_name)
+        result = self._get("q:" + key) if key else None
+
+        with self._lock:
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        return result
+
+    def get_by_inn(self, inn):
+        """Поиск результата по ИНН"""
+        return self._get("inn:" + str(inn)) if inn else None
+
+    def put(self, org_name, result):
+        """Сохранение результата под ключами запроса и ИНН"""
+        source = result.get("source") or "Не найдено"
+        payload = json.dumps(result, ensure_ascii=False)
+        stored_at = time.time()
+
+        keys = []
+        query_key = self.normalize_query(org_name)
+        if query_key:
+            keys.append("q:" + query_key)
+        if source != "Не найдено":
+            if result.get("inn"):
+                keys.append("inn:" + str(result["inn"]))
+
+        if not keys:
+            return
+
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO results (key, source, result, stored_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    [(key, source, payload, stored_at) for key in keys],
+                )
+
+    def stats_line(self):
+        """Строка со статистикой попаданий для лога"""
+        total = self.hits + self.misses
+        rate = round(self.hits / total * 100, 1) if total else 0.0
+        return f"💾 Кэш результатов: попаданий {self.hits}, промахов {self.misses} ({rate}%)"
+
+    def close(self):
+        """Закрытие соединения с базой"""
+        with self._lock:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
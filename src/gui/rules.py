@@ -0,0 +1,261 @@
+"""
+Модуль правил стандартизации: единая загрузка и компиляция standardization_rules.json
+"""
+
+import os
+import re
+import json
+import threading
+from types import MappingProxyType
+
+
+RULES_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "standardization_rules.json")
+)
+
+# ОПФ, которые расшифровываются только в начале названия
+OPF_ABBREVIATIONS = (
+    "АНОО", "АНО", "МБОУ", "ГБОУ", "МАОУ", "МКОУ", "ГКОУ",
+    "ЧОУ", "НЧОУ", "ФГБОУ", "ФГАОУ", "ГАОУ", "ГБПОУ", "ГАПОУ",
+)
+
+# ОПФ, которые отбрасываются при генерации поисковых вариантов
+SEARCH_OPF_PREFIXES = ("ООО", "ЗАО", "ОАО", "АО", "ИП", "ФГБОУ", "МБОУ", "АНОО", "НОУ", "ГОУ", "МОУ", "АНО")
+
+# Образовательные ключевые слова (проверка найденных организаций)
+EDU_KEYWORDS = (
+    "школа", "сош", "лицей", "гимназия", "колледж", "университет",
+    "институт", "училище", "образовательн", "учреждение", "детский сад",
+    "доу", "дворец творчества", "дом творчества", "центр детского",
+    "центр развития", "центр образования",
+)
+
+# Образовательные ключевые слова для фильтрации выдачи ЕГРЮЛ
+EGRUL_EDU_KEYWORDS = (
+    "школа", "сош", "лицей", "гимназия", "колледж", "университет",
+    "институт", "училище", "образовательн", "учреждение", "детский сад",
+)
+
+# Регулярное выражение, которое никогда не совпадает
+NEVER_MATCH = re.compile(r"(?!x)x")
+
+# Текст в кавычках, внутри которого аббревиатуры не расшифровываются
+QUOTED_TEXT_REGEX = re.compile(r'["\'«»][^"\']+["\'»]')
+QUOTE_PLACEHOLDER_REGEX = re.compile(r"__QUOTE_PLACEHOLDER_(\d+)__")
+
+
+def compile_alternation(words, prefix="", suffix="", flags=re.IGNORECASE):
+    """
+    Компиляция списка строк в одно регулярное выражение-альтернацию
+
+    Строки сортируются от длинных к коротким, чтобы при совпадении
+    в одной позиции побеждала самая длинная.
+    """
+    unique_words = [word for word in dict.fromkeys(words) if word]
+    if not unique_words:
+        return NEVER_MATCH
+
+    ordered = sorted(unique_words, key=len, reverse=True)
+    pattern = prefix + "(?:" + "|".join(map(re.escape, ordered)) + ")" + suffix
+    return re.compile(pattern, flags)
+
+
+class CompiledRules:
+    """
+    Скомпилированные правила стандартизации
+
+    Объект неизменяем после создания и разделяется всеми сеарчерами,
+    TextProcessor и потоками парсинга.
+    """
+
+    def __init__(self, data, mtime=None, load_error=None):
+        self.mtime = mtime
+        self.load_error = load_error
+
+        abbreviations = dict(data.get("abbreviations", {}))
+        type_synonyms = {
+            type_name: tuple(synonyms)
+            for type_name, synonyms in data.get("type_synonyms", {}).items()
+        }
+        geo_markers = tuple(data.get("geo_markers", []))
+
+        # Исходные данные
+        self.abbreviations = MappingProxyType(abbreviations)
+        self.type_synonyms = MappingProxyType(type_synonyms)
+        self.geo_markers = geo_markers
+        self.common_words = frozenset(data.get("common_words", []))
+
+        # Производные наборы
+        self.abbreviations_lower = tuple(abbr.lower() for abbr in abbreviations)
+        self.type_synonyms_lower = tuple(
+            (type_name.lower(), tuple(syn.lower() for syn in synonyms))
+            for type_name, synonyms in type_synonyms.items()
+        )
+        self.edu_keywords = EDU_KEYWORDS
+        self.egrul_edu_keywords = frozenset(self.abbreviations_lower) | frozenset(EGRUL_EDU_KEYWORDS)
+
+        # Любая аббревиатура как отдельное слово
+        self.abbreviation_regex = compile_alternation(abbreviations, r"\b", r"\b")
+        # Отдельное выражение для каждой аббревиатуры (варианты запроса ЕГРЮЛ)
+        self.abbreviation_word_regexes = MappingProxyType(
+            {
+                abbr: re.compile(r"\b" + re.escape(abbr) + r"\b", re.IGNORECASE)
+                for abbr in abbreviations
+            }
+        )
+        # ОПФ в начале строки
+        self.opf_prefix_regex = compile_alternation(
+            [abbr for abbr in OPF_ABBREVIATIONS if abbr in abbreviations], r"^", r"\s+"
+        )
+        # Остальные аббревиатуры (3+ символа, чтобы не задевать части слов)
+        self.inline_abbreviation_regex = compile_alternation(
+            [abbr for abbr in abbreviations if abbr not in OPF_ABBREVIATIONS and len(abbr) >= 3],
+            r"\b",
+            r"\b",
+        )
+        self.abbreviation_lookup = MappingProxyType(
+            {abbr.lower(): full_form for abbr, full_form in abbreviations.items()}
+        )
+
+        # Отбрасывание ОПФ при генерации поисковых вариантов
+        self.search_opf_regex = re.compile(
+            r"^(?:" + "|".join(SEARCH_OPF_PREFIXES) + r")\s+[\"']?"
+        )
+        self.search_opf_strict_regex = re.compile(
+            r"^(?:" + "|".join(SEARCH_OPF_PREFIXES) + r")\s+"
+        )
+
+        # Географические упоминания (TextProcessor)
+        self.geo_regex = compile_alternation(geo_markers, r"(?:\b|^)(", r")(?:\b|\s|$)")
+
+        # Замена полных названий на сокращения (TextProcessor)
+        replacements = {}
+        for short_name, synonyms in type_synonyms.items():
+            for syn in synonyms:
+                replacements[syn.lower()] = short_name
+        for abbr, full_name in abbreviations.items():
+            if full_name:
+                replacements[full_name.lower()] = abbr
+        self.replacements = MappingProxyType(replacements)
+        self.resolved_replacements = MappingProxyType(
+            {phrase: self._resolve_replacement(phrase) for phrase in replacements}
+        )
+        # Все фразы одной альтернацией: самая длинная побеждает в каждой позиции
+        self.replacement_regex = compile_alternation(replacements)
+
+        self._frozen = True
+
+    def _resolve_replacement(self, phrase):
+        """
+        Итоговая замена фразы с учетом цепочек
+
+        Сокращение само может быть заменяемой фразой (например, МБДОУ -> Детский сад).
+        Раньше такие цепочки получались из-за последовательных замен от длинных
+        фраз к коротким, теперь они разворачиваются один раз при компиляции.
+        """
+        short_name = self.replacements[phrase]
+        seen = {phrase}
+        while True:
+            next_phrase = short_name.lower()
+            if (
+                next_phrase not in self.replacements
+                or next_phrase in seen
+                or len(next_phrase) >= len(phrase)
+            ):
+                return short_name
+            seen.add(next_phrase)
+            phrase = next_phrase
+            short_name = self.replacements[phrase]
+
+    def _replace_phrase(self, match):
+        """Замена найденной фразы на сокращение"""
+        phrase = match.group(0)
+        return self.resolved_replacements.get(phrase.lower(), phrase)
+
+    def standardize_names(self, text):
+        """Замена полных названий на сокращения за один проход слева направо"""
+        if not text:
+            return text
+        return self.replacement_regex.sub(self._replace_phrase, text)
+
+    def _expand_abbreviation(self, match):
+        """Замена найденной аббревиатуры на полную форму"""
+        abbr = match.group(0).strip()
+        return self.abbreviation_lookup.get(abbr.lower(), abbr)
+
+    def expand_abbreviations(self, text):
+        """
+        Расшифровка аббревиатур за один проход
+
+        - текст в кавычках не изменяется (заменяется плейсхолдерами)
+        - ОПФ расшифровывается только одна и только в начале строки
+        - остальные аббревиатуры (3+ символа) расшифровываются как отдельные слова,
+          при совпадении в одной позиции побеждает самая длинная
+        """
+        if not text:
+            return text
+
+        quoted_parts = []
+
+        def hide_quoted(match):
+            quoted_parts.append(match.group(0))
+            return f"__QUOTE_PLACEHOLDER_{len(quoted_parts) - 1}__"
+
+        result = QUOTED_TEXT_REGEX.sub(hide_quoted, text)
+        result = self.opf_prefix_regex.sub(
+            lambda match: self._expand_abbreviation(match) + " ", result, count=1
+        )
+        result = self.inline_abbreviation_regex.sub(self._expand_abbreviation, result)
+
+        if quoted_parts:
+            result = QUOTE_PLACEHOLDER_REGEX.sub(
+                lambda match: quoted_parts[int(match.group(1))], result
+            )
+
+        return result
+
+    def __setattr__(self, name, value):
+        if getattr(self, "_frozen", False):
+            raise AttributeError("CompiledRules нельзя изменять после создания")
+        super().__setattr__(name, value)
+
+
+_rules = None
+_rules_lock = threading.Lock()
+
+
+def _file_mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def load_rules(path=RULES_PATH):
+    """Загрузка и компиляция правил из файла (без кэширования)"""
+    mtime = _file_mtime(path)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return CompiledRules(data, mtime=mtime)
+    except Exception as e:
+        # Минимальный набор правил, чтобы поиск продолжал работать
+        return CompiledRules({}, mtime=mtime, load_error=e)
+
+
+def get_rules():
+    """
+    Общие скомпилированные правила
+
+    Файл загружается один раз; при изменении его mtime правила
+    перекомпилируются при следующем обращении.
+    """
+    global _rules
+    mtime = _file_mtime(RULES_PATH)
+    rules = _rules
+    if rules is None or rules.mtime != mtime:
+        with _rules_lock:
+            if _rules is None or _rules.mtime != mtime:
+                _rules = load_rules(RULES_PATH)
+            rules = _rules
+    return rules
@@ -0,0 +1,112 @@
+"""
+Модуль журнала результатов парсинга для продолжения прерванных запусков
+"""
+
+import os
+import json
+import time
+import threading
+
+
+class RunJournal:
+    """
+    Журнал результатов парсинга в формате JSON Lines (только дозапись).
+
+    Каждая строка журнала - результат поиска одной строки Excel:
+    {"row": индекс строки, "query": запрос, "result": {...}, "ts": время}
+
+    Запись сбрасывается на диск сразу, поэтому после падения Chrome или
+    закрытия приложения уже найденные строки не теряются.
+    """
+
+    SUFFIX = ".journal.jsonl"
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_input_file(cls, input_path):
+        """Журнал, лежащий рядом с входным Excel-файлом"""
+        return cls(os.path.splitext(input_path)[0] + cls.SUFFIX)
+
+    def exists(self):
+        """Есть ли на диске журнал с результатами"""
+        return os.path.exists(self.path) and os.path.getsize(self.path) > 0
+
+    @staticmethod
+    def _row_key(row_idx):
+        """Индекс строки в виде, пригодном для JSON"""
+        try:
+            return int(row_idx)
+        except (TypeError, ValueError):
+            return str(row_idx)
+
+    def load(self):
+        """
+        Загрузка журнала
+
+        Returns:
+            dict: {индекс строки: (запрос, результат)}, последняя запись строки побеждает
+        """
+        entries = {}
+        if not os.path.exists(self.path):
+            return entries
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                    entries[record["row"]] = (record.get("query", ""), record["result"])
+                except (ValueError, KeyError, TypeError):
+                    # Недописанная строка после аварийного завершения
+                    continue
+
+        return entries
+
+    def open(self, reset=False):
+        """Открытие журнала на дозапись (reset=True - начать новый журнал)"""
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "w" if reset else "a", encoding="utf-8")
+
+    def record(self, row_idx, query, result):
+        """Запись результата строки с немедленным сбросом на диск"""
+        line = json.dumps(
+            {
+                "row": self._row_key(row_idx),
+                "query": query,
+                "result": result,
+                "ts": round(time.time(), 3),
+            },
+            ensure_ascii=False,
+            default=str,
+        )
+
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        """Закрытие файла журнала"""
+        with self._lock:
+            if self._file is not None:
+                try:
+                    self._file.close()
+                finally:
+                    self._file = None
+
+    def remove(self):
+        """Удаление журнала (после успешного сохранения результата)"""
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
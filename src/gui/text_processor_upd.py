@@ -4,11 +4,13 @@
 
 import re
 import time
-import json
-import os
 from PySide6.QtCore import QThread, Signal
 import language_tool_python
 
+from .rules import get_rules
+from .correction_cache import SpellCorrectionCache
+from .language_tool_manager import LanguageToolManager
+
 
 class TextProcessor(QThread):
     """Класс для обработки и нормализации названий организаций"""
@@ -19,9 +21,22 @@ class TextProcessor(QThread):
     finished_signal = Signal(list)     # Результат обработки
     # error_signal = Signal(str)         # Ошибки
 
-    def __init__(self, raw_data_column):
+    # Разделитель названий внутри одного запроса к LanguageTool (отдельный абзац)
+    BATCH_SEPARATOR = "\n\n"
+    DEFAULT_BATCH_SIZE = 100
+
+    def __init__(self, raw_data_column, batch_size=DEFAULT_BATCH_SIZE, use_cache=True, language_tool=None):
         super().__init__()
+        # Общий LanguageToolManager приложения; без него процесс запускается на один файл
+        self.language_tool = language_tool
+        self._owns_language_tool = False
         self.raw_data_column = raw_data_column
+        self.batch_size = max(1, int(batch_size))
+        self.use_cache = use_cache
+        self._correction_cache = {}  # Уже проверенные строки: {строка: исправление}
+        self.spelling_cache = None   # Постоянный кэш исправлений (SQLite)
+        self.cache_hits = 0          # Строки, исправленные без обращения к LanguageTool
+        self.cache_misses = 0        # Уникальные строки, отправленные в LanguageTool
         # self.convert_time_start = 0
         # self.convert_time_end = None
         # self.convert_time_result = None
@@ -38,34 +53,23 @@ class TextProcessor(QThread):
         self.compile_regex()
 
     def load_standartization_rules(self):
-        try:
-            with open("standardization_rules.json", "r", encoding="utf-8") as f:
-                data = json.load(f)
-                self.rules["abbreviations"] = data.get("abbreviations", {})
-                self.rules["geo_markers"] = data.get("geo_markers", [])
-                self.rules["type_synonyms"] = data.get("type_synonyms", {})
-        except Exception as e:
-            self.log(f"❌ Ошибка чтения файла standardization_rules.json: {e}")
+        """Загрузка правил стандартизации из общего модуля rules"""
+        compiled_rules = get_rules()
+        if compiled_rules.load_error:
+            self.log(f"❌ Ошибка чтения файла standardization_rules.json: {compiled_rules.load_error}")
+
+        self.compiled_rules = compiled_rules
+        self.rules["abbreviations"] = dict(compiled_rules.abbreviations)
+        self.rules["geo_markers"] = list(compiled_rules.geo_markers)
+        self.rules["type_synonyms"] = {
+            type_name: list(synonyms)
+            for type_name, synonyms in compiled_rules.type_synonyms.items()
+        }
 
     def compile_regex(self):
-        """Компиляция регулярных выражений на основе правил"""
-        geo_list = self.rules["geo_markers"]
-        if geo_list:
-            geo_list = sorted(geo_list, key=len, reverse=True)
-            geo_pattern = r'(?:\b|^)(' + '|'.join(map(re.escape, geo_list)) + r')(?:\b|\s|$)'
-            self.geo_regex = re.compile(geo_pattern, re.IGNORECASE)
-        else:
-            self.geo_regex = re.compile(r'(?!x)x')
-
-        self.replacements = {}
-
-        for short_name, synonyms in self.rules["type_synonyms"].items():
-            for syn in synonyms:
-                self.replacements[syn.lower()] = short_name
-
-        for abbr, full_name in self.rules["abbreviations"].items():
-            if full_name:
-                self.replacements[full_name.lower()] = abbr
+        """Регулярные выражения берутся уже скомпилированными из модуля rules"""
+        self.geo_regex = self.compiled_rules.geo_regex
+        self.replacements = self.compiled_rules.replacements
 
     def cancel(self):
         """Отмена выполнения"""
@@ -77,54 +81,22 @@ class TextProcessor(QThread):
         result = []
 
         try:
-            # Инициализируем LanguageTool с настройкой кэширования
+            # LanguageTool запускается один раз за сессию (LanguageToolManager)
             self.log("🔧 Инициализация проверки орфографии...")
+            if self.language_tool is None:
+                self.language_tool = LanguageToolManager(log_callback=self.log)
+                self._owns_language_tool = True
 
-            # Настраиваем кэш для LanguageTool, чтобы не скачивать каждый раз
-            cache_dir = os.path.expanduser("~/.cache/language_tool_python")
-            os.makedirs(cache_dir, exist_ok=True)
-
-            # Устанавливаем путь к кэшу через переменную окружения
-            # Это заставит библиотеку использовать существующий кэш
-            if "LANGUAGETOOL_CACHE_DIR" not in os.environ:
-                os.environ["LANGUAGETOOL_CACHE_DIR"] = cache_dir
-
-            # Пытаемся использовать локальную установку LanguageTool (если есть)
-            local_lt_path = "/opt/languagetool"
-            if os.path.exists(local_lt_path):
-                # Ищем jar файл LanguageTool в локальной установке
-                jar_found = False
-                for root, dirs, files in os.walk(local_lt_path):
-                    for file in files:
-                        if file == "languagetool.jar" or (file.startswith("LanguageTool-") and file.endswith(".jar")):
-                            jar_path = os.path.join(root, file)
-                            self.log(f"📦 Использую локальную установку LanguageTool: {jar_path}")
-                            # Используем локальную установку через переменную окружения
-                            os.environ["LANGUAGETOOL_JAR"] = jar_path
-                            jar_found = True
-                            break
-                    if jar_found:
-                        break
-
-            # Проверяем, есть ли уже скачанный LanguageTool в кэше
-            cache_zip = os.path.join(cache_dir, "LanguageTool-latest-snapshot.zip")
-            cache_extracted = os.path.join(cache_dir, "LanguageTool-latest-snapshot")
-
-            if os.path.exists(cache_zip) or os.path.exists(cache_extracted):
-                self.log(f"✅ Найден кэш LanguageTool в {cache_dir}")
-                self.log("📦 Использую кэшированную версию (без повторной загрузки)")
-            else:
-                self.log("📥 LanguageTool не найден в кэше, будет выполнена загрузка (только при первом запуске)")
+            if not self.language_tool.wait_ready(0):
+                self.log("⏳ Ожидание запуска LanguageTool...")
+                while not self.language_tool.wait_ready(0.5):
+                    if self._is_cancelled:
+                        self.log("\n⚠️ Обработка отменена пользователем")
+                        return
 
-            # Отключаем проверку обновлений через переменную окружения
-            # Это предотвратит повторную загрузку при каждом запуске
-            if "LANGUAGETOOL_DISABLE_UPDATE_CHECK" not in os.environ:
-                os.environ["LANGUAGETOOL_DISABLE_UPDATE_CHECK"] = "1"
-
-            # Инициализируем LanguageTool
-            # Библиотека автоматически использует кэш, если он существует
-            # При первом запуске загрузит LanguageTool, при последующих - использует кэш
-            self.tool = language_tool_python.LanguageTool("ru")
+            self.language_tool.get_tool()
+            self.tool = self.language_tool
+            self.open_spelling_cache()
 
             total = len(self.raw_data_column)
 
@@ -132,7 +104,9 @@ class TextProcessor(QThread):
             self.log(f"🔄 Начинаю нормализацию {total} записей...")
             self.log(f"{'='*60}\n")
 
-            for idx, company_name in enumerate(self.raw_data_column, 1):
+            # Быстрые шаги нормализации (без LanguageTool) для всех строк
+            cleaned_names = []
+            for company_name in self.raw_data_column:
                 if self._is_cancelled:
                     self.log("\n⚠️ Обработка отменена пользователем")
                     return
@@ -142,13 +116,19 @@ class TextProcessor(QThread):
 
                 company_name_no_geo = self.remove_geo_mentions(origin_company_name)
                 company_namee_standardized = self.standardize_names(company_name_no_geo)
-                company_nam_cleaned = self.clean_formatting(company_namee_standardized)
-                final_company_name = self.check_and_correct(company_nam_cleaned)
+                cleaned_names.append(self.clean_formatting(company_namee_standardized))
 
-                result.append(final_company_name)
+            # Проверка орфографии пакетами: один запрос к LanguageTool на пакет
+            for batch_start in range(0, total, self.batch_size):
+                if self._is_cancelled:
+                    self.log("\n⚠️ Обработка отменена пользователем")
+                    return
+
+                batch = cleaned_names[batch_start:batch_start + self.batch_size]
+                result.extend(self.check_and_correct_batch(batch))
 
-                if idx % 5 == 0 or idx == total:
-                    self.log(f"[{idx}/{total}] Обработано: {final_company_name[:40]}...")
+                idx = len(result)
+                self.log(f"[{idx}/{total}] Обработано: {result[-1][:40]}...")
 
                 progress = int((idx / total) * 100)
                 self.progress_signal.emit(progress)
@@ -171,6 +151,7 @@ class TextProcessor(QThread):
                 self.log(f"\n{'='*60}")
                 self.log(f"✅ Нормализация завершена! Обработано: {total}")
                 self.log(f"⏱ Нормализация заняла: {duration} с")
+                self.log(self.cache_stats_line())
                 self.log(f"{'='*60}\n")
 
                 self.finished_signal.emit(result)
@@ -187,17 +168,37 @@ class TextProcessor(QThread):
         finally:
             # Закрываем LanguageTool
             self.close_tool()
+            if self.spelling_cache:
+                self.spelling_cache.close()
+                self.spelling_cache = None
+
+    def open_spelling_cache(self):
+        """Открытие постоянного кэша исправлений для текущей версии LanguageTool"""
+        if not self.use_cache:
+            return
+
+        lt_version = self.language_tool.version or "unknown"
+        try:
+            self.spelling_cache = SpellCorrectionCache(lt_version)
+        except Exception as e:
+            self.log(f"⚠️ Кэш исправлений недоступен: {e}")
+            self.spelling_cache = None
+
+    def cache_stats_line(self):
+        """Строка со статистикой кэша исправлений для лога"""
+        total = self.cache_hits + self.cache_misses
+        rate = round(self.cache_hits / total * 100, 1) if total else 0.0
+        return (
+            f"💾 Кэш исправлений: без LanguageTool {self.cache_hits} из {total} строк ({rate}%)"
+        )
 
     def close_tool(self):
-        """Безопасное закрытие LanguageTool"""
-        if self.tool:
-            try:
-                self.log("🔌 Закрытие процесса LanguageTool...")
-                self.tool.close()
-                self.tool = None
-                self.log("✅ Процесс Java остановлен.")
-            except Exception as e:
-                self.log(f"⚠️ Ошибка при закрытии LT: {e}")
+        """Освобождение LanguageTool (общий процесс остается запущенным)"""
+        self.tool = None
+        if self._owns_language_tool and self.language_tool:
+            self.language_tool.shutdown()
+            self.language_tool = None
+            self._owns_language_tool = False
 
     def log(self, message):
         """Отправка лога в UI"""
@@ -227,18 +228,8 @@ class TextProcessor(QThread):
 
     def standardize_names(self, text):
         """Заменяет полные названия на аббревиатуры"""
-        # lower_text = text.lower()
-        # Сортируем замены по длине (сначала длинные фразы)
-        sorted_replacements = sorted(self.replacements.items(), key=lambda x: len(x[0]), reverse=True)
-
-        temp_text = text
-
-        for long_name, short_name in sorted_replacements:
-            pattern = re.compile(re.escape(long_name), re.IGNORECASE)
-            if pattern.search(temp_text):
-                temp_text = pattern.sub(short_name, temp_text)
-
-        return temp_text
+        # Все фразы скомпилированы в одну альтернацию (сначала длинные фразы)
+        return self.compiled_rules.standardize_names(text)
 
     def clean_formatting(self, text):
         """Базовая очистка пунктуации и пробелов"""
@@ -252,15 +243,134 @@ class TextProcessor(QThread):
         return text.strip()
 
     def check_and_correct(self, text):
-        """Проверка орфографии всей строки целиком"""
+        """Проверка орфографии всей строки целиком (при ошибке проверки - строка как есть)"""
+        corrected = self._try_correct(text)
+        return text if corrected is None else corrected
+
+    def _try_correct(self, text):
+        """
+        Проверка орфографии строки
+
+        Returns:
+            str | None: Исправленная строка или None, если LanguageTool не ответил
+        """
         try:
             matches = self.tool.check(text)
             if not matches:
                 return text
             return language_tool_python.utils.correct(text, matches)
         except Exception:
+            return None
+
+    def check_and_correct_batch(self, texts):
+        """
+        Проверка орфографии пакета строк одним запросом к LanguageTool
+
+        Строки склеиваются через BATCH_SEPARATOR, смещения найденных ошибок
+        переводятся обратно в координаты каждой строки. Уже проверенные строки
+        и повторы внутри пакета в запрос не попадают.
+        """
+        pending = [
+            text for text in dict.fromkeys(texts) if text not in self._correction_cache
+        ]
+
+        # Исправления, сохраненные в прошлых запусках
+        if pending and self.spelling_cache:
+            try:
+                stored = self.spelling_cache.get_many(pending)
+            except Exception as e:
+                self.log(f"  ⚠️ Ошибка чтения кэша исправлений: {e}")
+                stored = {}
+            if stored:
+                self._correction_cache.update(stored)
+                pending = [text for text in pending if text not in stored]
+
+        # В checked попадают только строки, которые LanguageTool действительно проверил:
+        # непроверенные возвращаются как есть и не кэшируются, чтобы проверить их позже
+        checked = {}
+        if len(pending) == 1:
+            self._check_each(pending, checked)
+        elif pending:
+            try:
+                checked = self._check_packed(pending)
+            except Exception as e:
+                self.log(f"  ⚠️ Ошибка пакетной проверки, проверяю по одной строке: {e}")
+                self._check_each(pending, checked)
+
+        self._correction_cache.update(checked)
+        if checked and self.spelling_cache:
+            try:
+                self.spelling_cache.put_many(checked)
+            except Exception as e:
+                self.log(f"  ⚠️ Ошибка записи кэша исправлений: {e}")
+
+        self.cache_misses += len(pending)
+        self.cache_hits += len(texts) - len(pending)
+
+        return [self._correction_cache.get(text, text) for text in texts]
+
+    def _check_each(self, texts, checked):
+        """Проверка строк по одной; в checked добавляются только проверенные"""
+        failed = 0
+        for text in texts:
+            corrected = self._try_correct(text)
+            if corrected is None:
+                failed += 1
+            else:
+                checked[text] = corrected
+        if failed:
+            self.log(f"  ⚠️ LanguageTool не проверил строк: {failed}, они оставлены без исправлений")
+
+    def _check_packed(self, texts):
+        """Один запрос к LanguageTool на несколько строк"""
+        spans = []
+        position = 0
+        for text in texts:
+            spans.append((position, position + len(text)))
+            position += len(text) + len(self.BATCH_SEPARATOR)
+
+        matches = self.tool.check(self.BATCH_SEPARATOR.join(texts))
+
+        # Распределяем ошибки по строкам (смещения отсортированы по возрастанию)
+        corrections = [[] for _ in texts]
+        span_idx = 0
+        for match in sorted(matches, key=lambda m: m.offset):
+            while span_idx < len(spans) and match.offset >= spans[span_idx][1]:
+                span_idx += 1
+            if span_idx == len(spans):
+                break
+
+            start, end = spans[span_idx]
+            # Ошибки на стыке строк (в разделителе) пропускаем
+            if match.offset < start or match.offset + match.errorLength > end:
+                continue
+            if match.replacements:
+                corrections[span_idx].append(
+                    (match.offset - start, match.errorLength, match.replacements[0])
+                )
+
+        return {
+            text: self._apply_corrections(text, text_corrections)
+            for text, text_corrections in zip(texts, corrections)
+        }
+
+    @staticmethod
+    def _apply_corrections(text, corrections):
+        """Применение исправлений (аналог language_tool_python.utils.correct)"""
+        if not corrections:
             return text
 
+        chars = list(text)
+        shift = 0
+        for offset, length, replacement in corrections:
+            start = offset + shift
+            # Пропускаем исправления, пересекающиеся с уже примененными
+            if chars[start:start + length] != list(text[offset:offset + length]):
+                continue
+            chars[start:start + length] = list(replacement)
+            shift += len(replacement) - length
+        return "".join(chars)
+
     # def clean_text(self, text):
         # """Очистка и нормализация текста"""
         # # Извлекаем части в кавычках
@@ -0,0 +1,170 @@
+"""
+Модуль трассировки этапов поиска: интервалы (span) в формате JSON Lines
+"""
+
+import os
+import json
+import time
+import shutil
+import itertools
+import threading
+import functools
+from contextlib import contextmanager
+
+
+class Tracer:
+    """
+    Трассировка этапов каскадного поиска.
+
+    Каждый интервал (span) - одна строка JSON:
+    {"id", "parent", "stage", "source", "start", "duration", "thread", ...атрибуты}
+
+    Источник наследуется вложенными интервалами того же потока: ожидания
+    хуманизатора и browser.get внутри поиска RusProfile получают source
+    "RusProfile". Без пути к файлу интервалы только суммируются для сводки.
+    """
+
+    SUFFIX = ".trace.jsonl"
+
+    def __init__(self, path=None):
+        self.path = path
+        self._file = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._ids = itertools.count(1)
+        self._started = time.time()
+        self._totals = {}  # {(этап, источник): [количество, суммарное время]}
+
+    @classmethod
+    def for_input_file(cls, input_path):
+        """Трасса, лежащая рядом с входным Excel-файлом"""
+        return cls(os.path.splitext(input_path)[0] + cls.SUFFIX)
+
+    def open(self):
+        """Открытие файла трассы (новая трасса на каждый запуск)"""
+        with self._lock:
+            if self.path and self._file is None:
+                self._file = open(self.path, "w", encoding="utf-8")
+                self._started = time.time()
+                self._totals.clear()
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def span(self, stage, source=None, **attrs):
+        """
+        Интервал этапа
+
+        Args:
+            stage: Этап ("searcher", "variant", "browser.get", "humanizer.wait" ...)
+            source: Источник; если не указан, берется из внешнего интервала
+            attrs: Дополнительные поля (можно дополнять внутри блока)
+        """
+        stack = self._stack()
+        parent = stack[-1] if stack else None
+        if source is None and parent is not None:
+            source = parent["source"]
+
+        span = {"id": next(self._ids), "stage": stage, "source": source}
+        stack.append(span)
+        start = time.time()
+        started = time.perf_counter()
+        try:
+            yield attrs
+        finally:
+            duration = time.perf_counter() - started
+            stack.pop()
+            self._record(
+                span["id"], parent["id"] if parent else None, stage, source, start, duration, attrs
+            )
+
+    def _record(self, span_id, parent_id, stage, source, start, duration, attrs):
+        key = (stage, source or "")
+
+        line = None
+        if self.path:
+            record = {
+                "id": span_id,
+                "parent": parent_id,
+                "stage": stage,
+                "source": source,
+                "start": round(start - self._started, 4),
+                "duration": round(duration, 4),
+                "thread": threading.current_thread().name,
+            }
+            record.update(attrs)
+            line = json.dumps(record, ensure_ascii=False, default=str)
+
+        with self._lock:
+            totals = self._totals.setdefault(key, [0, 0.0])
+            totals[0] += 1
+            totals[1] += duration
+            if line is not None and self._file is not None:
+                self._file.write(line + "\n")
+
+    def summary_lines(self):
+        """Таблица: количество, общее и среднее время по этапам и источникам"""
+        with self._lock:
+            totals = sorted(self._totals.items(), key=lambda item: item[1][1], reverse=True)
+
+        if not totals:
+            return []
+
+        lines = [
+            "\n⏱ Время по этапам:",
+            f"  {'Этап':<30}{'Источник':<24}{'кол-во':>8}{'всего, с':>11}{'среднее, с':>12}",
+        ]
+        for (stage, source), (count, total) in totals:
+            lines.append(
+                f"  {stage:<30}{source or '-':<24}{count:>8}{total:>11.1f}{total / count:>12.2f}"
+            )
+        return lines
+
+    def close(self):
+        """Закрытие файла трассы"""
+        with self._lock:
+            if self._file is not None:
+                try:
+                    self._file.close()
+                finally:
+                    self._file = None
+
+    def move_next_to(self, output_path):
+        """
+        Перенос трассы к сохраненному файлу результата
+
+        Returns:
+            str | None: Новый путь к трассе
+        """
+        self.close()
+        if not self.path or not os.path.exists(self.path):
+            return None
+
+        new_path = os.path.splitext(output_path)[0] + self.SUFFIX
+        if os.path.abspath(new_path) != os.path.abspath(self.path):
+            shutil.move(self.path, new_path)
+            self.path = new_path
+        return self.path
+
+
+def traced(stage):
+    """
+    Декоратор метода: интервал вокруг вызова, если у объекта есть tracer
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            tracer = getattr(self, "tracer", None)
+            if tracer is None:
+                return func(self, *args, **kwargs)
+            with tracer.span(stage):
+                return func(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
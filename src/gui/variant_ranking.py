@@ -0,0 +1,207 @@
+"""
+Модуль ранжирования поисковых вариантов названия организации
+"""
+
+import os
+import re
+import json
+import random as rd
+import threading
+
+from .result_cache import get_cache_path
+
+
+WORD_REGEX = re.compile(r"[а-яёa-z]{3,}")
+NUMBER_REGEX = re.compile(r"\d+")
+QUOTED_REGEX = re.compile(r'["\'«»][^"\'«»]+["\'«»]')
+QUOTES_REGEX = re.compile(r'["\'«»“”„]')
+
+
+def variant_key(variant):
+    """Ключ близких вариантов: без кавычек, регистра и лишних пробелов"""
+    text = QUOTES_REGEX.sub(" ", variant).lower().replace("ё", "е")
+    return " ".join(text.split())
+
+
+class VariantStats:
+    """
+    Статистика успешности поисковых вариантов по их виду.
+
+    Вид варианта - правило, которым он получен ("original", "without_city",
+    "quoted" ...). Сам текст варианта у каждой организации свой, а вид
+    повторяется, поэтому по нему видно, что срабатывает на наших данных.
+    Хранится в JSON в папке кэша; общая для всех сеарчеров процесса.
+
+    Учитываются только первые попытки по организации: до второго варианта
+    доходят лишь организации, которые первый не нашел, и у видов, стоящих
+    дальше в порядке, успешность занижалась бы трудными случаями.
+    """
+
+    # Прежний variant_stats.json считал все попытки и смещен порядком - не читаем его
+    FILE_NAME = "variant_stats_first.json"
+    SAVE_EVERY = 20  # Записей между сохранениями файла
+
+    def __init__(self, path=None):
+        self.path = path or get_cache_path(self.FILE_NAME)
+        self._lock = threading.Lock()
+        self._stats = {}  # {вид: [попыток, успехов]}
+        self._unsaved = 0
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._stats = {
+                kind: [int(values[0]), int(values[1])]
+                for kind, values in data.items()
+                if isinstance(values, list) and len(values) == 2
+            }
+        except (OSError, ValueError, TypeError):
+            self._stats = {}
+
+    def success_rate(self, kind):
+        """Доля успехов вида со сглаживанием (без данных - 0.5)"""
+        with self._lock:
+            attempts, successes = self._stats.get(kind, (0, 0))
+        return (successes + 1) / (attempts + 2)
+
+    def record(self, kind, found):
+        """Результат первой попытки поиска по организации вариантом этого вида"""
+        with self._lock:
+            stats = self._stats.setdefault(kind, [0, 0])
+            stats[0] += 1
+            if found:
+                stats[1] += 1
+            self._unsaved += 1
+            should_save = self._unsaved >= self.SAVE_EVERY
+        if should_save:
+            self.save()
+
+    def snapshot(self):
+        with self._lock:
+            return {kind: tuple(values) for kind, values in self._stats.items()}
+
+    def save(self):
+        """Запись статистики в файл (через временный файл)"""
+        with self._lock:
+            if not self._unsaved:
+                return
+            data = json.dumps(self._stats, ensure_ascii=False, indent=2, sort_keys=True)
+            self._unsaved = 0
+
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass  # Статистика - подсказка для порядка, ее потеря не критична
+
+
+_variant_stats = None
+_variant_stats_lock = threading.Lock()
+
+
+def get_variant_stats():
+    """Общая статистика вариантов (загружается один раз)"""
+    global _variant_stats
+    if _variant_stats is None:
+        with _variant_stats_lock:
+            if _variant_stats is None:
+                _variant_stats = VariantStats()
+    return _variant_stats
+
+
+class VariantRanker:
+    """
+    Ранжирование, схлопывание и отсечение поисковых вариантов.
+
+    Оценка варианта - ожидаемая различающая сила запроса: уникальные слова
+    (не общие образовательные), числа (номер школы), текст в кавычках;
+    слишком длинные запросы (полностью расшифрованные ОПФ) штрафуются.
+    К оценке добавляется поправка по накопленной успешности вида варианта.
+
+    Чтобы статистика набиралась по всем видам, а не только по тем, что уже
+    стоят первыми, с вероятностью exploration первым ставится случайный
+    вариант (исследование); остальные идут в обычном порядке.
+    """
+
+    DEFAULT_BUDGET = 6          # Вариантов на одну организацию
+    UNIQUE_WORD_WEIGHT = 2.0
+    NUMBER_WEIGHT = 3.0
+    QUOTED_WEIGHT = 1.5
+    GENERIC_PENALTY = 5.0       # Нет ни уникальных слов, ни чисел
+    LONG_QUERY_WORDS = 8        # Слов до штрафа за длину
+    LONG_QUERY_PENALTY = 0.5    # Штраф за каждое слово сверх LONG_QUERY_WORDS
+    LEARNED_WEIGHT = 8.0        # Вес поправки по статистике (успешность 0..1 вокруг 0.5)
+    EXPLORATION = 0.1           # Доля организаций, где первым идет случайный вариант
+
+    def __init__(self, common_words=frozenset(), stats=None, budget=None, exploration=None, rng=None):
+        self.common_words = common_words
+        self.stats = stats
+        self.budget = self.DEFAULT_BUDGET if budget is None else budget
+        # Исследование нужно только при обучении на статистике
+        if exploration is None:
+            exploration = self.EXPLORATION if stats is not None else 0.0
+        self.exploration = exploration
+        self.rng = rng or rd
+
+    def score(self, variant, kind):
+        text = variant.lower().replace("ё", "е")
+        words = set(WORD_REGEX.findall(text))
+        unique_words = words - self.common_words
+        has_numbers = bool(NUMBER_REGEX.search(text))
+
+        score = len(unique_words) * self.UNIQUE_WORD_WEIGHT
+        if has_numbers:
+            score += self.NUMBER_WEIGHT
+        if QUOTED_REGEX.search(variant):
+            score += self.QUOTED_WEIGHT
+        if not unique_words and not has_numbers:
+            score -= self.GENERIC_PENALTY
+        if len(words) > self.LONG_QUERY_WORDS:
+            score -= (len(words) - self.LONG_QUERY_WORDS) * self.LONG_QUERY_PENALTY
+
+        if self.stats is not None:
+            score += (self.stats.success_rate(kind) - 0.5) * self.LEARNED_WEIGHT
+        return score
+
+    def rank(self, variants):
+        """
+        Порядок попыток поиска
+
+        Args:
+            variants: [(вариант, вид)] в порядке генерации
+
+        Returns:
+            tuple: ([(вариант, вид, оценка)] не длиннее бюджета,
+                    число схлопнутых дублей, число отсеченных бюджетом)
+        """
+        ranked, collapsed = self._sorted(variants)
+
+        # Исследование: первым идет случайный вариант (в том числе из отсекаемых бюджетом)
+        if len(ranked) > 1 and self.rng.random() < self.exploration:
+            ranked.insert(0, ranked.pop(self.rng.randrange(len(ranked))))
+
+        pruned = max(0, len(ranked) - self.budget) if self.budget else 0
+        if self.budget:
+            ranked = ranked[:self.budget]
+
+        return [(variant, kind, score) for score, _, variant, kind in ranked], collapsed, pruned
+
+    def _sorted(self, variants):
+        """Схлопнутые варианты по убыванию оценки: ([(оценка, позиция, вариант, вид)], дублей)"""
+        best = {}  # {ключ: (оценка, позиция, вариант, вид)}
+        for position, (variant, kind) in enumerate(variants):
+            key = variant_key(variant)
+            if not key:
+                continue
+            candidate = (self.score(variant, kind), position, variant, kind)
+            current = best.get(key)
+            # При равной оценке остается вариант, сгенерированный раньше
+            if current is None or candidate[0] > current[0]:
+                best[key] = candidate
+
+        collapsed = len(variants) - len(best)
+        return sorted(best.values(), key=lambda item: (-item[0], item[1])), collapsed
@@ -0,0 +1,29 @@
+"""
+Общие фикстуры тестов: пути к пакету gui и стенду бенчмарков
+"""
+
+import os
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, "src"))
+sys.path.insert(0, os.path.join(ROOT_DIR, "benchmarks"))
+
+from replay_server import ReplayServer  # noqa: E402
+
+
+@pytest.fixture
+def replay_server():
+    """Фабрика стендов: replay_server(**параметры ReplayServer), стенд останавливается сам"""
+    servers = []
+
+    def start(**kwargs):
+        server = ReplayServer(**kwargs).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
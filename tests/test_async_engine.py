@@ -0,0 +1,123 @@
+"""
+Тесты ограничения одновременных запросов асинхронного движка
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from gui.async_engine import AsyncSearchEngine
+from gui.browser import BrowserManager
+from gui.tracing import Tracer
+from test_browser import StubFactory
+
+
+def create_engine(**kwargs):
+    """Движок без браузеров: парсер нужен только для настроек источников"""
+    parser = SimpleNamespace(
+        tracer=Tracer(), kontur_paths=None, egrul_http=True, kontur_http=True, base_urls={}
+    )
+    engine = AsyncSearchEngine([parser], log_callback=lambda message: None, **kwargs)
+    engine._semaphores = {"egrul": asyncio.Semaphore(1)}
+    engine._http_executor = ThreadPoolExecutor(2)
+    return engine
+
+
+def test_http_searchers_follow_parser_settings():
+    engine = create_engine()
+    assert engine.egrul_searcher is not None and engine.kontur_searcher is not None
+    assert engine.prefetch is False
+
+    parser = SimpleNamespace(
+        tracer=Tracer(), kontur_paths=None, egrul_http=False, kontur_http=False, base_urls={}
+    )
+    engine = AsyncSearchEngine([parser], log_callback=lambda message: None)
+    assert engine.egrul_searcher is None and engine.kontur_searcher is None
+
+
+def test_cancelled_request_keeps_domain_slot():
+    engine = create_engine()
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocking_request():
+        started.set()
+        release.wait(5)
+        return "ответ"
+
+    async def scenario():
+        first = asyncio.ensure_future(engine._http("egrul", blocking_request))
+        while not started.is_set():
+            await asyncio.sleep(0.01)
+
+        first.cancel()
+        await asyncio.sleep(0.05)
+        # Поток пула еще выполняет запрос - место у сайта не освобождено
+        assert not first.done()
+        assert engine._in_flight["egrul"] == 1
+
+        second = asyncio.ensure_future(engine._http("egrul", lambda: "второй"))
+        await asyncio.sleep(0.05)
+        assert not second.done()
+
+        release.set()
+        assert await second == "второй"
+        assert first.cancelled()
+        assert engine._in_flight["egrul"] == 0
+        assert engine.peak_in_flight["egrul"] == 1
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        release.set()
+        engine._http_executor.shutdown()
+
+
+def test_browser_step_retried_after_silent_crash():
+    factory = StubFactory()
+    manager = BrowserManager(factory, log_callback=lambda message: None)
+    manager.start()
+    engine = create_engine()
+    parser = SimpleNamespace(browser_manager=manager)
+    engine._idle_parsers.get()
+    engine._idle_parsers.put(parser)
+    calls = []
+
+    def step(parser):
+        calls.append(parser.browser_manager.browser)
+        if len(calls) == 1:
+            factory.browsers[0].alive = False  # Сеарчер проглотил ошибку упавшего Chrome
+            return {"found": False}
+        return {"found": True}
+
+    assert engine._run_browser_step("RusProfile", step, {}) == {"found": True}
+    assert calls == factory.browsers and len(factory.browsers) == 2
+    manager.shutdown()
+
+
+def test_gigachat_attempts_are_shared_by_rows():
+    gigachat = SimpleNamespace(
+        calls=[],
+        search_organization_in_egrul=lambda org_name: (
+            gigachat.calls.append(org_name) or {"found": True, "name": org_name}
+        ),
+    )
+    parser = SimpleNamespace(
+        tracer=Tracer(), kontur_paths=None, egrul_http=False, kontur_http=False, base_urls={}
+    )
+    engine = AsyncSearchEngine(
+        [parser],
+        gigachat_api=gigachat,
+        gigachat_attempts=2,
+        log_callback=lambda message: None,
+    )
+
+    async def not_found_in_browser(source, step, **attrs):
+        return {"found": False}
+
+    engine._in_browser = not_found_in_browser
+    results = engine.search_all(["А", "Б", "В"])
+
+    assert [result["source"] for result in results].count("GigaChat (ЕГРЮЛ)") == 2
+    assert len(gigachat.calls) == 2 and engine.gigachat_used == 2
@@ -0,0 +1,117 @@
+"""
+Тесты жизненного цикла браузера (BrowserManager) на заглушке Chrome
+"""
+
+import os
+import threading
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from gui.browser import BrowserClosed, BrowserManager
+from gui.parser_core import OrganizationParser
+
+
+class StubBrowser:
+    """Заглушка Chrome: отвечает, пока не «упадет» или не будет закрыта"""
+
+    def __init__(self, profile_dir):
+        self.profile_dir = profile_dir
+        self.alive = True
+
+    @property
+    def window_handles(self):
+        if not self.alive:
+            raise WebDriverException("chrome not reachable")
+        return ["main"]
+
+    def quit(self):
+        self.alive = False
+
+
+class StubFactory:
+    def __init__(self, on_create=None):
+        self.browsers = []
+        self.on_create = on_create
+
+    def __call__(self, profile_dir):
+        if self.on_create:
+            self.on_create()
+        browser = StubBrowser(profile_dir)
+        self.browsers.append(browser)
+        return browser
+
+
+def test_shutdown_closes_browser_and_profile():
+    factory = StubFactory()
+    manager = BrowserManager(factory, log_callback=lambda message: None)
+    manager.start()
+    profile_dir = manager.profile_dir
+
+    manager.shutdown()
+
+    assert not factory.browsers[0].alive
+    assert not os.path.exists(profile_dir)
+    with pytest.raises(BrowserClosed):
+        manager.restart("браузер упал")
+    assert len(factory.browsers) == 1
+
+
+def test_shutdown_during_start_quits_new_browser():
+    manager = None
+    factory = StubFactory(on_create=lambda: manager.shutdown())
+    manager = BrowserManager(factory, log_callback=lambda message: None)
+
+    with pytest.raises(BrowserClosed):
+        manager.start()
+
+    browser = factory.browsers[0]
+    assert not browser.alive
+    assert not os.path.exists(browser.profile_dir)
+    assert manager.browser is None
+
+
+def test_stop_during_row_does_not_restart_browser(monkeypatch):
+    factory = StubFactory()
+    parser = OrganizationParser(log_callback=lambda message: None)
+    parser.browser_manager = BrowserManager(factory, log_callback=lambda message: None)
+    parser.browser_manager.start()
+
+    def cascade_stopped(org_name):
+        # Остановка из потока интерфейса посреди строки: браузер закрыт,
+        # сеарчеры проглотили ошибки, каскад вернул «Не найдено»
+        thread = threading.Thread(target=parser.close_browser, kwargs={"keep_warm": False})
+        thread.start()
+        thread.join()
+        return OrganizationParser._empty_result()
+
+    monkeypatch.setattr(parser, "_search_organization_cascade", cascade_stopped)
+
+    with pytest.raises(BrowserClosed):
+        parser._search_organization_recovering('МБОУ "СОШ № 5"')
+
+    assert len(factory.browsers) == 1
+    assert not factory.browsers[0].alive
+
+
+def test_crashed_browser_is_restarted(monkeypatch):
+    factory = StubFactory()
+    parser = OrganizationParser(log_callback=lambda message: None)
+    parser.browser_manager = BrowserManager(factory, log_callback=lambda message: None)
+    parser.browser_manager.start()
+    attempts = []
+
+    def cascade(org_name):
+        attempts.append(org_name)
+        if len(attempts) == 1:
+            factory.browsers[0].alive = False  # Chrome упал посреди строки
+            return OrganizationParser._empty_result()
+        return dict(OrganizationParser._empty_result(), source="RusProfile")
+
+    monkeypatch.setattr(parser, "_search_organization_cascade", cascade)
+
+    result = parser._search_organization_recovering('МБОУ "СОШ № 5"')
+
+    assert result["source"] == "RusProfile"
+    assert len(factory.browsers) == 2 and factory.browsers[1].alive
+    parser.browser_manager.shutdown()
@@ -0,0 +1,99 @@
+"""
+Тесты извлечения данных из сохраненных страниц источников (tests/fixtures/pages)
+"""
+
+import os
+
+import pytest
+
+from gui.extractors import EgrulExtractor, KonturFokusExtractor, PageSnapshot, RusProfileExtractor
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "pages")
+
+
+def page(name):
+    return PageSnapshot.from_file(os.path.join(PAGES_DIR, name + ".html"))
+
+
+@pytest.mark.parametrize(
+    "name, kind",
+    [
+        ("rusprofile_company", "company"),
+        ("rusprofile_results", "results"),
+        ("rusprofile_not_found", "not_found"),
+        ("rusprofile_captcha", None),
+    ],
+)
+def test_rusprofile_page_kind(name, kind):
+    assert RusProfileExtractor.page_kind(page(name)) == kind
+
+
+@pytest.mark.parametrize(
+    "name, captcha",
+    [
+        ("rusprofile_captcha", True),
+        ("rusprofile_company", False),
+        ("rusprofile_results", False),
+        ("rusprofile_not_found", False),
+    ],
+)
+def test_rusprofile_captcha(name, captcha):
+    assert RusProfileExtractor.is_captcha(page(name)) is captcha
+
+
+def test_rusprofile_company():
+    record = RusProfileExtractor.company(page("rusprofile_company"))
+
+    assert record.name == (
+        "МУНИЦИПАЛЬНОЕ БЮДЖЕТНОЕ ОБЩЕОБРАЗОВАТЕЛЬНОЕ УЧРЕЖДЕНИЕ "
+        '"СРЕДНЯЯ ОБЩЕОБРАЗОВАТЕЛЬНАЯ ШКОЛА № 5" ГОРОДСКОГО ОКРУГА БАЛАШИХА'
+    )
+    assert record.address.startswith("143900, Московская область")
+    assert record.postal_code == "143900"
+    # ИНН из скрипта и скрытой подсказки не видны на странице
+    assert record.inn == "5001011111"
+    assert record.ogrn == "1025000511111"
+
+
+def test_rusprofile_company_requires_card():
+    assert RusProfileExtractor.company(page("rusprofile_results")) is None
+
+
+def test_rusprofile_result_links():
+    assert RusProfileExtractor.result_links(page("rusprofile_results")) == ["/id/1001", "/id/1002"]
+
+
+def test_egrul_results():
+    items = EgrulExtractor.results(page("egrul_results"))
+
+    assert [item.index for item in items] == [0, 1]
+    assert items[0].link_text.startswith("МУНИЦИПАЛЬНОЕ БЮДЖЕТНОЕ")
+    assert items[0].href == "/vyp-download/AAA111"
+    assert "ИНН: 5001011111" in items[0].text
+    assert "Дата прекращения деятельности" in items[1].text
+
+
+def test_egrul_detail():
+    record = EgrulExtractor.detail(page("egrul_detail"))
+
+    assert record.name.endswith('"ГИМНАЗИЯ № 2 ИМЕНИ ПУШКИНА"')
+    assert record.address == "398001, Липецкая область, г. Липецк, ул. Пушкина, д. 2"
+    assert record.postal_code == "398001"
+    assert (record.inn, record.ogrn) == ("4826044444", "1024800844444")
+
+
+def test_kontur_first_organization():
+    snapshot = page("kontur_results")
+    record = KonturFokusExtractor.first_organization(snapshot)
+
+    assert KonturFokusExtractor.browser_required(snapshot) is None
+    assert record.name.endswith('ГОРОДА МОСКВЫ "ШКОЛА № 1234"')
+    assert (record.inn, record.ogrn) == ("7701033333", "1027701033333")
+    assert record.postal_code == "121099"
+
+
+def test_kontur_challenge():
+    snapshot = page("kontur_challenge")
+
+    assert not KonturFokusExtractor.has_result_cards(snapshot)
+    assert KonturFokusExtractor.browser_required(snapshot) == "проверка «не робот»"
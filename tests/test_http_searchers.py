@@ -0,0 +1,245 @@
+"""
+Тесты HTTP-сеарчеров на локальном стенде (benchmarks/replay_server.py)
+"""
+
+import json
+
+import pytest
+
+from gui.http_searchers import (
+    EgrulHttpSearcher,
+    FetchPathStats,
+    KonturFokusHttpSearcher,
+    create_session,
+)
+from gui.parser_core import KonturFokusSearcher
+
+JSON = "application/json; charset=utf-8"
+HTML = "text/html; charset=utf-8"
+
+# Оболочка страницы, выдачу в которой строят скрипты (без карточек и «не найдено»)
+SCRIPT_RENDERED_PAGE = """<!DOCTYPE html>
+<html lang="ru">
+<head><meta charset="utf-8"><title>Контур.Фокус</title></head>
+<body>
+<div class="search-hint">Введите название, ИНН или ОГРН организации</div>
+<div id="app"></div>
+<script src="/static/app.js"></script>
+</body>
+</html>
+"""
+
+
+@pytest.fixture
+def egrul_searcher(monkeypatch):
+    """Фабрика сеарчеров ЕГРЮЛ для стенда (без пауз между опросами)"""
+    monkeypatch.setattr(EgrulHttpSearcher, "POLL_INTERVAL", 0.0)
+    logs = []
+
+    def create(server):
+        searcher = EgrulHttpSearcher(
+            session=create_session(),
+            log_callback=logs.append,
+            base_url=server.base_urls["egrul"],
+        )
+        searcher.logs = logs
+        return searcher
+
+    return create
+
+
+def test_found_after_wait_poll(replay_server, egrul_searcher):
+    server = replay_server()
+    result = egrul_searcher(server).search('МАОУ "Гимназия № 2 имени Пушкина"')
+
+    assert result["found"] is True
+    assert result["inn"] == "4826044444"
+    assert "ГИМНАЗИЯ № 2 ИМЕНИ ПУШКИНА" in result["name"]
+    assert result["address"]
+    # POST запроса, опрос со статусом "wait" и опрос с выдачей
+    assert server.requests["egrul_json"] == 3
+
+
+def test_not_found(replay_server, egrul_searcher):
+    server = replay_server()
+    searcher = egrul_searcher(server)
+    result = searcher.search('НОУ "Школа Будущего"')
+
+    assert result["found"] is False
+    assert "  ⚠️ Нет результатов" in searcher.logs
+
+
+def test_inn_only_row_is_not_found(replay_server, egrul_searcher):
+    server = replay_server()
+    result = egrul_searcher(server).search('ГБПОУ "Колледж связи № 54"')
+
+    assert result["found"] is False
+    assert result["inn"] == "7728066666"
+
+
+def test_captcha_required(replay_server, egrul_searcher):
+    server = replay_server(
+        overrides={
+            ("egrul", "POST", "/"): (200, JSON, json.dumps({"t": "", "captchaRequired": True})),
+        }
+    )
+    searcher = egrul_searcher(server)
+    result = searcher.search('МБОУ "СОШ № 5"')
+
+    assert result["found"] is False
+    assert "  ⚠️ ЕГРЮЛ требует капчу" in searcher.logs
+    assert "egrul_json" not in server.requests  # Выдачу не опрашивали
+
+
+@pytest.mark.parametrize(
+    "body",
+    ["<html>Сервис недоступен</html>", "[]", "null", '"t"', '{"captchaRequired": false}'],
+)
+def test_malformed_query_response(replay_server, egrul_searcher, body):
+    server = replay_server(overrides={("egrul", "POST", "/"): (200, JSON, body)})
+    result = egrul_searcher(server).search('МБОУ "СОШ № 5"')
+
+    assert result["found"] is False
+
+
+@pytest.mark.parametrize(
+    "body",
+    ["{", "[1, 2]", '{"rows": {"n": "ШКОЛА"}}', '{"rows": ["ШКОЛА", 5, null]}'],
+)
+def test_malformed_search_result(replay_server, egrul_searcher, body):
+    server = replay_server(
+        overrides={
+            ("egrul", "POST", "/"): (200, JSON, json.dumps({"t": "fixed"})),
+            ("egrul", "GET", "/search-result/fixed"): (200, JSON, body),
+        }
+    )
+    result = egrul_searcher(server).search('МБОУ "СОШ № 5"')
+
+    assert result["found"] is False
+
+
+def test_row_fields_of_unexpected_types(replay_server, egrul_searcher):
+    rows = [{
+        "n": 'МБОУ "СОШ № 5"',
+        "a": ["не", "строка"],
+        "i": 5001011111,
+        "o": None,
+        "t": 1,
+    }]
+    server = replay_server(
+        overrides={
+            ("egrul", "POST", "/"): (200, JSON, json.dumps({"t": "fixed"})),
+            ("egrul", "GET", "/search-result/fixed"): (
+                200, JSON, json.dumps({"rows": rows}, ensure_ascii=False)
+            ),
+        }
+    )
+    result = egrul_searcher(server).search('МБОУ "СОШ № 5"')
+
+    assert result["inn"] == "5001011111"
+    assert not result.get("ogrn")
+
+
+def test_http_error(replay_server, egrul_searcher):
+    server = replay_server(overrides={("egrul", "POST", "/"): (503, JSON, "{}")})
+    searcher = egrul_searcher(server)
+    result = searcher.search('МБОУ "СОШ № 5"')
+
+    assert result["found"] is False
+    assert any(message.startswith("  ⚠️ Ошибка HTTP") for message in searcher.logs)
+
+
+@pytest.fixture
+def kontur_searcher(monkeypatch):
+    """
+    Фабрика сеарчеров Контур Фокус для стенда
+
+    Браузера в тестах нет: поиск в браузере (запасной путь) подменяется
+    и только записывает свои вызовы в searcher.browser_calls.
+    """
+    browser_calls = []
+
+    def search_in_browser(self, org_name=None, inn=None):
+        browser_calls.append((org_name, inn))
+        return dict(self._empty_result(), found=True, source="browser")
+
+    monkeypatch.setattr(KonturFokusSearcher, "search", search_in_browser)
+    logs = []
+
+    def create(server):
+        searcher = KonturFokusHttpSearcher(
+            None,
+            None,
+            log_callback=logs.append,
+            base_url=server.base_urls["kontur"],
+            session=create_session(),
+            path_stats=FetchPathStats(),
+        )
+        searcher.browser_calls = browser_calls
+        searcher.logs = logs
+        return searcher
+
+    return create
+
+
+def test_kontur_parsed_over_http(replay_server, kontur_searcher):
+    server = replay_server()
+    searcher = kontur_searcher(server)
+    result = searcher.search(org_name='ГБОУ "Школа № 1234"')
+
+    assert result["found"] is True
+    assert result["inn"] == "7701033333"
+    assert "ШКОЛА № 1234" in result["name"]
+    assert result["address"]
+    assert searcher.browser_calls == []
+    assert searcher.path_stats.snapshot() == {"http": 1}
+
+
+def test_kontur_not_found_over_http(replay_server, kontur_searcher):
+    server = replay_server()
+    searcher = kontur_searcher(server)
+    result = searcher.search(org_name='НОУ "Школа Будущего"')
+
+    assert result["found"] is False
+    assert searcher.browser_calls == []
+    assert searcher.path_stats.snapshot() == {"http": 1}
+
+
+@pytest.mark.parametrize(
+    "server_options, reason",
+    [
+        (
+            {"overrides": {("kontur", "GET", "/search"): (500, HTML, "<html></html>")}},
+            "ошибка HTTP (HTTPError)",
+        ),
+        ({"kontur_challenge_every": 1}, "проверка «не робот»"),
+        (
+            {"overrides": {("kontur", "GET", "/search"): (200, HTML, SCRIPT_RENDERED_PAGE)}},
+            "выдачу строят скрипты",
+        ),
+    ],
+    ids=["http_error", "challenge", "script_rendered"],
+)
+def test_kontur_falls_back_to_browser(replay_server, kontur_searcher, server_options, reason):
+    server = replay_server(**server_options)
+    searcher = kontur_searcher(server)
+
+    assert searcher.search_without_browser(org_name='ГБОУ "Школа № 1234"') == (None, reason)
+
+    result = searcher.search(org_name='ГБОУ "Школа № 1234"')
+    assert result["source"] == "browser"
+    assert searcher.browser_calls == [("ГБОУ \"Школа № 1234\"", None)]
+    assert searcher.path_stats.snapshot() == {"browser": 1}
+    assert any(reason in message for message in searcher.logs)
+
+
+def test_kontur_path_stats(replay_server, kontur_searcher):
+    # Каждый второй поиск без cookie проверки получает проверку «не робот»
+    server = replay_server(kontur_challenge_every=2)
+    searcher = kontur_searcher(server)
+    for _ in range(4):
+        searcher.search(inn="5001011111")
+
+    assert searcher.path_stats.snapshot() == {"http": 2, "browser": 2}
+    assert server.requests["kontur_challenge"] == 2
+    assert len(searcher.browser_calls) == 2
@@ -0,0 +1,55 @@
+"""
+Тесты общего ограничения частоты запросов
+"""
+
+import threading
+import time
+
+import pytest
+
+from gui.rate_limiter import TokenBucket, parse_rate
+
+
+def test_parse_rate():
+    assert parse_rate("30/5") == (30.0, 5)
+    assert parse_rate("60") == (60.0, 1)
+    assert parse_rate("0") is None
+    with pytest.raises(ValueError):
+        parse_rate("много")
+
+
+def test_reservations_queue_after_burst():
+    bucket = TokenBucket(requests_per_minute=600, burst=2)  # Токен раз в 0.1 с
+
+    delays = [bucket.reserve() for _ in range(4)]
+
+    assert delays[:2] == [0.0, 0.0]
+    assert delays[2] == pytest.approx(0.1, abs=0.01)
+    assert delays[3] == pytest.approx(0.2, abs=0.01)
+
+
+def test_cancelled_wait_keeps_reservation():
+    bucket = TokenBucket(requests_per_minute=600, burst=1)
+    assert bucket.acquire() is True  # Единственный токен корзины
+
+    cancel = threading.Event()
+    cancel.set()
+    assert bucket.acquire(cancel) is False  # Бронь на +0.1 с
+    assert bucket.total == 1
+
+    # Следующий запрос встает за отмененной бронью, а не на ее место
+    assert bucket.reserve() == pytest.approx(0.2, abs=0.01)
+
+
+def test_cancellations_do_not_exceed_burst():
+    bucket = TokenBucket(requests_per_minute=600, burst=2)
+    cancel = threading.Event()
+    cancel.set()
+    for _ in range(5):
+        bucket.acquire(cancel)
+
+    time.sleep(1.0)  # Корзина успевает наполниться
+
+    delays = [bucket.reserve() for _ in range(3)]
+    assert delays[:2] == [0.0, 0.0]
+    assert delays[2] > 0
@@ -0,0 +1,44 @@
+"""
+Тесты ранжирования поисковых вариантов
+"""
+
+import random
+
+from gui.variant_ranking import VariantRanker, VariantStats
+
+VARIANTS = [
+    ('МБОУ "СОШ № 5" г. Балашиха', "original"),
+    ('МБОУ "СОШ № 5"', "without_city"),
+    ("СОШ № 5", "quoted"),
+    ("Школа", "short"),
+]
+
+
+def test_first_variant_is_best_scored_without_exploration(tmp_path):
+    stats = VariantStats(path=str(tmp_path / "stats.json"))
+    ranker = VariantRanker(stats=stats, exploration=0.0)
+
+    ranked, _, _ = ranker.rank(VARIANTS)
+    scores = [score for _, _, score in ranked]
+
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_exploration_puts_every_kind_first(tmp_path):
+    stats = VariantStats(path=str(tmp_path / "stats.json"))
+    ranker = VariantRanker(stats=stats, budget=2, exploration=1.0, rng=random.Random(1))
+
+    first_kinds = set()
+    for _ in range(200):
+        ranked, _, pruned = ranker.rank(VARIANTS)
+        assert len(ranked) == 2 and pruned == 2
+        first_kinds.add(ranked[0][1])
+
+    # Первым бывает и вариант, который бюджет иначе отсек бы
+    assert first_kinds == {kind for _, kind in VARIANTS}
+
+
+def test_no_exploration_without_stats():
+    ranker = VariantRanker()
+    assert ranker.exploration == 0.0
+    assert ranker.rank(VARIANTS) == ranker.rank(VARIANTS)